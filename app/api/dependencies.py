@@ -1,24 +1,25 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.config.database import get_db
+from app.config.database import get_primary_db
 from app.core.security import verify_token
 from app.core.exceptions import AuthenticationError
 
 security = HTTPBearer()
 
 def get_current_admin(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_primary_db)
 ) -> str:
     """Get current authenticated admin user"""
-    username = verify_token(credentials.credentials)
+    username = verify_token(db, credentials.credentials)
     if username is None:
         raise AuthenticationError("Invalid authentication credentials")
     return username
 
 def get_admin_session(
     current_admin: str = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_primary_db)
 ) -> tuple[str, Session]:
-    """Get admin user and database session"""
+    """Get admin user and a database session pinned to the primary"""
     return current_admin, db
\ No newline at end of file
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Optional
+from app.config.database import SessionLocal, get_engine
+from app.schemas import ImportResult
+from app.services import backup_service
+from app.api.dependencies import get_admin_session, get_current_admin
+from app.core.query_budget import no_query_budget
+
+router = APIRouter()
+
+def _stream(export: Callable[[Session], Iterator[bytes]]) -> Iterator[bytes]:
+    """Run an export on a session of its own, open for as long as the response streams.
+
+    A dependency's session isn't guaranteed to outlive the route; FastAPI
+    0.106+ closes it before the body is sent.
+    """
+    get_engine()
+    db = SessionLocal()
+    try:
+        yield from export(db)
+    finally:
+        db.close()
+
+@router.get("/export/entities.ndjson")
+@no_query_budget
+def export_entities(current_admin: str = Depends(get_current_admin)):
+    """Stream every portfolio row as NDJSON"""
+    return StreamingResponse(
+        _stream(backup_service.iter_ndjson),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=portfolio.ndjson"}
+    )
+
+@router.get("/export/blobs.tar")
+@no_query_budget
+def export_blobs(current_admin: str = Depends(get_current_admin)):
+    """Stream every image and certificate as a tar archive"""
+    return StreamingResponse(
+        _stream(backup_service.iter_tar),
+        media_type="application/x-tar",
+        headers={"Content-Disposition": "attachment; filename=portfolio-blobs.tar"}
+    )
+
+@router.post("/import", response_model=ImportResult)
+@no_query_budget
+def import_portfolio(
+    entities: UploadFile = File(...),
+    blobs: Optional[UploadFile] = File(None),
+    admin_session: tuple = Depends(get_admin_session)
+):
+    """Import an export produced by the endpoints above"""
+    current_admin, db = admin_session
+    counts = backup_service.import_portfolio(db, entities.file, blobs.file if blobs else None)
+    return ImportResult(message="Portfolio imported successfully", imported=counts)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from app.schemas import BatchRequest, BatchResult
+from app.services import batch_service
+from app.api.dependencies import get_admin_session
+from app.core.query_budget import no_query_budget
+
+router = APIRouter()
+
+@router.post("/batch", response_model=BatchResult)
+@no_query_budget
+def run_batch(batch: BatchRequest, admin_session: tuple = Depends(get_admin_session)):
+    """Run several admin operations in one transaction"""
+    current_admin, db = admin_session
+    results = batch_service.run(db, batch.operations)
+    return BatchResult(message=f"{len(results)} operations applied", results=results)
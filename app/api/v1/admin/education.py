@@ -1,19 +1,22 @@
 from fastapi import APIRouter, Depends, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List
-from app.schemas import Education, EducationCreate, EducationUpdate, ResponseSchema
-from app.services import education_service
+from app.schemas import Education, EducationCreate, EducationUpdate, ResponseSchema, JobAccepted
+from app.services import education_service, job_service
 from app.api.dependencies import get_admin_session
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 @router.get("/education", response_model=List[Education])
+@query_budget(2)
 def get_education(admin_session: tuple = Depends(get_admin_session)):
     """Get all education records"""
     current_admin, db = admin_session
     return education_service.get_all_ordered(db)
 
 @router.get("/education/{education_id}", response_model=Education)
+@query_budget(2)
 def get_education_by_id(
     education_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -23,6 +26,7 @@ def get_education_by_id(
     return education_service.get_by_id_or_404(db, education_id)
 
 @router.post("/education", response_model=Education)
+@query_budget(5)
 def create_education(
     education: EducationCreate,
     admin_session: tuple = Depends(get_admin_session)
@@ -32,6 +36,7 @@ def create_education(
     return education_service.create(db, education)
 
 @router.put("/education/{education_id}", response_model=Education)
+@query_budget(6)
 def update_education(
     education_id: int,
     education_update: EducationUpdate,
@@ -42,6 +47,7 @@ def update_education(
     return education_service.update_by_id(db, education_id, education_update)
 
 @router.delete("/education/{education_id}", response_model=ResponseSchema)
+@query_budget(6)
 def delete_education(
     education_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -51,7 +57,8 @@ def delete_education(
     education_service.delete_by_id(db, education_id)
     return ResponseSchema(message="Education record deleted successfully")
 
-@router.post("/education/{education_id}/logo", response_model=ResponseSchema)
+@router.post("/education/{education_id}/logo", response_model=JobAccepted, status_code=202)
+@query_budget(8)
 def upload_institution_logo(
     education_id: int,
     file: UploadFile = File(...),
@@ -60,9 +67,11 @@ def upload_institution_logo(
     """Upload institution logo"""
     current_admin, db = admin_session
     education_service.upload_institution_logo(db, education_id, file)
-    return ResponseSchema(message="Institution logo uploaded successfully")
+    job_id = job_service.enqueue(db, "institution_logo", education_id)
+    return JobAccepted(message="Institution logo uploaded successfully", job_ids=[job_id])
 
 @router.delete("/education/{education_id}/logo", response_model=ResponseSchema)
+@query_budget(7)
 def delete_institution_logo(
     education_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -72,7 +81,8 @@ def delete_institution_logo(
     education_service.delete_institution_logo(db, education_id)
     return ResponseSchema(message="Institution logo deleted successfully")
 
-@router.post("/education/{education_id}/certificate", response_model=ResponseSchema)
+@router.post("/education/{education_id}/certificate", response_model=JobAccepted, status_code=202)
+@query_budget(8)
 def upload_certificate(
     education_id: int,
     file: UploadFile = File(...),
@@ -81,9 +91,11 @@ def upload_certificate(
     """Upload education certificate"""
     current_admin, db = admin_session
     education_service.upload_certificate(db, education_id, file)
-    return ResponseSchema(message="Certificate uploaded successfully")
+    job_id = job_service.enqueue(db, "certificate", education_id)
+    return JobAccepted(message="Certificate uploaded successfully", job_ids=[job_id])
 
 @router.delete("/education/{education_id}/certificate", response_model=ResponseSchema)
+@query_budget(7)
 def delete_certificate(
     education_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from app.schemas import Job
+from app.services import job_service
+from app.api.dependencies import get_admin_session
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+@router.get("/jobs/{job_id}", response_model=Job)
+@query_budget(2)
+def get_job(job_id: int, admin_session: tuple = Depends(get_admin_session)):
+    """Get the status of a background job"""
+    current_admin, db = admin_session
+    return job_service.get_by_id_or_404(db, job_id)
@@ -6,23 +6,26 @@ from app.schemas import (
     Project, ProjectCreate, ProjectUpdate,
     ProjectCategory, ProjectCategoryCreate, ProjectCategoryUpdate,
     ProjectImage, ProjectImageCreate, ProjectSkillAssignment,
-    ResponseSchema
+    ResponseSchema, JobAccepted
 )
 from app.services import (
-    project_service, project_category_service, project_image_service
+    project_service, project_category_service, project_image_service, job_service
 )
 from app.api.dependencies import get_admin_session
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 # ============ PROJECT CATEGORIES ============
 @router.get("/categories", response_model=List[ProjectCategory])
+@query_budget(2)
 def get_project_categories(admin_session: tuple = Depends(get_admin_session)):
     """Get all project categories"""
     current_admin, db = admin_session
     return project_category_service.get_all(db)
 
 @router.post("/categories", response_model=ProjectCategory)
+@query_budget(5)
 def create_project_category(
     category: ProjectCategoryCreate,
     admin_session: tuple = Depends(get_admin_session)
@@ -32,6 +35,7 @@ def create_project_category(
     return project_category_service.create(db, category)
 
 @router.put("/categories/{category_id}", response_model=ProjectCategory)
+@query_budget(12)
 def update_project_category(
     category_id: int,
     category_update: ProjectCategoryUpdate,
@@ -42,6 +46,7 @@ def update_project_category(
     return project_category_service.update_by_id(db, category_id, category_update)
 
 @router.delete("/categories/{category_id}", response_model=ResponseSchema)
+@query_budget(13)
 def delete_project_category(
     category_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -53,18 +58,21 @@ def delete_project_category(
 
 # ============ PROJECTS ============
 @router.get("/projects", response_model=List[Project])
+@query_budget(3)
 def get_projects(admin_session: tuple = Depends(get_admin_session)):
     """Get all projects with full details"""
     current_admin, db = admin_session
     return project_service.get_all_with_relations(db)
 
-@router.get("/projects/{project_id}", response_model=Project)
+@router.get("/projects/{project_id:int}", response_model=Project)  # Leaves /projects/featured etc. to their routes
+@query_budget(5)
 def get_project(project_id: int, admin_session: tuple = Depends(get_admin_session)):
     """Get project by ID with full details"""
     current_admin, db = admin_session
     return project_service.get_by_id_or_404(db, project_id)
 
 @router.post("/projects", response_model=Project)
+@query_budget(16)
 def create_project(
     project: ProjectCreate,
     admin_session: tuple = Depends(get_admin_session)
@@ -74,6 +82,7 @@ def create_project(
     return project_service.create(db, project)
 
 @router.put("/projects/{project_id}", response_model=Project)
+@query_budget(17)
 def update_project(
     project_id: int,
     project_update: ProjectUpdate,
@@ -84,6 +93,7 @@ def update_project(
     return project_service.update_by_id(db, project_id, project_update)
 
 @router.delete("/projects/{project_id}", response_model=ResponseSchema)
+@query_budget(16)
 def delete_project(project_id: int, admin_session: tuple = Depends(get_admin_session)):
     """Delete project and all associated data"""
     current_admin, db = admin_session
@@ -92,6 +102,7 @@ def delete_project(project_id: int, admin_session: tuple = Depends(get_admin_ses
 
 # ============ PROJECT SKILLS MANAGEMENT ============
 @router.post("/projects/{project_id}/skills", response_model=ResponseSchema)
+@query_budget(14)
 def assign_skill_to_project(
     project_id: int,
     assignment: ProjectSkillAssignment,
@@ -103,6 +114,7 @@ def assign_skill_to_project(
     return ResponseSchema(message="Skill assigned to project successfully")
 
 @router.put("/projects/{project_id}/skills", response_model=ResponseSchema)
+@query_budget(12)
 def update_project_skills(
     project_id: int,
     skill_ids: List[int],
@@ -110,12 +122,12 @@ def update_project_skills(
 ):
     """Update all skills associated with a project"""
     current_admin, db = admin_session
-    # Use the internal method to update skills association
-    project_service._update_skills_association(db, project_id, skill_ids)
+    project_service.update_skills(db, project_id, skill_ids)
     return ResponseSchema(message="Project skills updated successfully")
 
 # ============ PROJECT IMAGES MANAGEMENT ============
 @router.get("/projects/{project_id}/images", response_model=List[ProjectImage])
+@query_budget(2)
 def get_project_images(
     project_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -124,7 +136,8 @@ def get_project_images(
     current_admin, db = admin_session
     return project_image_service.get_project_images(db, project_id)
 
-@router.post("/projects/{project_id}/images", response_model=ResponseSchema)
+@router.post("/projects/{project_id}/images", response_model=JobAccepted, status_code=202)
+@query_budget(11)
 def upload_project_images(
     project_id: int,
     files: List[UploadFile] = File(...),
@@ -149,15 +162,19 @@ def upload_project_images(
         main_index = 0
     
     # Upload images
-    uploaded_images = project_image_service.upload_images(
+    image_ids = project_image_service.upload_images(
         db, project_id, files, caption_list, main_index
     )
     
-    return ResponseSchema(
-        message=f"{len(uploaded_images)} images uploaded successfully for project"
+    job_ids = job_service.enqueue_many(db, "project_image", image_ids)
+    
+    return JobAccepted(
+        message=f"{len(image_ids)} images uploaded successfully for project",
+        job_ids=job_ids
     )
 
 @router.put("/projects/images/{image_id}/main", response_model=ResponseSchema)
+@query_budget(14, max_repeats=3)
 def set_main_project_image(
     image_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -168,6 +185,7 @@ def set_main_project_image(
     return ResponseSchema(message="Main project image updated successfully")
 
 @router.put("/projects/images/{image_id}/caption", response_model=ResponseSchema)
+@query_budget(5)
 def update_image_caption(
     image_id: int,
     caption: str = Form(...),
@@ -175,15 +193,11 @@ def update_image_caption(
 ):
     """Update caption for a project image"""
     current_admin, db = admin_session
-    
-    # Get the image and update caption
-    image = project_image_service.get_by_id_or_404(db, image_id)
-    image.caption = caption
-    db.commit()
-    
+    project_image_service.update_caption(db, image_id, caption)
     return ResponseSchema(message="Image caption updated successfully")
 
 @router.delete("/projects/images/{image_id}", response_model=ResponseSchema)
+@query_budget(10)
 def delete_project_image(
     image_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -195,12 +209,14 @@ def delete_project_image(
 
 # ============ PROJECT FILTERING/SEARCH ============
 @router.get("/projects/featured", response_model=List[Project])
+@query_budget(3)
 def get_featured_projects(admin_session: tuple = Depends(get_admin_session)):
     """Get all featured projects"""
     current_admin, db = admin_session
     return project_service.get_featured(db)
 
 @router.get("/projects/category/{category_id}", response_model=List[Project])
+@query_budget(3)
 def get_projects_by_category(
     category_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -210,6 +226,7 @@ def get_projects_by_category(
     return project_service.get_by_category(db, category_id)
 
 @router.get("/projects/skill/{skill_id}", response_model=List[Project])
+@query_budget(3)
 def get_projects_by_skill(
     skill_id: int,
     admin_session: tuple = Depends(get_admin_session)
@@ -219,6 +236,7 @@ def get_projects_by_skill(
     return project_service.get_by_skill(db, skill_id)
 
 @router.get("/projects/case-studies", response_model=List[Project])
+@query_budget(3)
 def get_projects_with_case_studies(admin_session: tuple = Depends(get_admin_session)):
     """Get all projects that have complete case studies"""
     current_admin, db = admin_session
@@ -226,21 +244,12 @@ def get_projects_with_case_studies(admin_session: tuple = Depends(get_admin_sess
 
 # ============ BULK OPERATIONS ============
 @router.put("/projects/bulk/featured", response_model=ResponseSchema)
+@query_budget(11)
 def update_featured_projects(
     project_ids: List[int],
     admin_session: tuple = Depends(get_admin_session)
 ):
     """Update featured status for multiple projects"""
     current_admin, db = admin_session
-    
-    # First, unfeatured all projects
-    db.query(Project).update({"featured": False})
-    
-    # Then, feature the specified projects
-    if project_ids:
-        db.query(Project).filter(Project.id.in_(project_ids)).update(
-            {"featured": True}, synchronize_session=False
-        )
-    
-    db.commit()
+    project_service.set_featured(db, project_ids)
     return ResponseSchema(message=f"{len(project_ids)} projects marked as featured")
\ No newline at end of file
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, UploadFile, File
-from app.schemas import PersonalInfo, PersonalInfoUpdate, ResponseSchema
-from app.services import personal_info_service
+from app.schemas import PersonalInfo, PersonalInfoUpdate, ResponseSchema, JobAccepted
+from app.services import personal_info_service, job_service
 from app.api.dependencies import get_admin_session
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 @router.get("/personal-info", response_model=PersonalInfo)
+@query_budget(2)
 def get_personal_info(admin_session: tuple = Depends(get_admin_session)):
     """Get personal information"""
-    db = admin_session
+    current_admin, db = admin_session
     personal_info = personal_info_service.get_personal_info(db)
     
     if not personal_info:
@@ -32,27 +34,31 @@ def get_personal_info(admin_session: tuple = Depends(get_admin_session)):
     return personal_info
 
 @router.put("/personal-info", response_model=PersonalInfo)
+@query_budget(6)
 def update_personal_info(
     personal_info_update: PersonalInfoUpdate,
     admin_session: tuple = Depends(get_admin_session)
 ):
     """Update personal information"""
-    db = admin_session
+    current_admin, db = admin_session
     return personal_info_service.create_or_update(db, personal_info_update)
 
-@router.post("/personal-info/profile-image", response_model=ResponseSchema)
+@router.post("/personal-info/profile-image", response_model=JobAccepted, status_code=202)
+@query_budget(9)
 def upload_profile_image(
     file: UploadFile = File(...),
     admin_session: tuple = Depends(get_admin_session)
 ):
     """Upload profile image"""
-    db = admin_session
-    personal_info_service.upload_profile_image(db, file)
-    return ResponseSchema(message="Profile image uploaded successfully")
+    current_admin, db = admin_session
+    personal_info = personal_info_service.upload_profile_image(db, file)
+    job_id = job_service.enqueue(db, "profile_image", personal_info.id)
+    return JobAccepted(message="Profile image uploaded successfully", job_ids=[job_id])
 
 @router.delete("/personal-info/profile-image", response_model=ResponseSchema)
+@query_budget(7)
 def delete_profile_image(admin_session: tuple = Depends(get_admin_session)):
     """Delete profile image"""
-    db = admin_session
+    current_admin, db = admin_session
     personal_info_service.delete_profile_image(db)
     return ResponseSchema(message="Profile image deleted successfully")
\ No newline at end of file
@@ -1,16 +1,41 @@
+import asyncio
 from datetime import timedelta
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from app.schemas import ResponseSchema
 from app.schemas.auth import AdminLogin, Token
-from app.core.security import authenticate_admin, create_access_token
+from app.core.security import create_access_token, revoke_token, run_in_password_executor
+from app.api.dependencies import security
+from app.config.database import get_primary_db
 from app.config.settings import get_settings
+from app.core.query_budget import query_budget
+from app.services import admin_service
 
 settings = get_settings()
 router = APIRouter()
 
+# Logins in flight per worker; bcrypt is slow on purpose, so excess logins
+# are rejected rather than queued behind it
+login_slots = asyncio.Semaphore(settings.max_concurrent_logins)
+
 @router.post("/login", response_model=Token)
-def admin_login(credentials: AdminLogin):
+@query_budget(2)
+async def admin_login(credentials: AdminLogin, db: Session = Depends(get_primary_db)):
     """Admin authentication endpoint"""
-    if not authenticate_admin(credentials.username, credentials.password):
+    if login_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent login attempts",
+            headers={"Retry-After": "1"},
+        )
+    
+    async with login_slots:
+        admin = await run_in_password_executor(
+            admin_service.authenticate, db, credentials.username, credentials.password
+        )
+    
+    if admin is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -28,4 +53,19 @@ def admin_login(credentials: AdminLogin):
         access_token=access_token,
         token_type="bearer",
         expires_in=settings.access_token_expire_minutes * 60  # Convert to seconds
-    )
\ No newline at end of file
+    )
+
+@router.post("/logout", response_model=ResponseSchema)
+@query_budget(3)
+def admin_logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_primary_db)
+):
+    """Revoke the current access token"""
+    if not revoke_token(db, credentials.credentials):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return ResponseSchema(message="Logged out successfully")
@@ -1,20 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.config.database import get_db
 from app.schemas import (
-    PortfolioSummary, Project, Skill, WorkExperience, Education
+    PortfolioSummary, Project, ProjectCard, SkillProjects, RelatedProjectCard, Skill, SkillStats, WorkExperience, Education, ChangeSet
 )
 from app.services import (
     personal_info_service, skill_service, work_experience_service,
-    project_service, education_service, project_image_service
+    project_service, project_card_service, skill_ranking_service, project_detail_service, related_project_service, skill_stats_service, education_service, project_image_service,
+    bundle_service, blob_cache_service,
+    change_log_service, change_notifier
 )
+from app.config.settings import get_settings
+from app.core.query_budget import query_budget
+from app.utils.constants import SKILL_TOP_PROJECTS, RELATED_PROJECTS
 
+settings = get_settings()
 router = APIRouter()
 
 @router.get("/portfolio", response_model=PortfolioSummary)
+@query_budget(7)
 def get_portfolio_summary(db: Session = Depends(get_db)):
     """Get complete portfolio data for public view"""
+    # Read the version first so nothing committed after it is missed by /changes
+    version = change_log_service.get_version(db)
     personal_info = personal_info_service.get_personal_info(db)
     skills = skill_service.get_all(db)
     work_experiences = work_experience_service.get_all_ordered(db)
@@ -26,76 +36,188 @@ def get_portfolio_summary(db: Session = Depends(get_db)):
         skills=skills,
         work_experiences=work_experiences,
         projects=projects,
-        education=education
+        education=education,
+        version=version
     )
 
-@router.get("/projects", response_model=List[Project])
+@router.get("/changes", response_model=ChangeSet)
+@query_budget(10)
+def get_changes(since: int = Query(0, ge=0), db: Session = Depends(get_db)):
+    """Get entities upserted or deleted since a portfolio version"""
+    return change_log_service.get_changes(db, since)
+
+@router.get("/events")
+@query_budget(0)
+async def stream_events(last_event_id: Optional[str] = Header(None)):
+    """Stream committed changes as Server-Sent Events; ids are portfolio versions"""
+    return StreamingResponse(
+        change_notifier.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ?fields= and ?include= take comma-separated names and switch the response
+# to just those fields and relationships; the list takes card fields only
+
+@router.get("/projects", response_model=List[ProjectCard])
+@query_budget(3)
 def get_projects(
     category_id: Optional[int] = None,
     skill_id: Optional[int] = None,
     featured: Optional[bool] = None,
     with_case_studies: Optional[bool] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,  # Cards have no relationships to expand, so any name is refused
     db: Session = Depends(get_db)
 ):
-    """Get projects with optional filtering"""
-    if category_id:
-        return project_service.get_by_category(db, category_id)
-    elif skill_id:
-        return project_service.get_by_skill(db, skill_id)
-    elif featured:
-        return project_service.get_featured(db)
-    elif with_case_studies:
-        return project_service.get_with_case_studies(db)
-    else:
-        return project_service.get_all_with_relations(db)
+    """Get project cards, newest first, with optional filtering"""
+    filters = dict(
+        category_id=category_id, skill_id=skill_id,
+        featured=bool(featured), with_case_studies=bool(with_case_studies)
+    )
+    selection = project_card_service.fieldset.select(fields, include)
+    if selection is None:
+        return project_card_service.get_cards(db, **filters)
+    return selection.response(project_card_service.get_cards(db, options=selection.options, **filters))
 
 @router.get("/projects/{project_id}", response_model=Project)
-def get_project_detail(project_id: int, db: Session = Depends(get_db)):
+@query_budget(5)
+def get_project_detail(
+    project_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """Get detailed project information"""
-    project = project_service.get_by_id(db, project_id)
+    selection = project_service.fieldset.select(fields, include, many=False)
+    if selection is None:
+        body = project_detail_service.get(db, project_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return Response(content=body, media_type="application/json")
+    
+    project = project_service.get_by_id(db, project_id, selection.options)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return selection.response(project)
+
+@router.get("/projects/{project_id}/related", response_model=List[RelatedProjectCard])
+@query_budget(5)
+def get_related_projects(
+    project_id: int,
+    limit: int = Query(RELATED_PROJECTS, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Get cards of the projects most similar by skills, technologies and category"""
+    related = related_project_service.get_related(db, project_id, limit)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return related
 
 @router.get("/skills", response_model=List[Skill])
-def get_skills(category: Optional[str] = None, db: Session = Depends(get_db)):
+@query_budget(1)
+def get_skills(
+    category: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """Get skills with optional category filtering"""
+    selection = skill_service.fieldset.select(fields, None)
+    options = selection.options if selection else ()
     if category:
-        return skill_service.get_by_category(db, category)
-    return skill_service.get_all(db)
+        skills = skill_service.get_by_category(db, category, options)
+    else:
+        skills = skill_service.get_all(db, options=options)
+    return selection.response(skills) if selection else skills
+
+@router.get("/skills/{skill_id}/projects", response_model=SkillProjects)
+@query_budget(2)
+def get_skill_projects(
+    skill_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(SKILL_TOP_PROJECTS, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get project cards using a skill, most relevant then newest first"""
+    result = skill_ranking_service.get_projects(db, skill_id, offset, limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    return result
 
 @router.get("/skills/categories")
+@query_budget(1)
 def get_skill_categories(db: Session = Depends(get_db)):
     """Get all skill categories"""
     return {"categories": skill_service.get_categories(db)}
 
+@router.get("/skills/stats", response_model=List[SkillStats])
+@query_budget(4)
+def get_skill_stats(db: Session = Depends(get_db)):
+    """Get project counts, average relevance and co-occurring skills for every skill"""
+    return Response(content=skill_stats_service.get_stats(db), media_type="application/json")
+
 @router.get("/experience", response_model=List[WorkExperience])
-def get_work_experience(current_only: Optional[bool] = None, db: Session = Depends(get_db)):
+@query_budget(1)
+def get_work_experience(
+    current_only: Optional[bool] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """Get work experience"""
+    selection = work_experience_service.fieldset.select(fields, None)
+    options = selection.options if selection else ()
     if current_only:
-        return work_experience_service.get_current_positions(db)
-    return work_experience_service.get_all_ordered(db)
+        experiences = work_experience_service.get_current_positions(db, options)
+    else:
+        experiences = work_experience_service.get_all_ordered(db, options)
+    return selection.response(experiences) if selection else experiences
 
 @router.get("/education", response_model=List[Education])
+@query_budget(1)
 def get_education(
     type: Optional[str] = None,  # "degree" or "certification"
     current_only: Optional[bool] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Get education records"""
+    selection = education_service.fieldset.select(fields, None)
+    options = selection.options if selection else ()
     if current_only:
-        return education_service.get_current(db)
+        education = education_service.get_current(db, options)
     elif type == "degree":
-        return education_service.get_degrees(db)
+        education = education_service.get_degrees(db, options)
     elif type == "certification":
-        return education_service.get_certifications(db)
+        education = education_service.get_certifications(db, options)
     else:
-        return education_service.get_all_ordered(db)
+        education = education_service.get_all_ordered(db, options)
+    return selection.response(education) if selection else education
 
 # Image serving endpoints
+def _blob_file(request: Request, db: Session, kind: str, target_id: Optional[int], detail: str) -> Optional[Response]:
+    """Serve a blob from the on-disk cache; None when the cache is disabled"""
+    if not blob_cache_service.enabled:
+        return None
+    blob = blob_cache_service.get(db, kind, target_id)
+    if blob is None:
+        raise HTTPException(status_code=404, detail=detail)
+    
+    headers = {"ETag": f'"{blob.digest}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    if settings.blob_cache_accel_prefix:
+        # nginx serves the file itself, with sendfile
+        headers["X-Accel-Redirect"] = settings.blob_cache_accel_prefix + blob.relative_path
+        return Response(media_type=blob.media_type, headers=headers)
+    return FileResponse(blob.path, media_type=blob.media_type, headers=headers)
+
 @router.get("/images/profile")
-def get_profile_image(db: Session = Depends(get_db)):
+@query_budget(3)
+def get_profile_image(request: Request, db: Session = Depends(get_db)):
     """Get profile image"""
+    cached = _blob_file(request, db, "profile_image", None, "Profile image not found")
+    if cached is not None:
+        return cached
     image_data = personal_info_service.get_profile_image(db)
     if not image_data:
         raise HTTPException(status_code=404, detail="Profile image not found")
@@ -104,8 +226,12 @@ def get_profile_image(db: Session = Depends(get_db)):
     return Response(content=content, media_type=mime_type)
 
 @router.get("/images/skills/{skill_id}")
-def get_skill_icon(skill_id: int, db: Session = Depends(get_db)):
+@query_budget(3)
+def get_skill_icon(skill_id: int, request: Request, db: Session = Depends(get_db)):
     """Get skill icon"""
+    cached = _blob_file(request, db, "skill_icon", skill_id, "Skill icon not found")
+    if cached is not None:
+        return cached
     image_data = skill_service.get_icon(db, skill_id)
     if not image_data:
         raise HTTPException(status_code=404, detail="Skill icon not found")
@@ -114,8 +240,12 @@ def get_skill_icon(skill_id: int, db: Session = Depends(get_db)):
     return Response(content=content, media_type=mime_type)
 
 @router.get("/images/companies/{experience_id}")
-def get_company_logo(experience_id: int, db: Session = Depends(get_db)):
+@query_budget(3)
+def get_company_logo(experience_id: int, request: Request, db: Session = Depends(get_db)):
     """Get company logo"""
+    cached = _blob_file(request, db, "company_logo", experience_id, "Company logo not found")
+    if cached is not None:
+        return cached
     image_data = work_experience_service.get_company_logo(db, experience_id)
     if not image_data:
         raise HTTPException(status_code=404, detail="Company logo not found")
@@ -124,8 +254,12 @@ def get_company_logo(experience_id: int, db: Session = Depends(get_db)):
     return Response(content=content, media_type=mime_type)
 
 @router.get("/images/projects/{image_id}")
-def get_project_image(image_id: int, db: Session = Depends(get_db)):
+@query_budget(3)
+def get_project_image(image_id: int, request: Request, db: Session = Depends(get_db)):
     """Get project image"""
+    cached = _blob_file(request, db, "project_image", image_id, "Project image not found")
+    if cached is not None:
+        return cached
     image_data = project_image_service.get_image_data(db, image_id)
     if not image_data:
         raise HTTPException(status_code=404, detail="Project image not found")
@@ -134,8 +268,12 @@ def get_project_image(image_id: int, db: Session = Depends(get_db)):
     return Response(content=content, media_type=mime_type)
 
 @router.get("/images/institutions/{education_id}")
-def get_institution_logo(education_id: int, db: Session = Depends(get_db)):
+@query_budget(3)
+def get_institution_logo(education_id: int, request: Request, db: Session = Depends(get_db)):
     """Get institution logo"""
+    cached = _blob_file(request, db, "institution_logo", education_id, "Institution logo not found")
+    if cached is not None:
+        return cached
     image_data = education_service.get_institution_logo(db, education_id)
     if not image_data:
         raise HTTPException(status_code=404, detail="Institution logo not found")
@@ -143,9 +281,26 @@ def get_institution_logo(education_id: int, db: Session = Depends(get_db)):
     content, mime_type = image_data
     return Response(content=content, media_type=mime_type)
 
+@router.get("/images/bundles/{kind}")
+@query_budget(3)
+def get_image_bundle(kind: str, request: Request, db: Session = Depends(get_db)):
+    """Get every skill icon, company logo or institution logo in one multipart response"""
+    bundle = bundle_service.get(db, kind)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Unknown image bundle")
+    
+    headers = {"ETag": bundle.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == bundle.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=bundle.body, media_type=bundle.media_type, headers=headers)
+
 @router.get("/documents/certificates/{education_id}")
-def get_certificate(education_id: int, db: Session = Depends(get_db)):
+@query_budget(3)
+def get_certificate(education_id: int, request: Request, db: Session = Depends(get_db)):
     """Get education certificate"""
+    cached = _blob_file(request, db, "certificate", education_id, "Certificate not found")
+    if cached is not None:
+        return cached
     document_data = education_service.get_certificate(db, education_id)
     if not document_data:
         raise HTTPException(status_code=404, detail="Certificate not found")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.v1 import auth, public
-from app.api.v1.admin import user, portfolio, projects, education
+from app.api.v1.admin import user, portfolio, projects, education, jobs, backup, batch
 
 # Create main v1 router
 api_router = APIRouter()
@@ -15,4 +15,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(user.router, prefix="/admin", tags=["Admin - User"])
 api_router.include_router(portfolio.router, prefix="/admin", tags=["Admin - Portfolio"])
 api_router.include_router(projects.router, prefix="/admin", tags=["Admin - Projects"])
-api_router.include_router(education.router, prefix="/admin", tags=["Admin - Education"])
\ No newline at end of file
+api_router.include_router(education.router, prefix="/admin", tags=["Admin - Education"])
+api_router.include_router(jobs.router, prefix="/admin", tags=["Admin - Jobs"])
+api_router.include_router(backup.router, prefix="/admin", tags=["Admin - Backup"])
+api_router.include_router(batch.router, prefix="/admin", tags=["Admin - Batch"])
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Management commands.
+
+    python -m app.cli init-db           Create database tables and the bootstrap admin
+    python -m app.cli migrate           Update tables created by older versions
+    python -m app.cli create-admin      Create an admin account
+    python -m app.cli startup-profile   Measure import and startup time
+    python -m app.cli export-static     Render the public API to static files
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+def init_db_command(args) -> None:
+    """Create all tables that do not exist yet, plus the bootstrap admin"""
+    from app.config.database import SessionLocal, init_db
+    from app.config.settings import get_settings
+    from app.schemas import AdminCreate
+    from app.services import admin_service
+
+    init_db()
+    print("Database tables created")
+
+    settings = get_settings()
+    if not (settings.admin_username and settings.admin_password):
+        return
+    db = SessionLocal()
+    try:
+        if admin_service.count(db) == 0:
+            admin_service.create(db, AdminCreate(
+                username=settings.admin_username,
+                password=settings.admin_password
+            ))
+            print(f"Admin '{settings.admin_username}' created")
+    finally:
+        db.close()
+
+def migrate_command(args) -> None:
+    """Convert legacy columns, add missing columns and indexes and fill the project cards"""
+    from app.config.database import get_engine
+    from app.config.migrations import migrate
+
+    try:
+        result = migrate(get_engine())
+    except ValueError as e:
+        sys.exit(str(e))
+    for table, rows in result["dates_converted"].items():
+        if rows:
+            print(f"{table}: converted dates on {rows} rows")
+    for name in result["columns_added"]:
+        print(f"Added column {name}")
+    for name in result["indexes_created"]:
+        print(f"Created index {name}")
+    for name in result["indexes_dropped"]:
+        print(f"Dropped index {name}")
+    if result["project_cards_built"]:
+        print(f"Built {result['project_cards_built']} project cards")
+    if result["skill_rankings_built"]:
+        print(f"Built {result['skill_rankings_built']} skill rankings")
+    if result["change_log_versions_stamped"]:
+        print(f"Stamped {result['change_log_versions_stamped']} change log rows with their version")
+    print("Database is up to date")
+
+def create_admin_command(args) -> None:
+    """Create an admin, prompting for the password"""
+    import getpass
+    from app.config.database import SessionLocal, get_engine
+    from app.schemas import AdminCreate
+    from app.services import admin_service
+
+    password = os.environ.get(args.password_env) if args.password_env else getpass.getpass("Password: ")
+    get_engine()
+    db = SessionLocal()
+    try:
+        admin_service.create(db, AdminCreate(username=args.username, password=password))
+    finally:
+        db.close()
+    print(f"Admin '{args.username}' created")
+
+_PROFILE_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+async def run_lifespan():
+    async with app.main.lifespan(app.main.app):
+        pass
+asyncio.run(run_lifespan())
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 2),
+    "lifespan_ms": app.main.startup_timings["lifespan_ms"],
+}))
+"""
+
+def startup_profile_command(args) -> None:
+    """Import the app in fresh interpreters and report cold import and startup time"""
+    import json
+    import statistics
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.check_output([sys.executable, "-c", _PROFILE_SCRIPT], env=os.environ.copy())
+        runs.append(json.loads(output.decode().strip().splitlines()[-1]))
+
+    for key in ("import_ms", "lifespan_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:12} median={statistics.median(values):8.1f}  min={min(values):8.1f}  max={max(values):8.1f}")
+
+    if args.top:
+        # Slowest modules by cumulative import time
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            env=os.environ.copy(), capture_output=True, text=True
+        )
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, module = line.split("|")
+            rows.append((int(cumulative_us), module.strip()))
+        print("\nSlowest imports (cumulative ms):")
+        for cumulative_us, module in sorted(rows, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f}  {module}")
+
+def export_static_command(args) -> None:
+    """Render the public API into a directory, rewriting only what changed"""
+    from app.config.database import SessionLocal, get_engine
+    from app.services.static_export import export_static
+
+    get_engine()
+    db = SessionLocal()
+    try:
+        stats = export_static(db, args.output_dir)
+    finally:
+        db.close()
+    print(
+        f"Exported {stats['routes']} routes to {args.output_dir}: "
+        f"{stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed"
+    )
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Portfolio management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init_db_parser = subparsers.add_parser("init-db", help="Create database tables")
+    init_db_parser.set_defaults(func=init_db_command)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Update tables created by older versions")
+    migrate_parser.set_defaults(func=migrate_command)
+
+    create_admin_parser = subparsers.add_parser("create-admin", help="Create an admin account")
+    create_admin_parser.add_argument("username")
+    create_admin_parser.add_argument("--password-env", help="Read the password from this environment variable")
+    create_admin_parser.set_defaults(func=create_admin_command)
+
+    profile_parser = subparsers.add_parser("startup-profile", help="Measure import and startup time")
+    profile_parser.add_argument("--runs", type=int, default=5)
+    profile_parser.add_argument("--top", type=int, default=15, help="Show the N slowest imports (0 to skip)")
+    profile_parser.set_defaults(func=startup_profile_command)
+
+    export_parser = subparsers.add_parser("export-static", help="Render the public API to static files")
+    export_parser.add_argument("output_dir")
+    export_parser.set_defaults(func=export_static_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,292 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session, sessionmaker
 from app.config.settings import get_settings
 
 settings = get_settings()
 
-# Create database engine with proper pool settings for production
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.environment == "development"
-)
+class FailoverSession(Session):
+    """Session that moves a read off a replica that fails under it.
+
+    When a statement fails on a replica and the replica router marks that
+    replica unhealthy, the session rolls back and reruns the statement on
+    the next healthy replica, or on the primary. Sessions on the primary
+    raise as usual.
+    """
+
+    def get_bind(self, *args, **kwargs):
+        # Start the clock for pool wait time; the checkout that may follow reads it
+        _connection_requested.at = time.perf_counter()
+        return super().get_bind(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._with_failover(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._with_failover(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._with_failover(super().scalars, *args, **kwargs)
 
-# Create SessionLocal class
+    def _with_failover(self, method, *args, **kwargs):
+        while True:
+            replica = self.bind
+            try:
+                return method(*args, **kwargs)
+            except exc.TimeoutError:
+                # No pool event fires for a checkout that times out
+                if replica in _pool_metrics:
+                    _pool_metrics[replica].record_timeout()
+                raise
+            except exc.DBAPIError:
+                router = get_replica_router() if settings.database_replica_urls else None
+                if router is None or replica not in router.engines or router.is_healthy(replica):
+                    raise
+                # Replica sessions only read, so nothing is lost by starting over elsewhere
+                self.rollback()
+                self.bind = router.choose() or get_engine()
+
+# Create SessionLocal class; bound to the engine when it is first built
 SessionLocal = sessionmaker(
+    class_=FailoverSession,
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
-# Database dependency
+class PoolMetrics:
+    """Saturation gauges for one engine's pool, fed by pool events"""
+
+    def __init__(self, max_overflow: int):
+        self.max_overflow = max_overflow
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.idle_pings = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, checked_out: int, wait_seconds: Optional[float]) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            if wait_seconds is not None:
+                self.waits += 1
+                self.wait_total += wait_seconds
+                self.wait_max = max(self.wait_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "peak_checked_out": self.peak_checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": self.max_overflow,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "timeouts": self.timeouts,
+            "idle_pings": self.idle_pings,
+            "wait_ms_avg": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+            "wait_ms_max": round(self.wait_max * 1000, 3),
+        }
+
+# Metrics per engine; they outlive the pool that engine.dispose() replaces
+_pool_metrics: Dict[Engine, PoolMetrics] = {}
+
+# When this thread's session last asked for a connection; the next checkout reports the wait
+_connection_requested = threading.local()
+
+def _instrument_pool(engine: Engine, max_overflow: int) -> PoolMetrics:
+    metrics = PoolMetrics(max_overflow)
+
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        requested_at = getattr(_connection_requested, "at", None)
+        _connection_requested.at = None
+        wait = time.perf_counter() - requested_at if requested_at is not None else None
+        metrics.record_checkout(engine.pool.checkedout(), wait)
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "checkout", on_checkout)
+    _pool_metrics[engine] = metrics
+    return metrics
+
+def _ping_if_idle(idle_seconds: float, metrics: Optional[PoolMetrics]):
+    """Checkout hook that pings only connections idle longer than `idle_seconds`"""
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        if metrics is not None:
+            metrics.idle_pings += 1
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            # The pool discards this connection and retries with a new one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    return on_checkout, on_checkin
+
+def _create_engine(url: str) -> Engine:
+    profile = settings.active_pool_profile
+    options = dict(
+        pool_pre_ping=profile.pre_ping == "always",
+        pool_recycle=profile.pool_recycle,
+        echo=settings.environment == "development"
+    )
+    
+    # In-memory SQLite uses a per-thread pool that cannot be sized
+    parsed = make_url(url)
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=QueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+            pool_timeout=profile.pool_timeout
+        )
+    
+    engine = create_engine(url, **options)
+    metrics = _instrument_pool(engine, profile.max_overflow) if isinstance(engine.pool, QueuePool) else None
+    if profile.pre_ping == "idle":
+        on_checkout, on_checkin = _ping_if_idle(profile.idle_ping_seconds, metrics)
+        event.listen(engine, "checkout", on_checkout)
+        event.listen(engine, "checkin", on_checkin)
+    return engine
+
+def pool_metrics() -> dict:
+    """Pool gauges for the primary and any replicas built so far"""
+    engines = {"primary": get_engine()}
+    if settings.database_replica_urls:
+        for i, engine in enumerate(get_replica_router().engines):
+            engines[f"replica_{i}"] = engine
+    return {
+        name: _pool_metrics[engine].snapshot(engine.pool)
+        for name, engine in engines.items()
+        if engine in _pool_metrics
+    }
+
+@lru_cache()
+def get_engine() -> Engine:
+    """Create the primary database engine on first use instead of at import"""
+    engine = _create_engine(settings.database_url)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+def __getattr__(name: str):
+    # Keep `from app.config.database import engine` working without
+    # building the engine at import time
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class ReplicaRouter:
+    """Pick a read replica per session.
+
+    Replicas are used round-robin. A replica whose connection fails is
+    skipped for `retry_seconds`, and the statement that failed is rerun
+    elsewhere by `FailoverSession`; with no healthy replica, or within the
+    read-your-writes window after a primary commit, reads use the primary.
+    State is per process.
+    """
+
+    def __init__(self, engines: List[Engine], retry_seconds: float, read_your_writes_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._unhealthy_until = {}
+        self._last_write = 0.0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None to read from the primary"""
+        now = time.monotonic()
+        if self.read_your_writes_seconds and now - self._last_write < self.read_your_writes_seconds:
+            return None
+
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[next(self._counter) % len(self.engines)]
+                if self._unhealthy_until.get(engine, 0.0) <= now:
+                    return engine
+        return None
+
+    def mark_unhealthy(self, engine: Engine) -> None:
+        with self._lock:
+            self._unhealthy_until[engine] = time.monotonic() + self.retry_seconds
+
+    def is_healthy(self, engine: Engine) -> bool:
+        return self._unhealthy_until.get(engine, 0.0) <= time.monotonic()
+
+    def record_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    def healthy_count(self) -> int:
+        return sum(1 for engine in self.engines if self.is_healthy(engine))
+
+    def _on_error(self, context) -> None:
+        # Connect failures have no connection yet; disconnects are flagged
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.engine)
+
+@lru_cache()
+def get_replica_router() -> ReplicaRouter:
+    """Build replica engines on first use"""
+    return ReplicaRouter(
+        [_create_engine(url) for url in settings.database_replica_urls],
+        retry_seconds=settings.replica_retry_seconds,
+        read_your_writes_seconds=settings.read_your_writes_seconds
+    )
+
+def init_db() -> None:
+    """Create all tables. Run explicitly via `python -m app.cli init-db`."""
+    from app.models import Base
+    Base.metadata.create_all(bind=get_engine())
+
+# Database dependencies
 def get_db():
+    """Read session: a replica when configured, otherwise the primary"""
+    primary = get_engine()
+    replica = get_replica_router().choose() if settings.database_replica_urls else None
+    db = SessionLocal(bind=replica or primary)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_primary_db():
+    """Read/write session pinned to the primary"""
+    get_engine()
     db = SessionLocal()
+    if settings.database_replica_urls:
+        event.listen(db, "after_commit", _record_write)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def _record_write(session: Session) -> None:
+    get_replica_router().record_write()
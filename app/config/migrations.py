@@ -0,0 +1,177 @@
+"""Bring databases created by older versions up to the current models.
+
+`init-db` only creates missing tables; `python -m app.cli migrate` changes
+existing ones and is safe to run repeatedly.
+"""
+from typing import Dict, List
+from sqlalchemy import Date, bindparam, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.utils.dates import parse_partial_date
+
+# Indexes superseded by ones declared on the models, by table
+OBSOLETE_INDEXES = {
+    "project_skills": ["ix_project_skills_skill_id"],  # By (skill_id, relevance_score)
+}
+
+# Nullable columns added to existing tables, by table
+ADDED_COLUMNS = {
+    "jobs": ["lease_expires_at"],
+    "change_log": ["version"],
+}
+
+# Tables whose start_date/end_date were free-form String(20), and whether start_date is required
+PARTIAL_DATE_TABLES = {
+    "work_experiences": True,
+    "education": True,
+    "projects": False,
+}
+
+def _convert_partial_dates(conn: Connection, table: str, start_required: bool) -> int:
+    """Replace string start_date/end_date with DATE columns plus precision; returns rows converted"""
+    columns = {column["name"] for column in inspect(conn).get_columns(table)}
+    if "start_date_precision" in columns:
+        return 0
+
+    rows = conn.execute(text(f"SELECT id, start_date, end_date FROM {table}")).all()
+    values, errors = [], []
+    for id, start, end in rows:
+        row = {"id": id}
+        for name, raw in (("start_date", start), ("end_date", end)):
+            try:
+                row[name], row[f"{name}_precision"] = parse_partial_date(raw or "", ongoing=name == "end_date")
+            except ValueError as e:
+                errors.append(f"{table} {id} {name}: {e}")
+                row[name] = raw
+        if start_required and row["start_date"] is None:
+            errors.append(f"{table} {id} start_date: missing")
+        values.append(row)
+    if errors:
+        raise ValueError("Fix these dates and run the migration again:\n  " + "\n  ".join(errors))
+
+    for name in ("start_date", "end_date"):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name}_parsed DATE"))
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name}_precision VARCHAR(5)"))
+    if values:
+        update = text(
+            f"UPDATE {table} SET start_date_parsed = :start_date, start_date_precision = :start_date_precision, "
+            f"end_date_parsed = :end_date, end_date_precision = :end_date_precision WHERE id = :id"
+        ).bindparams(bindparam("start_date", type_=Date), bindparam("end_date", type_=Date))
+        conn.execute(update, values)
+    for name in ("start_date", "end_date"):
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {name}"))
+        conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {name}_parsed TO {name}"))
+
+    # SQLite can't add NOT NULL to an existing column; the models still enforce it on insert
+    if start_required and conn.dialect.name == "postgresql":
+        conn.execute(text(f"UPDATE {table} SET start_date_precision = 'day' WHERE start_date_precision IS NULL"))
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN start_date SET NOT NULL"))
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN start_date_precision SET NOT NULL"))
+    return len(values)
+
+def _add_missing_columns(conn: Connection) -> List[str]:
+    """Add columns the models declare that existing tables lack"""
+    from app.models import Base
+
+    existing_tables = set(inspect(conn).get_table_names())
+    added = []
+    for table, names in ADDED_COLUMNS.items():
+        if table not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspect(conn).get_columns(table)}
+        for name in names:
+            if name not in existing:
+                column_type = Base.metadata.tables[table].c[name].type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+                added.append(f"{table}.{name}")
+    return added
+
+def _create_missing_indexes(conn: Connection) -> List[str]:
+    """Create indexes declared on the models that existing tables lack"""
+    from app.models import Base
+
+    existing_tables = set(inspect(conn).get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)  # A no-op for indexes declared for another dialect
+                if index.name not in created:
+                    created.append(index.name)
+    return created
+
+def _drop_obsolete_indexes(conn: Connection) -> List[str]:
+    """Drop indexes the models replaced with better ones"""
+    existing_tables = set(inspect(conn).get_table_names())
+    dropped = []
+    for table, names in OBSOLETE_INDEXES.items():
+        if table not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspect(conn).get_indexes(table)}
+        for name in names:
+            if name in existing:
+                conn.execute(text(f"DROP INDEX {name}"))
+                dropped.append(name)
+    return dropped
+
+def _build_project_cards(conn: Connection) -> int:
+    """Create and fill the project card read model for projects that predate it"""
+    from app.models import ProjectCard
+    from app.services.project import project_card_service
+
+    ProjectCard.__table__.create(conn, checkfirst=True)
+    projects, cards = conn.execute(text(
+        "SELECT (SELECT COUNT(*) FROM projects), (SELECT COUNT(*) FROM project_cards)"
+    )).one()
+    if projects == cards:
+        return 0
+    return project_card_service.rebuild(Session(bind=conn))
+
+def _build_skill_rankings(conn: Connection) -> int:
+    """Create and fill the skill ranking read model for associations that predate it"""
+    from app.models import SkillRanking
+    from app.services.project import skill_ranking_service
+
+    SkillRanking.__table__.create(conn, checkfirst=True)
+    ranked, rankings = conn.execute(text(
+        "SELECT (SELECT COUNT(DISTINCT skill_id) FROM project_skills), (SELECT COUNT(*) FROM skill_rankings)"
+    )).one()
+    if ranked == rankings:
+        return 0
+    return skill_ranking_service.rebuild(Session(bind=conn))
+
+def _start_version_counter(conn: Connection) -> int:
+    """Create the portfolio version counter and stamp older change log rows; returns rows stamped"""
+    from app.models import PortfolioVersion
+
+    PortfolioVersion.__table__.create(conn, checkfirst=True)
+    # Before the counter, each row's id was the portfolio version
+    stamped = conn.execute(text("UPDATE change_log SET version = id WHERE version IS NULL")).rowcount
+    conn.execute(text(
+        "UPDATE portfolio_version SET version = (SELECT COALESCE(MAX(version), 0) FROM change_log) "
+        "WHERE version < (SELECT COALESCE(MAX(version), 0) FROM change_log)"
+    ))
+    return stamped
+
+def migrate(engine: Engine) -> Dict[str, object]:
+    """Apply every pending change in one transaction"""
+    with engine.begin() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        converted = {
+            table: _convert_partial_dates(conn, table, start_required)
+            for table, start_required in PARTIAL_DATE_TABLES.items()
+            if table in existing_tables
+        }
+        columns = _add_missing_columns(conn)
+        indexes = _create_missing_indexes(conn)
+        dropped = _drop_obsolete_indexes(conn)
+        cards = _build_project_cards(conn) if "projects" in existing_tables else 0
+        rankings = _build_skill_rankings(conn) if "project_skills" in existing_tables else 0
+        versions = _start_version_counter(conn) if "change_log" in existing_tables else 0
+    return {
+        "dates_converted": converted, "columns_added": columns, "indexes_created": indexes, "indexes_dropped": dropped,
+        "project_cards_built": cards, "skill_rankings_built": rankings, "change_log_versions_stamped": versions
+    }
@@ -1,6 +1,37 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
+
+class PoolProfile(BaseModel):
+    """Connection pool sizing for one engine"""
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30  # Seconds to wait for a connection
+    pool_recycle: int = 300
+    pre_ping: str = "always"  # "always", "idle" (only after idle_ping_seconds idle) or "never"
+    idle_ping_seconds: float = 60
+
+# Connections each uvicorn worker can hold are bounded by pool_size + max_overflow;
+# sync endpoints run on anyio's thread pool (40 threads by default), so a worker
+# can want up to 40 connections at once under load.
+DEFAULT_POOL_PROFILES = {
+    "default": PoolProfile(),
+    "small": PoolProfile(pool_size=2, max_overflow=3, pool_timeout=10, pre_ping="idle"),
+    "throughput": PoolProfile(pool_size=20, max_overflow=20, pool_timeout=5, pool_recycle=1800, pre_ping="idle"),
+}
+
+class RateLimit(BaseModel):
+    """Token bucket for one route class: `rate` requests/second, bursts up to `burst`"""
+    rate: float
+    burst: int
+
+# Route classes without an entry (e.g. "admin") are not limited
+DEFAULT_RATE_LIMITS = {
+    "public": RateLimit(rate=10, burst=40),
+    "images": RateLimit(rate=30, burst=120),
+    "auth": RateLimit(rate=0.2, burst=5),
+}
 
 class Settings(BaseSettings):
     # Environment
@@ -9,13 +40,50 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str
+    database_replica_urls: List[str] = []  # Public reads are spread across these
+    replica_retry_seconds: float = 30  # How long a failed replica is skipped
+    read_your_writes_seconds: float = 0  # Read from the primary this long after an admin commit
+    pool_profile: str = "default"
+    pool_profiles: Dict[str, PoolProfile] = DEFAULT_POOL_PROFILES
     
     # Security
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
-    admin_username: str
-    admin_password: str
+    token_cache_size: int = 1024  # Verified tokens kept in memory (0 disables)
+    token_revocation_check_seconds: float = 5  # Cached tokens are rechecked against logouts on other workers this often
+    bcrypt_rounds: int = 12  # Raising this rehashes admin passwords on next login
+    password_hash_workers: int = 2  # Dedicated threads for bcrypt
+    max_concurrent_logins: int = 4  # Further logins get 429 instead of queueing
+    
+    # Background jobs for upload post-processing
+    job_workers: int = 2
+    job_max_attempts: int = 3
+    job_lease_seconds: float = 600  # A job still running after this is requeued by the next worker to start
+    
+    # Cached responses (project details, image bundles), checked against the portfolio version
+    cache_backend: str = "memory"  # "memory" (per worker) or "sqlite" (one file shared by the workers on a host)
+    cache_path: str = "portfolio-cache.sqlite3"  # File for the sqlite backend
+    cache_max_entries: int = 1000  # Least recently used (sqlite: least recently stored) evicted past this
+    
+    # Images and certificates written to disk by content hash and served as files
+    blob_cache_dir: Optional[str] = None  # Unset serves blobs straight from the database
+    blob_cache_max_bytes: int = 512 * 1024 * 1024  # Least recently served files removed past this
+    blob_cache_pin_seconds: float = 60  # Files served this recently are never removed, so none goes mid-response
+    blob_cache_eager: bool = False  # Also write each blob when its upload is processed
+    blob_cache_accel_prefix: Optional[str] = None  # e.g. "/_blobs/": let nginx send files via X-Accel-Redirect
+    
+    # Server-Sent Events for committed changes
+    events_poll_seconds: float = 2  # How soon another worker's commit is pushed
+    events_heartbeat_seconds: float = 15  # Comment sent on idle streams to keep proxies from closing them
+    events_buffer_size: int = 1000  # Recent events kept for Last-Event-ID resume
+    
+    # Bulk import
+    import_batch_size: int = 200  # Rows per insert batch; an import is one transaction
+    
+    # Bootstrap admin, created by `python -m app.cli init-db` when no admin exists
+    admin_username: Optional[str] = None
+    admin_password: Optional[str] = None
     
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000"]
@@ -25,12 +93,28 @@ class Settings(BaseSettings):
     allowed_image_types: List[str] = ["image/jpeg", "image/png", "image/webp"]
     allowed_document_types: List[str] = ["application/pdf"]
     
+    # Rate limiting (per client IP and route class)
+    rate_limit_enabled: bool = True
+    rate_limits: Dict[str, RateLimit] = DEFAULT_RATE_LIMITS
+    rate_limit_max_clients: int = 10000  # Buckets kept in memory, least recently seen evicted
+    rate_limit_trusted_proxies: int = 0  # Proxies in front of the app that append to X-Forwarded-For (0 uses the peer address)
+    
+    # Query budgets ("off", "log" or "raise")
+    query_budget_mode: str = "off"
+    query_budget_max_repeats: int = 2
+    
     class Config:
         env_file = ".env"
         
     @property
     def allowed_file_types(self) -> List[str]:
         return self.allowed_image_types + self.allowed_document_types
+    
+    @property
+    def active_pool_profile(self) -> PoolProfile:
+        if self.pool_profile not in self.pool_profiles:
+            raise ValueError(f"Unknown pool profile: {self.pool_profile}")
+        return self.pool_profiles[self.pool_profile]
 
 @lru_cache()
 def get_settings():
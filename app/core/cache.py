@@ -0,0 +1,145 @@
+"""Cache backends for serialized responses.
+
+`memory` keeps entries in the worker that built them. `sqlite` keeps them
+in one file that every worker on the host opens, so an entry built by one
+worker serves the rest. Entries carry the portfolio version they were
+built at; see app.services.cache for how that version is checked.
+"""
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from app.config.settings import get_settings
+
+@dataclass
+class CacheEntry:
+    version: int  # Portfolio version the value was built at
+    value: bytes
+
+class CacheBackend(ABC):
+    """Bytes by key, each stamped with a portfolio version"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> None:
+        """Drop every entry whose key starts with `prefix`"""
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+class SQLiteCacheBackend(CacheBackend):
+    """A SQLite file shared by the workers on one host.
+
+    WAL mode lets readers proceed while one worker writes. Each thread
+    opens its own connection, and a forked worker reopens rather than
+    sharing its parent's. Past `max_entries` the least recently stored
+    entries are evicted.
+    """
+
+    _TRIM_EVERY = 100  # Writes between eviction passes
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, version INTEGER NOT NULL, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_stored_at ON cache_entries (stored_at)")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._connect().execute(
+            "SELECT version, value FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        return CacheEntry(row[0], bytes(row[1])) if row else None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, version, value, stored_at) VALUES (?, ?, ?, ?)",
+            (key, entry.version, entry.value, time.time())
+        )
+        self._writes += 1
+        if self._writes % self._TRIM_EVERY == 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._connect().executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self, prefix: str = "") -> None:
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+@lru_cache()
+def get_cache_backend() -> CacheBackend:
+    """The backend chosen by `cache_backend`, one per process"""
+    settings = get_settings()
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend(settings.cache_max_entries)
+    if settings.cache_backend == "sqlite":
+        return SQLiteCacheBackend(settings.cache_path, settings.cache_max_entries)
+    raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Iterable, Optional
+
+@dataclass
+class Event:
+    id: int  # Several events may share one; they are published together
+    event: str
+    data: dict
+    resumable: bool = True  # Send the id; False for all but the last event sharing it
+
+    def encode(self) -> bytes:
+        id_field = f"id: {self.id}\n" if self.resumable else ""
+        return f"{id_field}event: {self.event}\ndata: {json.dumps(self.data)}\n\n".encode()
+
+class EventBroadcaster:
+    """Fan out events to any number of Server-Sent Events subscribers.
+
+    Events live in one shared ring buffer; subscribers only keep the id of
+    the last event they sent and wait on one shared signal, so an idle
+    connection costs a suspended coroutine and nothing else. A subscriber
+    resuming from an id older than the buffer gets a `reset` event.
+    Must be used from one event loop.
+    """
+
+    def __init__(self, buffer_size: int, heartbeat_seconds: float):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.subscribers = 0
+        self._events: Deque[Event] = deque(maxlen=buffer_size)
+        self._floor = 0  # Events up to this id are no longer (or never were) buffered
+        self._signal: Optional[asyncio.Event] = None
+
+    @property
+    def last_id(self) -> int:
+        return self._events[-1].id if self._events else self._floor
+
+    def reset(self, last_id: int) -> None:
+        """Start the stream at `last_id`, discarding anything buffered"""
+        self._events.clear()
+        self._floor = last_id
+
+    async def publish(self, events: Iterable[Event]) -> None:
+        published = False
+        floor = self.last_id
+        for event in events:
+            if event.id <= floor:
+                continue
+            if len(self._events) == self._events.maxlen:
+                self._floor = self._events[0].id
+            self._events.append(event)
+            published = True
+        if published:
+            # Wake everyone waiting on the current signal; later waiters get a fresh one
+            signal, self._signal = self._signal, asyncio.Event()
+            if signal is not None:
+                signal.set()
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Encoded events after `last_event_id`, with heartbeats while idle"""
+        self.subscribers += 1
+        try:
+            cursor = self.last_id
+            if last_event_id is not None and last_event_id < self._floor:
+                yield Event(cursor, "reset", {"version": cursor}).encode()
+            elif last_event_id is not None:
+                cursor = min(last_event_id, cursor)
+            # Tell the client how often to expect traffic before it should reconnect
+            yield f"retry: {int(self.heartbeat_seconds * 1000)}\n\n".encode()
+
+            while True:
+                pending = self._since(cursor)
+                if pending is None:
+                    # Fell behind the buffer while sending
+                    cursor = self.last_id
+                    yield Event(cursor, "reset", {"version": cursor}).encode()
+                    continue
+                if pending:
+                    for event in pending:
+                        yield event.encode()
+                    cursor = pending[-1].id
+                    continue
+                if not await self._wait(cursor):
+                    yield b": heartbeat\n\n"
+        finally:
+            self.subscribers -= 1
+
+    async def _wait(self, cursor: int) -> bool:
+        """Wait for an event after `cursor`; False if the heartbeat interval passed first"""
+        if self.last_id > cursor:
+            return True
+        if self._signal is None:
+            # Created lazily so it binds to the running loop
+            self._signal = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._signal.wait(), self.heartbeat_seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _since(self, cursor: int) -> Optional[list]:
+        """Buffered events newer than `cursor`, or None if some were evicted"""
+        if cursor < self._floor:
+            return None
+        pending = []
+        for event in reversed(self._events):
+            if event.id <= cursor:
+                break
+            pending.append(event)
+        pending.reverse()
+        return pending
@@ -0,0 +1,110 @@
+"""Sparse fieldsets (`?fields=`) and opt-in relationship expansion (`?include=`).
+
+A Fieldset declares which schema fields and relationships a public view
+can return. Parsing the two query parameters gives a Selection: loader
+options that fetch only the matching columns and relationships, and a
+response schema generated to match. Views keep their full response when
+neither parameter is given.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter, create_model, field_validator
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload, load_only
+
+from app.core.exceptions import ValidationError
+from app.schemas.base import BaseSchema
+
+@dataclass(frozen=True)
+class Expansion:
+    """A relationship clients can ask for by name in ?include="""
+    attribute: Any  # e.g. Project.images
+    schema: Type[BaseModel]
+    loader: Callable = selectinload  # joinedload suits many-to-one
+
+@dataclass
+class Selection:
+    """Loader options and response schema for one ?fields=/?include= request"""
+    options: list
+    adapter: TypeAdapter
+    many: bool
+
+    def response(self, result) -> Response:
+        """Serialize ORM objects with the generated schema"""
+        return Response(
+            self.adapter.dump_json(self.adapter.validate_python(result, from_attributes=True)),
+            media_type="application/json"
+        )
+
+class Fieldset:
+    def __init__(self, model, schema: Type[BaseModel], expansions: Optional[Dict[str, Expansion]] = None,
+                 derived: Optional[Dict[str, Tuple[str, ...]]] = None):
+        """`derived` names the columns behind schema fields computed on the model, like has_case_study,
+        or mapped under another name"""
+        self.model = model
+        self.schema = schema
+        self.expansions = expansions or {}
+        self.derived = derived or {}
+        self.fields = [name for name in schema.model_fields if name not in self.expansions]
+
+    def select(self, fields: Optional[str], include: Optional[str], many: bool = True) -> Optional[Selection]:
+        """Parse the query parameters; None when the client asked for the full response"""
+        if fields is None and include is None:
+            return None
+        names = _split(fields) or self.fields
+        includes = _split(include)
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(self.fields)}")
+        unknown = [name for name in includes if name not in self.expansions]
+        if unknown:
+            raise ValidationError(
+                f"Unknown include: {', '.join(unknown)}; choose from {', '.join(self.expansions) or 'nothing'}"
+            )
+
+        names = ["id"] + [name for name in names if name != "id"]
+        options = [load_only(*_columns(self.model, names, self.derived))]
+        nested = {}
+        for name in includes:
+            expansion = self.expansions[name]
+            related = expansion.attribute.property.mapper.class_
+            options.append(expansion.loader(expansion.attribute).load_only(
+                *_columns(related, list(expansion.schema.model_fields), {})
+            ))
+            nested[name] = self.schema.model_fields[name].annotation
+        return Selection(options, _adapter(self.schema, tuple(names), tuple(sorted(nested.items())), many), many)
+
+def _split(value: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(part.strip() for part in (value or "").split(",") if part.strip()))
+
+def _columns(model, names: List[str], derived: Dict[str, Tuple[str, ...]]) -> list:
+    """Mapped columns behind the given schema fields"""
+    column_names = set(inspect(model).column_attrs.keys())
+    columns = []
+    for name in names:
+        for column in derived.get(name, (name,)):
+            if column in column_names:
+                columns.append(getattr(model, column))
+    return columns
+
+@lru_cache(maxsize=256)
+def _adapter(schema: Type[BaseModel], names: Tuple[str, ...], nested: Tuple[Tuple[str, Any], ...],
+             many: bool) -> TypeAdapter:
+    """Response adapter for a schema cut down to `names` plus the included relationships"""
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names}
+    definitions.update({name: (annotation, schema.model_fields[name]) for name, annotation in nested})
+
+    # Carry over field validators, e.g. splitting comma-separated technologies
+    validators = {}
+    for key, decorator in schema.__pydantic_decorators__.field_validators.items():
+        targets = [name for name in decorator.info.fields if name in definitions]
+        if targets:
+            validators[key] = field_validator(*targets, mode=decorator.info.mode)(
+                classmethod(decorator.func.__func__)
+            )
+
+    sparse = create_model(f"{schema.__name__}Fields", __base__=BaseSchema, __validators__=validators, **definitions)
+    return TypeAdapter(List[sparse] if many else sparse)
@@ -0,0 +1,80 @@
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class RetryableJobError(Exception):
+    """Raised by a job handler to have the job retried after `delay` seconds"""
+    def __init__(self, delay: float):
+        self.delay = delay
+        super().__init__(f"retry in {delay}s")
+
+class JobQueue:
+    """In-process queue of job ids served by a pool of worker threads.
+    
+    Durable job state lives in the database; the handler loads and updates
+    it. This class only schedules ids, including delayed retries.
+    """
+    
+    def __init__(self, handler: Callable[[int], None], workers: int):
+        self.handler = handler
+        self.workers = workers
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._timers: List[threading.Timer] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+    
+    def start(self) -> None:
+        if self.running:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self, timeout: float = 5) -> None:
+        with self._lock:
+            for timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+    
+    def submit(self, job_id: int, delay: float = 0) -> None:
+        if delay <= 0:
+            self._queue.put(job_id)
+            return
+        timer = threading.Timer(delay, self._release, args=(job_id,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.append(timer)
+        timer.start()
+    
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def _release(self, job_id: int) -> None:
+        with self._lock:
+            self._timers = [t for t in self._timers if t.is_alive() and t is not threading.current_thread()]
+        self._queue.put(job_id)
+    
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                self.handler(job_id)
+            except RetryableJobError as retry:
+                self.submit(job_id, retry.delay)
+            except Exception:
+                logger.exception("Job %s crashed", job_id)
@@ -0,0 +1,135 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.settings import get_settings
+from app.core.exceptions import PortfolioException
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_current_tracker: ContextVar[Optional["QueryTracker"]] = ContextVar("query_tracker", default=None)
+
+# Collapse literals and expanded IN lists so statements that differ only in
+# their parameters share one shape
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r"\s+")
+
+class QueryBudgetExceeded(PortfolioException):
+    """Route issued more statements than its declared budget"""
+    def __init__(self, message: str):
+        super().__init__(message, 500)
+
+class QueryTracker:
+    """Statements issued while handling a single request"""
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.count = 0
+        self.shapes: Counter = Counter()
+        self.scope = scope  # The router adds the endpoint to it once the route matches
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        shape = normalize_statement(statement)
+        self.shapes[shape] += 1
+        if settings.query_budget_mode == "raise" and self.scope is not None:
+            # Fail at the statement that goes over, before the route can commit
+            problems = _budget_problems(self.scope.get("endpoint"), self.count, {shape: self.shapes[shape]})
+            if problems:
+                raise QueryBudgetExceeded(_budget_message(self.scope, problems))
+
+    def repeated(self, threshold: int) -> dict:
+        """Shapes executed more than `threshold` times"""
+        return {shape: n for shape, n in self.shapes.items() if n > threshold}
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape"""
+    shape = _STRING.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+def query_budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None):
+    """Declare the statement budget for a route.
+
+    `max_queries` bounds the total statements per request; `max_repeats`
+    overrides the default number of times one statement shape may repeat.
+    Budgets of admin routes include the revocation lookup token
+    verification issues when a token isn't cached.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = (max_queries, max_repeats)
+        return endpoint
+    return decorator
+
+def no_query_budget(endpoint: Callable) -> Callable:
+    """Exempt a route whose statement count scales with its input, like bulk import"""
+    endpoint.__query_budget__ = None
+    return endpoint
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+def _budget_problems(endpoint, count: int, shapes: dict) -> list:
+    """Ways `count` statements with these shape counts overrun the endpoint's budget"""
+    budget = getattr(endpoint, "__query_budget__", (None, None))
+    if budget is None:
+        return []
+    max_queries, max_repeats = budget
+    if max_repeats is None:
+        max_repeats = settings.query_budget_max_repeats
+
+    problems = []
+    if max_queries is not None and count > max_queries:
+        problems.append(f"{count} statements (budget {max_queries})")
+    for shape, n in shapes.items():
+        if n > max_repeats:
+            problems.append(f"possible N+1, {n}x: {shape}")
+    return problems
+
+def _budget_message(scope: dict, problems: list) -> str:
+    return f"Query budget exceeded for {scope['method']} {scope['path']}: " + "; ".join(problems)
+
+def _check_budget(request: Request, tracker: QueryTracker) -> None:
+    problems = _budget_problems(request.scope.get("endpoint"), tracker.count, tracker.shapes)
+    if problems:
+        logger.warning(_budget_message(request.scope, problems))
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """Count statements per request and enforce route budgets.
+
+    In "raise" mode the statement that overruns the budget raises
+    `QueryBudgetExceeded`, so the route fails before it commits and the
+    client gets the app's error response; other modes log once the
+    response is built.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        tracker = QueryTracker(request.scope)
+        token = _current_tracker.set(tracker)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_tracker.reset(token)
+
+        response.headers["X-Query-Count"] = str(tracker.count)
+        if settings.query_budget_mode != "raise":
+            _check_budget(request, tracker)
+        return response
+
+def add_query_budget(app: FastAPI):
+    """Enable per-request query counting and budget checks"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    app.add_middleware(QueryBudgetMiddleware)
@@ -0,0 +1,114 @@
+import math
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.settings import RateLimit, get_settings
+
+settings = get_settings()
+
+# First matching prefix wins
+ROUTE_CLASSES = [
+    ("images", ("/api/v1/images/", "/api/v1/documents/")),
+    ("auth", ("/api/v1/auth/",)),
+    ("admin", ("/api/v1/admin/",)),
+    ("public", ("/api/v1/",)),
+]
+
+def classify(path: str) -> Optional[str]:
+    """Route class for a request path"""
+    for name, prefixes in ROUTE_CLASSES:
+        if path.startswith(prefixes):
+            return name
+    return None
+
+class TokenBucketLimiter:
+    """Token buckets per (client, route class), bounded by LRU eviction.
+
+    Each check is a dict lookup plus constant arithmetic. Buckets for the
+    least recently seen clients are dropped past `max_clients`; an evicted
+    client simply starts again with a full bucket.
+    """
+
+    def __init__(self, limits: Dict[str, RateLimit], max_clients: int):
+        self.limits = limits
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self.allowed: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self.evictions = 0
+
+    def check(self, client: str, route_class: str, now: Optional[float] = None) -> float:
+        """Take a token; return 0 if allowed, else seconds until one is available"""
+        limit = self.limits.get(route_class)
+        if limit is None:
+            return 0.0
+
+        now = time.monotonic() if now is None else now
+        key = (client, route_class)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(limit.burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed[route_class] += 1
+            return 0.0
+
+        self.throttled[route_class] += 1
+        return (1 - bucket[0]) / limit.rate if limit.rate > 0 else 60.0
+
+    def stats(self) -> dict:
+        return {
+            "clients_tracked": len(self._buckets),
+            "evictions": self.evictions,
+            "allowed": dict(self.allowed),
+            "throttled": dict(self.throttled),
+        }
+
+limiter = TokenBucketLimiter(settings.rate_limits, settings.rate_limit_max_clients)
+
+def client_ip(request: Request) -> str:
+    """Address of the client as seen by the outermost trusted proxy.
+
+    Each proxy appends the address it received the request from, so with
+    `rate_limit_trusted_proxies` = n the client is the nth entry from the
+    right; anything further left was sent by the client and can be forged.
+    """
+    trusted = settings.rate_limit_trusted_proxies
+    if trusted > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if forwarded:
+            return forwarded[-min(trusted, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Reject requests over their token bucket with 429"""
+
+    async def dispatch(self, request: Request, call_next):
+        route_class = classify(request.url.path)
+        if route_class is not None:
+            retry_after = limiter.check(client_ip(request), route_class)
+            if retry_after:
+                return JSONResponse(
+                    status_code=429,
+                    content={"detail": "Too many requests"},
+                    headers={"Retry-After": str(max(math.ceil(retry_after), 1))}
+                )
+        return await call_next(request)
+
+def add_rate_limiting(app: FastAPI):
+    """Add per-client rate limiting to the FastAPI app"""
+    app.add_middleware(RateLimitMiddleware)
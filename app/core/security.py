@@ -1,46 +1,181 @@
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
 from app.config.settings import get_settings
+from app.models.user import RevokedToken
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# jose and passlib are imported on first use to keep app import fast
+
+@lru_cache()
+def get_pwd_context():
+    """Get the bcrypt password context"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored one uses outdated settings"""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+@lru_cache()
+def get_dummy_hash() -> str:
+    """Hash verified for unknown usernames so they take as long as real ones"""
+    return get_password_hash("not-a-real-password")
+
+@lru_cache()
+def get_password_executor() -> ThreadPoolExecutor:
+    """Dedicated bounded pool for bcrypt, separate from the request thread pool"""
+    return ThreadPoolExecutor(
+        max_workers=settings.password_hash_workers,
+        thread_name_prefix="password-hash"
+    )
+
+async def run_in_password_executor(func: Callable, *args):
+    """Run a password-hashing call without blocking the event loop or request threads"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_password_executor(), context.run, func, *args)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
+    from jose import jwt
+    
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire})
+    # A unique id keeps logins in the same second from sharing a token, and a revocation
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify a JWT token and return the username"""
+class TokenCache:
+    """Bounded LRU of verified token claims, keyed by token digest.
+    
+    Entries live until the token's `exp`, but are only served for
+    `token_revocation_check_seconds` before the token is checked against
+    the `revoked_tokens` table again, so a logout on another worker takes
+    effect here within that interval. Digests revoked in this process are
+    remembered until their own expiry and rejected without a query.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._claims: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()  # Claims, when last checked
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def get(self, digest: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is None:
+                return None
+            claims, checked_at = entry
+            if claims["exp"] <= now:
+                del self._claims[digest]
+                return None
+            if now - checked_at >= settings.token_revocation_check_seconds:
+                return None
+            self._claims.move_to_end(digest)
+            return claims
+    
+    def put(self, digest: str, claims: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._claims[digest] = (claims, time.time())
+            self._claims.move_to_end(digest)
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+    
+    def revoke(self, digest: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._claims.pop(digest, None)
+            self._revoked[digest] = expires_at
+            # Forget revocations of tokens that have expired anyway
+            for expired in [d for d, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[expired]
+    
+    def is_revoked(self, digest: str) -> bool:
+        return digest in self._revoked
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._revoked.clear()
+
+token_cache = TokenCache(settings.token_cache_size)
+
+def _decode_token(db: Session, token: str) -> Optional[dict]:
+    """Return verified claims, from the cache when possible"""
+    from jose import JWTError, jwt
+    
+    digest = TokenCache.digest(token)
+    if token_cache.is_revoked(digest):
+        return None
+    
+    claims = token_cache.get(digest)
+    if claims is not None:
+        return claims
+    
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
         return None
+    if payload.get("sub") is None or payload.get("exp") is None:
+        return None
+    
+    # Revoked by a logout on any worker
+    if db.scalar(select(RevokedToken.digest).where(RevokedToken.digest == digest)) is not None:
+        token_cache.revoke(digest, payload["exp"])
+        return None
+    
+    token_cache.put(digest, payload)
+    return payload
+
+def verify_token(db: Session, token: str) -> Optional[str]:
+    """Verify a JWT token and return the username"""
+    claims = _decode_token(db, token)
+    if claims is None:
+        return None
+    return claims["sub"]
 
-def authenticate_admin(username: str, password: str) -> bool:
-    """Authenticate admin credentials"""
-    return (
-        username == settings.admin_username and 
-        password == settings.admin_password
-    )
\ No newline at end of file
+def revoke_token(db: Session, token: str) -> bool:
+    """Revoke a valid token until it expires, for every worker"""
+    claims = _decode_token(db, token)
+    if claims is None:
+        return False
+    digest = TokenCache.digest(token)
+    # Rows of tokens that have expired anyway are no longer needed
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+    db.add(RevokedToken(digest=digest, expires_at=datetime.utcfromtimestamp(claims["exp"])))
+    db.commit()
+    token_cache.revoke(digest, claims["exp"])
+    return True
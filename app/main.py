@@ -1,16 +1,54 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config.settings import get_settings
-from app.config.database import engine
-from app.models import Base
+from app.config.database import get_engine, pool_metrics
 from app.api.v1.router import api_router
+from app.api.dependencies import get_current_admin
+from app.core.exceptions import PortfolioException
 from app.core.middleware import add_security_headers
+from app.core.query_budget import add_query_budget
+from app.core.rate_limit import add_rate_limiting, limiter
+from app.services import job_service, change_notifier
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Startup timings in milliseconds, reported by /health
+startup_timings = {"import_ms": None, "lifespan_ms": None}
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the engine when the server starts, not when the module is imported.
+    
+    Tables are not created here; run `python -m app.cli init-db` instead.
+    """
+    started = time.perf_counter()
+    engine = get_engine()
+    job_service.queue.start()
+    startup_timings["lifespan_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(
+        "Startup complete: import %.1fms, lifespan %.1fms",
+        startup_timings["import_ms"], startup_timings["lifespan_ms"]
+    )
+    # Pick up uploads whose processing was interrupted by the last shutdown
+    recovered = await run_in_threadpool(job_service.recover)
+    if recovered:
+        logger.info("Requeued %d unfinished jobs", recovered)
+    await change_notifier.start()
+    yield
+    await change_notifier.stop()
+    job_service.queue.stop()
+    engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -18,9 +56,14 @@ app = FastAPI(
     description="Production-ready portfolio management system",
     version="2.0.0",
     docs_url="/docs" if settings.environment == "development" else None,
-    redoc_url="/redoc" if settings.environment == "development" else None
+    redoc_url="/redoc" if settings.environment == "development" else None,
+    lifespan=lifespan
 )
 
+# Rate limiting (added first so CORS and security headers apply to 429s)
+if settings.rate_limit_enabled:
+    add_rate_limiting(app)
+
 # Security middleware
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +76,15 @@ app.add_middleware(
 # Custom security headers
 add_security_headers(app)
 
+# Per-route query budgets (development and test only)
+if settings.query_budget_mode != "off":
+    add_query_budget(app)
+
+# Service errors carry their own status code
+@app.exception_handler(PortfolioException)
+async def portfolio_exception_handler(request: Request, exc: PortfolioException):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -42,9 +94,25 @@ def health_check():
     return {
         "status": "healthy",
         "version": "2.0.0",
-        "environment": settings.environment
+        "environment": settings.environment,
+        "startup": startup_timings
     }
 
+# Runtime metrics for capacity planning (per worker process); admins only
+@app.get("/metrics", dependencies=[Depends(get_current_admin)])
+async def metrics():
+    from anyio.to_thread import current_default_thread_limiter
+    return {
+        "pid": os.getpid(),
+        "threadpool_size": current_default_thread_limiter().total_tokens,
+        "database_pools": pool_metrics(),
+        "rate_limit": limiter.stats(),
+        "jobs_queued": job_service.queue.pending(),
+        "event_subscribers": change_notifier.broadcaster.subscribers
+    }
+
+startup_timings["import_ms"] = round((time.perf_counter() - _import_started) * 1000, 2)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,19 +1,29 @@
 from app.models.base import Base, BaseModel
-from app.models.user import PersonalInfo, Admin
+from app.models.user import PersonalInfo, Admin, RevokedToken
 from app.models.portfolio import Skill, WorkExperience
-from app.models.project import Project, ProjectImage, ProjectCategory, project_skills
+from app.models.project import Project, ProjectImage, ProjectCategory, ProjectCard, SkillRanking, project_skills
 from app.models.education import Education
+from app.models.job import Job
+from app.models.media import MediaVariant
+from app.models.change import ChangeLog, PortfolioVersion
 
 __all__ = [
     "Base",
     "BaseModel",
     "PersonalInfo",
     "Admin",
+    "RevokedToken",
     "Skill",
     "WorkExperience",
     "Project",
     "ProjectImage", 
     "ProjectCategory",
+    "ProjectCard",
+    "SkillRanking",
     "project_skills",
-    "Education"
+    "Education",
+    "Job",
+    "MediaVariant",
+    "ChangeLog",
+    "PortfolioVersion"
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, DDL, event
+from app.models.base import Base, BaseModel
+
+class ChangeLog(BaseModel):
+    """One row per entity change, stamped with the portfolio version of its transaction"""
+    __tablename__ = "change_log"
+    
+    entity = Column(String(50), nullable=False)  # e.g. "project", "skill"
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(10), nullable=False)  # upsert, delete
+    version = Column(Integer, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ChangeLog(id={self.id}, entity='{self.entity}', entity_id={self.entity_id}, action='{self.action}')>"
+
+class PortfolioVersion(Base):
+    """Single-row counter behind the portfolio version.
+
+    A transaction that logs changes increments it and keeps the row locked
+    until it commits, so versions become visible in the order they were
+    taken; ChangeLog ids, assigned at insert time, don't guarantee that.
+    """
+    __tablename__ = "portfolio_version"
+    
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(Integer, nullable=False)
+
+event.listen(PortfolioVersion.__table__, "after_create", DDL("INSERT INTO portfolio_version (id, version) VALUES (1, 0)"))
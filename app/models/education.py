@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, LargeBinary
+from sqlalchemy import Column, String, Text, Boolean, LargeBinary, Date, Index
 from app.models.base import BaseModel
 
 class Education(BaseModel):
@@ -9,8 +9,10 @@ class Education(BaseModel):
     field_of_study = Column(String(100))
     education_type = Column(String(20), default="degree", nullable=False)
     degree_level = Column(String(50))
-    start_date = Column(String(20), nullable=False)
-    end_date = Column(String(20))
+    start_date = Column(Date, nullable=False)
+    start_date_precision = Column(String(5), default="day", nullable=False)  # day, month or year
+    end_date = Column(Date)
+    end_date_precision = Column(String(5))
     gpa = Column(String(10))
     honors = Column(String(100))
     description = Column(Text)
@@ -25,5 +27,17 @@ class Education(BaseModel):
     certificate_data = Column(LargeBinary)
     certificate_type = Column(String(50))
     
+    __table_args__ = (
+        # get_all_ordered sorts current education (no end date) first. SQLite can't declare
+        # NULLS FIRST on an index but reads a DESC one for it; Postgres' DESC already means it.
+        Index("ix_education_end_date", end_date.desc().nullsfirst()).ddl_if(dialect="postgresql"),
+        Index("ix_education_end_date", end_date.desc()).ddl_if(dialect="sqlite"),
+        Index("ix_education_is_certification_end_date", is_certification, end_date.desc()),  # get_degrees, get_certifications
+        Index(
+            "ix_education_is_current", is_current,
+            postgresql_where=is_current == True, sqlite_where=is_current == True
+        ),  # get_current
+    )
+    
     def __repr__(self):
         return f"<Education(institution='{self.institution}', degree='{self.degree}')>"
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from app.models.base import BaseModel
+
+class Job(BaseModel):
+    __tablename__ = "jobs"
+    
+    kind = Column(String(50), nullable=False)  # e.g. "skill_icon", "certificate"
+    target_id = Column(Integer, nullable=False)
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, running, succeeded, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    last_error = Column(Text)
+    result = Column(Text)  # JSON summary of the processing
+    started_at = Column(DateTime)
+    lease_expires_at = Column(DateTime)  # A running job past this is presumed abandoned by its worker
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<Job(kind='{self.kind}', target_id={self.target_id}, status='{self.status}')>"
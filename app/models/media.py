@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime
+from datetime import datetime
+from app.models.base import Base
+
+class MediaVariant(Base):
+    """Processed copy of an uploaded blob, served instead of the original"""
+    __tablename__ = "media_variants"
+    
+    kind = Column(String(50), primary_key=True)  # Job kind, e.g. "skill_icon"
+    target_id = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    mime_type = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<MediaVariant(kind='{self.kind}', target_id={self.target_id})>"
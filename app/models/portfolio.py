@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Float, Boolean, LargeBinary
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, LargeBinary, Date, Index
 from app.models.base import BaseModel
 
 class Skill(BaseModel):
@@ -21,8 +21,10 @@ class WorkExperience(BaseModel):
     
     company = Column(String(100), nullable=False, index=True)
     position = Column(String(100), nullable=False)
-    start_date = Column(String(20), nullable=False)
-    end_date = Column(String(20))
+    start_date = Column(Date, nullable=False)
+    start_date_precision = Column(String(5), default="day", nullable=False)  # day, month or year
+    end_date = Column(Date)
+    end_date_precision = Column(String(5))
     description = Column(Text, nullable=False)
     achievements = Column(Text)
     location = Column(String(100))
@@ -32,5 +34,13 @@ class WorkExperience(BaseModel):
     company_logo = Column(LargeBinary)
     company_logo_type = Column(String(50))
     
+    __table_args__ = (
+        Index("ix_work_experiences_start_date", start_date.desc()),  # get_all_ordered
+        Index(
+            "ix_work_experiences_is_current", is_current,
+            postgresql_where=is_current == True, sqlite_where=is_current == True
+        ),  # get_current_positions
+    )
+    
     def __repr__(self):
         return f"<WorkExperience(company='{self.company}', position='{self.position}')>"
\ No newline at end of file
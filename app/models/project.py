@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, LargeBinary, Table
+from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, LargeBinary, Table, Date, DateTime, Index, and_, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import Base, BaseModel
 
 # Many-to-many relationship table for projects and skills
 project_skills = Table(
@@ -8,7 +9,9 @@ project_skills = Table(
     BaseModel.metadata,
     Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
     Column('skill_id', Integer, ForeignKey('skills.id'), primary_key=True),
-    Column('relevance_score', Integer, default=5)  # 1-10 scale
+    Column('relevance_score', Integer, default=5),  # 1-10 scale
+    # The primary key leads with project_id; this serves lookups by skill, most relevant first
+    Index('ix_project_skills_skill_id_relevance_score', 'skill_id', 'relevance_score')
 )
 
 class ProjectCategory(BaseModel):
@@ -43,8 +46,10 @@ class Project(BaseModel):
     
     # Project details
     client_name = Column(String(100))
-    start_date = Column(String(20))
-    end_date = Column(String(20))
+    start_date = Column(Date)
+    start_date_precision = Column(String(5))  # day, month or year
+    end_date = Column(Date)
+    end_date_precision = Column(String(5))
     featured = Column(Boolean, default=False, nullable=False)
     
     # Storytelling fields - NEW
@@ -54,6 +59,12 @@ class Project(BaseModel):
     lessons_learned = Column(Text)
     results_achieved = Column(Text)
     
+    __table_args__ = (
+        Index("ix_projects_category_id", category_id),  # get_by_category
+        # Partial where supported: only the few featured rows are indexed
+        Index("ix_projects_featured", featured, postgresql_where=featured == True, sqlite_where=featured == True),
+    )
+    
     # Relationships
     category = relationship("ProjectCategory", back_populates="projects")
     images = relationship("ProjectImage", back_populates="project", cascade="all, delete-orphan")
@@ -69,11 +80,16 @@ class Project(BaseModel):
         """Convert list to comma-separated string"""
         self.technologies = ", ".join(value) if value else ""
     
-    @property
+    @hybrid_property
     def has_case_study(self):
-        """Check if project has storytelling content"""
+        """Check if project has storytelling content; the cards and the case study filters both use this"""
         return bool(self.problem_statement and self.solution_approach)
     
+    @has_case_study.expression
+    def has_case_study(cls):
+        # Empty text doesn't count, as in Python
+        return and_(func.coalesce(cls.problem_statement, "") != "", func.coalesce(cls.solution_approach, "") != "")
+    
     def __repr__(self):
         return f"<Project(title='{self.title}', category='{self.category.name if self.category else None}')>"
 
@@ -88,8 +104,59 @@ class ProjectImage(BaseModel):
     image_data = Column(LargeBinary, nullable=False)
     image_type = Column(String(50), nullable=False)
     
+    __table_args__ = (
+        # Serves loading a project's images as well as get_main_image
+        Index("ix_project_images_project_id_is_main", project_id, is_main),
+    )
+    
     # Relationship
     project = relationship("Project", back_populates="images")
     
     def __repr__(self):
-        return f"<ProjectImage(project_id={self.project_id}, is_main={self.is_main})>"
\ No newline at end of file
+        return f"<ProjectImage(project_id={self.project_id}, is_main={self.is_main})>"
+
+class ProjectCard(Base):
+    """Read model for project list views: one row per project, no joins needed.
+    
+    Maintained by the project, image, category and skill services in the
+    same transaction as the write that changes it.
+    """
+    __tablename__ = "project_cards"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    title = Column(String(100), nullable=False)
+    description = Column(Text, nullable=False)
+    category_id = Column(Integer)
+    category_name = Column(String(50))
+    main_image_id = Column(Integer)
+    skills = Column(Text, nullable=False, default="")  # Comma-separated, most relevant first
+    technologies = Column(Text, nullable=False, default="")  # Comma-separated, as listed
+    featured = Column(Boolean, default=False, nullable=False)
+    has_case_study = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, nullable=False)  # The project's, for ordering
+    
+    __table_args__ = (
+        Index("ix_project_cards_created_at", created_at.desc()),
+        Index("ix_project_cards_category_id_created_at", category_id, created_at.desc()),
+        Index("ix_project_cards_featured", featured, postgresql_where=featured == True, sqlite_where=featured == True),
+        Index("ix_project_cards_has_case_study", has_case_study,
+              postgresql_where=has_case_study == True, sqlite_where=has_case_study == True),
+    )
+    
+    def __repr__(self):
+        return f"<ProjectCard(project_id={self.project_id}, title='{self.title}')>"
+
+class SkillRanking(Base):
+    """Read model for skill-to-project listings: one row per skill.
+    
+    Maintained by the project and skill services whenever associations
+    change, in the same transaction.
+    """
+    __tablename__ = "skill_rankings"
+    
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    project_count = Column(Integer, nullable=False, default=0)
+    top_project_ids = Column(Text, nullable=False, default="")  # Comma-separated, most relevant then newest first
+    
+    def __repr__(self):
+        return f"<SkillRanking(skill_id={self.skill_id}, project_count={self.project_count})>"
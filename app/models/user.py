@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Boolean, LargeBinary
-from app.models.base import BaseModel
+from sqlalchemy import Column, String, Text, Boolean, LargeBinary, DateTime
+from app.models.base import Base, BaseModel
 
 class PersonalInfo(BaseModel):
     __tablename__ = "personal_info"
@@ -29,4 +29,14 @@ class Admin(BaseModel):
     is_active = Column(Boolean, default=True, nullable=False)
     
     def __repr__(self):
-        return f"<Admin(username='{self.username}')>"
\ No newline at end of file
+        return f"<Admin(username='{self.username}')>"
+
+class RevokedToken(Base):
+    """Access token revoked before its expiry; read by every worker"""
+    __tablename__ = "revoked_tokens"
+    
+    digest = Column(String(64), primary_key=True)  # sha256 of the token
+    expires_at = Column(DateTime, nullable=False, index=True)  # Row can go once the token has expired
+    
+    def __repr__(self):
+        return f"<RevokedToken(digest='{self.digest[:12]}')>"
@@ -1,31 +1,41 @@
 from app.schemas.base import BaseSchema, BaseEntitySchema, ResponseSchema, ErrorSchema
-from app.schemas.auth import AdminLogin, Token, TokenData
+from app.schemas.auth import AdminLogin, AdminCreate, Token, TokenData
 from app.schemas.user import PersonalInfo, PersonalInfoCreate, PersonalInfoUpdate
 from app.schemas.education import Education, EducationCreate, EducationUpdate
 from app.schemas.project import (
     Project, ProjectCreate, ProjectUpdate,
     ProjectCategory, ProjectCategoryCreate, ProjectCategoryUpdate,
     ProjectImage, ProjectImageCreate,
+    ProjectCard, RankedProjectCard, SkillProjects, RelatedProjectCard,
     ProjectSkillAssignment
 )
+from app.schemas.job import Job, JobAccepted
+from app.schemas.backup import ImportResult
+from app.schemas.batch import BatchOperation, BatchRequest, BatchOperationResult, BatchResult
 from app.schemas.portfolio import (
-    Skill, SkillCreate, SkillUpdate,
+    Skill, SkillCreate, SkillUpdate, SkillStats, CoOccurringSkill,
     WorkExperience, WorkExperienceCreate, WorkExperienceUpdate,
     PortfolioSummary
 )
+from app.schemas.changes import ChangedEntities, ChangeSet
 
 # Rebuild models to resolve forward references
 PortfolioSummary.model_rebuild()
+ChangedEntities.model_rebuild()
 
 __all__ = [
     "BaseSchema", "BaseEntitySchema", "ResponseSchema", "ErrorSchema",
-    "AdminLogin", "Token", "TokenData",
+    "AdminLogin", "AdminCreate", "Token", "TokenData",
     "PersonalInfo", "PersonalInfoCreate", "PersonalInfoUpdate",
-    "Skill", "SkillCreate", "SkillUpdate",
+    "Skill", "SkillCreate", "SkillUpdate", "SkillStats", "CoOccurringSkill",
     "WorkExperience", "WorkExperienceCreate", "WorkExperienceUpdate",
     "Project", "ProjectCreate", "ProjectUpdate",
     "ProjectCategory", "ProjectCategoryCreate", "ProjectCategoryUpdate",
-    "ProjectImage", "ProjectImageCreate", "ProjectSkillAssignment",
+    "ProjectImage", "ProjectImageCreate", "ProjectCard", "RankedProjectCard", "SkillProjects", "RelatedProjectCard",
+    "ProjectSkillAssignment",
     "Education", "EducationCreate", "EducationUpdate",
+    "Job", "JobAccepted", "ImportResult",
+    "BatchOperation", "BatchRequest", "BatchOperationResult", "BatchResult",
+    "ChangedEntities", "ChangeSet",
     "PortfolioSummary"
 ]
\ No newline at end of file
@@ -4,6 +4,10 @@ class AdminLogin(BaseModel):
     username: str = Field(..., min_length=1, max_length=50)
     password: str = Field(..., min_length=1)
 
+class AdminCreate(BaseModel):
+    username: str = Field(..., min_length=1, max_length=50)
+    password: str = Field(..., min_length=8, max_length=72)
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
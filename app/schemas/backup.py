@@ -0,0 +1,5 @@
+from typing import Dict
+from app.schemas.base import ResponseSchema
+
+class ImportResult(ResponseSchema):
+    imported: Dict[str, int] = {}  # Rows imported per entity
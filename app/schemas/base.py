@@ -1,6 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, ClassVar, Literal, Optional
+from app.utils.dates import parse_partial_date
+
+DatePrecision = Literal["day", "month", "year"]
 
 class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -17,4 +20,31 @@ class ResponseSchema(BaseSchema):
 class ErrorSchema(BaseSchema):
     message: str
     success: bool = False
-    error_code: Optional[str] = None
\ No newline at end of file
+    error_code: Optional[str] = None
+
+class PartialDatesSchema(BaseModel):
+    """Accepts "Mar 2021", "2021-03" or "2021" for start_date/end_date and records the precision.
+    
+    end_date also takes "present" for an ongoing period. Where start_date is
+    NOT NULL in the database, set start_date_required so updates can't null it.
+    """
+    start_date_required: ClassVar[bool] = False
+    
+    @model_validator(mode="before")
+    @classmethod
+    def parse_partial_dates(cls, data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        for name in ("start_date", "end_date"):
+            value = data.get(name)
+            if isinstance(value, str):
+                data[name], precision = parse_partial_date(value, ongoing=name == "end_date")
+                data.setdefault(f"{name}_precision", precision)
+            elif name in data and value is None:
+                data.setdefault(f"{name}_precision", None)
+        if cls.start_date_required:
+            for name in ("start_date", "start_date_precision"):
+                if name in data and data[name] is None:
+                    raise ValueError(f"{name} is required")
+        return data
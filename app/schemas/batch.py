@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from app.schemas.base import ResponseSchema
+
+class BatchOperation(BaseModel):
+    op: str = Field(..., min_length=1)  # e.g. "update_project", "set_main_image"
+    params: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=100)
+
+class BatchOperationResult(BaseModel):
+    op: str
+    id: Optional[int] = None  # Id of the created or changed record, if any
+
+class BatchResult(ResponseSchema):
+    results: List[BatchOperationResult] = []
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from app.schemas.education import Education
+from app.schemas.portfolio import Skill, WorkExperience
+from app.schemas.project import Project, ProjectCategory, ProjectImage
+from app.schemas.user import PersonalInfo
+
+class ChangedEntities(BaseModel):
+    personal_info: List[PersonalInfo] = []
+    skill: List[Skill] = []
+    work_experience: List[WorkExperience] = []
+    education: List[Education] = []
+    project_category: List[ProjectCategory] = []
+    project: List[Project] = []
+    project_image: List[ProjectImage] = []
+
+class ChangeSet(BaseModel):
+    since: int
+    version: int  # Pass as `since` on the next poll
+    reset: bool = False  # `since` is unknown here; refetch everything
+    upserted: ChangedEntities = ChangedEntities()
+    deleted: Dict[str, List[int]] = {}  # Entity name -> ids
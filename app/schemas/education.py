@@ -1,15 +1,20 @@
 from pydantic import BaseModel, Field
+from datetime import date
 from typing import Optional
-from app.schemas.base import BaseEntitySchema
+from app.schemas.base import BaseEntitySchema, DatePrecision, PartialDatesSchema
 
-class EducationBase(BaseModel):
+class EducationBase(PartialDatesSchema):
+    start_date_required = True
+    
     institution: str = Field(..., min_length=1, max_length=100)
     degree: str = Field(..., min_length=1, max_length=100)
     field_of_study: Optional[str] = Field(None, max_length=100)
     education_type: str = Field(default="degree", max_length=20)
     degree_level: Optional[str] = Field(None, max_length=50)
-    start_date: str = Field(..., min_length=1, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: date
+    start_date_precision: DatePrecision = "day"
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     gpa: Optional[str] = Field(None, max_length=10)
     honors: Optional[str] = Field(None, max_length=100)
     description: Optional[str] = None
@@ -19,14 +24,18 @@ class EducationBase(BaseModel):
 class EducationCreate(EducationBase):
     pass
 
-class EducationUpdate(BaseModel):
+class EducationUpdate(PartialDatesSchema):
+    start_date_required = True
+    
     institution: Optional[str] = Field(None, min_length=1, max_length=100)
     degree: Optional[str] = Field(None, min_length=1, max_length=100)
     field_of_study: Optional[str] = Field(None, max_length=100)
     education_type: Optional[str] = Field(None, max_length=20)
     degree_level: Optional[str] = Field(None, max_length=50)
-    start_date: Optional[str] = Field(None, min_length=1, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: Optional[date] = None
+    start_date_precision: Optional[DatePrecision] = None
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     gpa: Optional[str] = Field(None, max_length=10)
     honors: Optional[str] = Field(None, max_length=100)
     description: Optional[str] = None
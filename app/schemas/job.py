@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import field_validator
+from app.schemas.base import BaseEntitySchema, ResponseSchema
+
+class Job(BaseEntitySchema):
+    kind: str
+    target_id: int
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result: Optional[Any] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @field_validator("result", mode="before")
+    @classmethod
+    def parse_result(cls, value):
+        """Results are stored as JSON text"""
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+class JobAccepted(ResponseSchema):
+    job_ids: List[int] = []
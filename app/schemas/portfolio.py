@@ -1,7 +1,8 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field
+from datetime import date
 from typing import Optional, List, TYPE_CHECKING
-from app.schemas.base import BaseEntitySchema
+from app.schemas.base import BaseEntitySchema, DatePrecision, PartialDatesSchema
 
 # Import the models you need for forward references
 if TYPE_CHECKING:
@@ -28,12 +29,29 @@ class SkillUpdate(BaseModel):
 class Skill(SkillBase, BaseEntitySchema):
     has_icon: bool = False
 
+class CoOccurringSkill(BaseModel):
+    skill_id: int
+    name: str
+    project_count: int  # Projects using both skills
+
+class SkillStats(BaseModel):
+    skill_id: int
+    name: str
+    project_count: int
+    featured_project_count: int
+    average_relevance: Optional[float] = None  # None without projects
+    co_occurring: List[CoOccurringSkill] = []
+
 # Work Experience Schemas
-class WorkExperienceBase(BaseModel):
+class WorkExperienceBase(PartialDatesSchema):
+    start_date_required = True
+    
     company: str = Field(..., min_length=1, max_length=100)
     position: str = Field(..., min_length=1, max_length=100)
-    start_date: str = Field(..., min_length=1, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: date
+    start_date_precision: DatePrecision = "day"
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     description: str = Field(..., min_length=1)
     achievements: Optional[str] = None
     location: Optional[str] = Field(None, max_length=100)
@@ -42,11 +60,15 @@ class WorkExperienceBase(BaseModel):
 class WorkExperienceCreate(WorkExperienceBase):
     pass
 
-class WorkExperienceUpdate(BaseModel):
+class WorkExperienceUpdate(PartialDatesSchema):
+    start_date_required = True
+    
     company: Optional[str] = Field(None, min_length=1, max_length=100)
     position: Optional[str] = Field(None, min_length=1, max_length=100)
-    start_date: Optional[str] = Field(None, min_length=1, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: Optional[date] = None
+    start_date_precision: Optional[DatePrecision] = None
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     description: Optional[str] = Field(None, min_length=1)
     achievements: Optional[str] = None
     location: Optional[str] = Field(None, max_length=100)
@@ -61,4 +83,5 @@ class PortfolioSummary(BaseModel):
     skills: List[Skill] = []
     work_experiences: List[WorkExperience] = []
     projects: List[Project] = []
-    education: List[Education] = []
\ No newline at end of file
+    education: List[Education] = []
+    version: int = 0  # Portfolio version, for /changes?since=
\ No newline at end of file
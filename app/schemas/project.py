@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AliasChoices, BaseModel, Field, HttpUrl, field_validator
+from datetime import date, datetime
 from typing import Optional, List
-from app.schemas.base import BaseEntitySchema
+from app.schemas.base import BaseSchema, BaseEntitySchema, DatePrecision, PartialDatesSchema
 
 # Project Category Schemas
 class ProjectCategoryBase(BaseModel):
@@ -29,7 +30,7 @@ class ProjectImage(ProjectImageBase, BaseEntitySchema):
     project_id: int
 
 # Project Schemas
-class ProjectBase(BaseModel):
+class ProjectBase(PartialDatesSchema):
     title: str = Field(..., min_length=1, max_length=100)
     description: str = Field(..., min_length=1)
     detailed_description: Optional[str] = None
@@ -41,8 +42,10 @@ class ProjectBase(BaseModel):
     live_url: Optional[HttpUrl] = None
     github_url: Optional[HttpUrl] = None
     client_name: Optional[str] = Field(None, max_length=100)
-    start_date: Optional[str] = Field(None, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: Optional[date] = None
+    start_date_precision: Optional[DatePrecision] = None
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     featured: bool = False
     
     # Storytelling fields - NEW
@@ -55,7 +58,7 @@ class ProjectBase(BaseModel):
 class ProjectCreate(ProjectBase):
     skill_ids: Optional[List[int]] = []  # Skills to associate with project
 
-class ProjectUpdate(BaseModel):
+class ProjectUpdate(PartialDatesSchema):
     title: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, min_length=1)
     detailed_description: Optional[str] = None
@@ -67,8 +70,10 @@ class ProjectUpdate(BaseModel):
     live_url: Optional[HttpUrl] = None
     github_url: Optional[HttpUrl] = None
     client_name: Optional[str] = Field(None, max_length=100)
-    start_date: Optional[str] = Field(None, max_length=20)
-    end_date: Optional[str] = Field(None, max_length=20)
+    start_date: Optional[date] = None
+    start_date_precision: Optional[DatePrecision] = None
+    end_date: Optional[date] = None
+    end_date_precision: Optional[DatePrecision] = None
     featured: Optional[bool] = None
     
     # Storytelling fields - NEW
@@ -85,6 +90,47 @@ class Project(ProjectBase, BaseEntitySchema):
     images: List[ProjectImage] = []
     skills: List["Skill"] = []
     has_case_study: bool = False
+    
+    @field_validator("technologies", mode="before")
+    @classmethod
+    def split_technologies(cls, value):
+        """Technologies are stored as a comma-separated string"""
+        if isinstance(value, str):
+            return [tech.strip() for tech in value.split(",") if tech.strip()]
+        return value
+
+# Project Card Schema, for list views
+class ProjectCard(BaseSchema):
+    id: int = Field(validation_alias=AliasChoices("project_id", "id"))
+    title: str
+    description: str
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    main_image_id: Optional[int] = None
+    skills: List[str] = []
+    technologies: List[str] = []
+    featured: bool = False
+    has_case_study: bool = False
+    created_at: datetime
+    
+    @field_validator("skills", "technologies", mode="before")
+    @classmethod
+    def split_names(cls, value):
+        """Names are stored as comma-separated strings"""
+        if isinstance(value, str):
+            return [name.strip() for name in value.split(",") if name.strip()]
+        return value
+
+class RankedProjectCard(ProjectCard):
+    relevance_score: Optional[int] = None  # 1-10, for the skill the list is ranked by
+
+class SkillProjects(BaseModel):
+    skill_id: int
+    project_count: int
+    projects: List[RankedProjectCard]
+
+class RelatedProjectCard(ProjectCard):
+    score: float = 0  # Weighted similarity to the project, 0-1
 
 # Skill Assignment Schema
 class ProjectSkillAssignment(BaseModel):
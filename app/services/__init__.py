@@ -1,18 +1,43 @@
 from app.services.base import BaseService
 from app.services.file import FileService
-from app.services.user import personal_info_service
+from app.services.user import personal_info_service, admin_service
 from app.services.portfolio import skill_service, work_experience_service
-from app.services.project import project_service, project_category_service, project_image_service
+from app.services.project import (
+    project_service, project_card_service, skill_ranking_service, project_category_service, project_image_service
+)
 from app.services.education import education_service
+from app.services.job import job_service
+from app.services.backup import backup_service
+from app.services.batch import batch_service
+from app.services.bundle import bundle_service
+from app.services.blob_cache import blob_cache_service
+from app.services.project_detail import project_detail_service
+from app.services.related import related_project_service
+from app.services.skill_stats import skill_stats_service
+from app.services.changes import change_log_service
+from app.services.events import change_notifier
 
 __all__ = [
     "BaseService",
     "FileService",
     "personal_info_service",
+    "admin_service",
     "skill_service",
     "work_experience_service", 
     "project_service",
+    "project_card_service",
+    "skill_ranking_service",
     "project_category_service",
     "project_image_service",
-    "education_service"
+    "education_service",
+    "job_service",
+    "backup_service",
+    "batch_service",
+    "bundle_service",
+    "blob_cache_service",
+    "project_detail_service",
+    "related_project_service",
+    "skill_stats_service",
+    "change_log_service",
+    "change_notifier"
 ]
\ No newline at end of file
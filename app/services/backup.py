@@ -0,0 +1,296 @@
+"""Full-portfolio export and bulk import.
+
+The export is two streams: NDJSON with one line per row, in dependency
+order, and a tar archive holding the blobs. NDJSON lines reference tar
+members by name. Import reads both back, validates each row through its
+`*Create` schema and inserts in batches of `import_batch_size` rows,
+remapping ids as it goes. Batches bound memory, not the transaction: the
+whole import commits at once or not at all.
+"""
+import io
+import json
+import tarfile
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Type
+from pydantic import BaseModel, ValidationError as SchemaValidationError
+from pydantic_core import Url
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.config.settings import get_settings
+from app.core.exceptions import ValidationError
+from app.models.base import BaseModel as DBBaseModel
+from app.models.education import Education
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import Project, ProjectCategory, ProjectImage, project_skills
+from app.models.user import PersonalInfo
+from app.schemas.education import EducationCreate
+from app.schemas.portfolio import SkillCreate, WorkExperienceCreate
+from app.schemas.project import ProjectCategoryCreate, ProjectCreate, ProjectImageCreate
+from app.schemas.user import PersonalInfoCreate
+from app.services.base import commit, single_transaction
+from app.services.changes import change_log_service
+from app.services.project import project_card_service, skill_ranking_service
+
+settings = get_settings()
+
+# Flush a batch early once its blobs add up to this many bytes
+MAX_BATCH_BLOB_BYTES = 32 * 1024 * 1024
+
+@dataclass
+class Entity:
+    name: str
+    model: Type[DBBaseModel]
+    schema: Type[BaseModel]
+    refs: Dict[str, str] = field(default_factory=dict)  # Foreign key column -> entity name
+    blobs: Dict[str, str] = field(default_factory=dict)  # Blob column -> MIME type column
+
+    @property
+    def fields(self) -> List[str]:
+        """Schema fields stored as columns; references are carried separately"""
+        columns = self.model.__table__.columns.keys()
+        return [name for name in self.schema.model_fields if name in columns and name not in self.refs]
+
+# Dependency order: an entity only references entities listed before it
+ENTITIES = [
+    Entity("personal_info", PersonalInfo, PersonalInfoCreate, blobs={"profile_image": "profile_image_type"}),
+    Entity("project_category", ProjectCategory, ProjectCategoryCreate),
+    Entity("skill", Skill, SkillCreate, blobs={"icon_data": "icon_type"}),
+    Entity("work_experience", WorkExperience, WorkExperienceCreate, blobs={"company_logo": "company_logo_type"}),
+    Entity("education", Education, EducationCreate, blobs={
+        "institution_logo": "institution_logo_type",
+        "certificate_data": "certificate_type",
+    }),
+    Entity("project", Project, ProjectCreate, refs={"category_id": "project_category"}),
+    Entity("project_image", ProjectImage, ProjectImageCreate, refs={"project_id": "project"},
+           blobs={"image_data": "image_type"}),
+]
+ENTITIES_BY_NAME = {entity.name: entity for entity in ENTITIES}
+
+def _member_name(entity: Entity, id: int, column: str) -> str:
+    return f"{entity.name}/{id}/{column}"
+
+class _ChunkBuffer:
+    """Write target for a streaming tarfile that hands back what was written"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class BackupService:
+    def iter_ndjson(self, db: Session, yield_per: int = 500) -> Iterator[bytes]:
+        """Every row as one NDJSON line, without loading blobs"""
+        for entity in ENTITIES:
+            table = entity.model.__table__
+            columns = [table.c.id] + [table.c[name] for name in entity.fields + list(entity.refs)]
+            columns += [table.c[type_column] for type_column in entity.blobs.values()]
+            columns += [table.c[blob].isnot(None).label(blob) for blob in entity.blobs]
+
+            rows = db.execute(select(*columns).order_by(table.c.id).execution_options(yield_per=yield_per))
+            for row in rows.mappings():
+                data = {name: row[name] for name in entity.fields}
+                if entity.model is Project:
+                    data["technologies"] = [tech.strip() for tech in row["technologies"].split(",") if tech.strip()]
+                line = {
+                    "entity": entity.name,
+                    "id": row["id"],
+                    "data": data,
+                    "refs": {column: row[column] for column in entity.refs},
+                    "blobs": {
+                        blob: {"member": _member_name(entity, row["id"], blob), "type": row[type_column]}
+                        for blob, type_column in entity.blobs.items() if row[blob]
+                    },
+                }
+                yield (json.dumps(line, default=str) + "\n").encode()
+
+        links = db.execute(select(project_skills).execution_options(yield_per=yield_per))
+        for link in links.mappings():
+            line = {
+                "entity": "project_skill",
+                "data": {"relevance_score": link["relevance_score"]},
+                "refs": {"project_id": link["project_id"], "skill_id": link["skill_id"]},
+            }
+            yield (json.dumps(line) + "\n").encode()
+
+    def iter_tar(self, db: Session, yield_per: int = 20) -> Iterator[bytes]:
+        """All blobs as a tar stream, one blob in memory at a time"""
+        buffer = _ChunkBuffer()
+        archive = tarfile.open(fileobj=buffer, mode="w|")
+        for entity in ENTITIES:
+            for blob in entity.blobs:
+                data_column = getattr(entity.model, blob)
+                rows = db.query(entity.model.id, data_column).filter(
+                    data_column.isnot(None)
+                ).order_by(entity.model.id).yield_per(yield_per)
+                for id, data in rows:
+                    info = tarfile.TarInfo(_member_name(entity, id, blob))
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+                    yield buffer.take()
+        archive.close()
+        yield buffer.take()
+
+    def import_portfolio(self, db: Session, ndjson: BinaryIO, archive: Optional[BinaryIO] = None) -> Dict[str, int]:
+        """Import an export into this database and return row counts per entity.
+
+        A failure rolls the whole import back; the error names the offending line.
+        """
+        with single_transaction(db):
+            return _Importer(db, archive).run(ndjson)
+
+class _Importer:
+    def __init__(self, db: Session, archive: Optional[BinaryIO]):
+        self.db = db
+        # Reading the index only touches member headers, not their contents
+        self.archive = tarfile.open(fileobj=archive, mode="r:") if archive else None
+        self.members = {member.name: member for member in self.archive} if self.archive else {}
+        self.id_maps: Dict[str, Dict[int, int]] = {name: {} for name in ENTITIES_BY_NAME}
+        self.links: Set[Tuple[int, int]] = set()  # (project id, skill id) pairs imported so far
+        self.counts: Dict[str, int] = {}
+        self.batch_entity: Optional[str] = None
+        self.batch: List[tuple] = []
+        self.batch_bytes = 0
+
+    def run(self, ndjson: BinaryIO) -> Dict[str, int]:
+        for line_number, raw in enumerate(ndjson, start=1):
+            if not raw.strip():
+                continue
+            try:
+                line = json.loads(raw)
+                self._add(line)
+            except ValidationError as e:
+                raise ValidationError(f"Line {line_number}: {e.message}")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValidationError(f"Line {line_number}: {e}")
+        self._flush()
+        return self.counts
+
+    def _add(self, line: dict) -> None:
+        name = line["entity"]
+        if name != self.batch_entity:
+            self._flush()
+            self.batch_entity = name
+
+        if name == "project_skill":
+            row = dict(self._resolve(line.get("refs", {}), {"project_id": "project", "skill_id": "skill"}))
+            link = (row["project_id"], row["skill_id"])
+            if None in link:
+                raise ValidationError("A project skill needs both a project_id and a skill_id")
+            if link in self.links:
+                raise ValidationError(
+                    f"Skill {line['refs']['skill_id']} is linked to project {line['refs']['project_id']} twice"
+                )
+            self.links.add(link)
+            row["relevance_score"] = line.get("data", {}).get("relevance_score", 5)
+            self.batch.append((None, row))
+        else:
+            entity = ENTITIES_BY_NAME.get(name)
+            if entity is None:
+                raise ValidationError(f"Unknown entity '{name}'")
+            row = self._validate(entity, line)
+            self.batch.append((line["id"], row))
+
+        if len(self.batch) >= settings.import_batch_size or self.batch_bytes >= MAX_BATCH_BLOB_BYTES:
+            self._flush()
+
+    def _validate(self, entity: Entity, line: dict) -> dict:
+        try:
+            obj = entity.schema.model_validate(line["data"])
+        except SchemaValidationError as e:
+            raise ValidationError(f"Invalid {entity.name}: {e.errors()[0]['msg']}")
+
+        row = obj.model_dump(include=set(entity.fields))
+        row.update({name: str(value) for name, value in row.items() if isinstance(value, Url)})
+        if entity.model is Project:
+            row["technologies"] = ", ".join(row["technologies"])
+        row.update(self._resolve(line.get("refs", {}), entity.refs))
+
+        for blob, ref in line.get("blobs", {}).items():
+            if blob not in entity.blobs:
+                raise ValidationError(f"Unknown blob '{blob}' for {entity.name}")
+            member = self.members.get(ref["member"])
+            if member is None:
+                raise ValidationError(f"Blob '{ref['member']}' is missing from the archive")
+            row[blob] = self.archive.extractfile(member).read()
+            row[entity.blobs[blob]] = ref["type"]
+            self.batch_bytes += member.size
+        return row
+
+    def _resolve(self, refs: dict, targets: Dict[str, str]) -> dict:
+        """Translate exported ids to the ids they were imported as"""
+        resolved = {}
+        for column, target in targets.items():
+            old_id = refs.get(column)
+            if old_id is None:
+                resolved[column] = None
+                continue
+            new_id = self.id_maps[target].get(old_id)
+            if new_id is None:
+                raise ValidationError(f"{column} {old_id} refers to a {target} that was not imported")
+            resolved[column] = new_id
+        return resolved
+
+    def _flush(self) -> None:
+        if not self.batch:
+            return
+        name, batch = self.batch_entity, self.batch
+        self.batch, self.batch_bytes = [], 0
+        self.counts[name] = self.counts.get(name, 0) + len(batch)
+
+        if name == "project_skill":
+            self.db.execute(insert(project_skills), [row for _, row in batch])
+            change_log_service.record_links(self.db, (row["project_id"] for _, row in batch))
+            project_card_service.refresh(self.db, (row["project_id"] for _, row in batch))
+            skill_ranking_service.refresh(self.db, (row["skill_id"] for _, row in batch))
+        elif name == "personal_info":
+            self._import_personal_info(batch[-1][1])
+        else:
+            entity = ENTITIES_BY_NAME[name]
+            if name == "project_category":
+                batch = self._reuse_categories(batch)
+            if batch:
+                statement = insert(entity.model).returning(entity.model.id, sort_by_parameter_order=True)
+                new_ids = self.db.scalars(statement, [row for _, row in batch]).all()
+                self.id_maps[name].update(zip((old_id for old_id, _ in batch), new_ids))
+                # Bulk inserts bypass the flush, so log them here
+                change_log_service.record(self.db, name, new_ids)
+                if name == "project":
+                    project_card_service.refresh(self.db, new_ids)
+                if name == "project_image":
+                    change_log_service.record(self.db, "project", (row["project_id"] for _, row in batch))
+                    project_card_service.refresh(self.db, (row["project_id"] for _, row in batch))
+
+        commit(self.db)
+
+    def _import_personal_info(self, row: dict) -> None:
+        # There is only ever one personal info record; overwrite it
+        personal_info = self.db.query(PersonalInfo).first()
+        if personal_info is None:
+            self.db.add(PersonalInfo(**row))
+            return
+        for key, value in row.items():
+            setattr(personal_info, key, value)
+
+    def _reuse_categories(self, batch: List[tuple]) -> List[tuple]:
+        """Map categories onto existing ones with the same (unique) name"""
+        names = [row["name"] for _, row in batch]
+        existing = dict(self.db.query(ProjectCategory.name, ProjectCategory.id).filter(
+            ProjectCategory.name.in_(names)
+        ))
+        remaining = []
+        for old_id, row in batch:
+            if row["name"] in existing:
+                self.id_maps["project_category"][old_id] = existing[row["name"]]
+            else:
+                remaining.append((old_id, row))
+        return remaining
+
+# Create singleton instance
+backup_service = BackupService()
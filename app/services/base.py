@@ -1,4 +1,5 @@
-from typing import Type, TypeVar, Generic, List, Optional
+from contextlib import contextmanager
+from typing import Type, TypeVar, Generic, List, Optional, Sequence
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.models.base import BaseModel as DBBaseModel
@@ -8,17 +9,37 @@ ModelType = TypeVar("ModelType", bound=DBBaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def commit(db: Session) -> None:
+    """End a service call's unit of work: commit it, or only flush it inside `single_transaction`"""
+    if db.info.get("single_transaction"):
+        db.flush()
+    else:
+        db.commit()
+
+@contextmanager
+def single_transaction(db: Session):
+    """Run several service calls as one transaction, committed at the end unless one raises"""
+    db.info["single_transaction"] = True
+    try:
+        yield
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        del db.info["single_transaction"]
+    db.commit()
+
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, options: Sequence = ()) -> List[ModelType]:
         """Get all records with pagination"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return db.query(self.model).options(*options).offset(skip).limit(limit).all()
     
-    def get_by_id(self, db: Session, id: int) -> Optional[ModelType]:
+    def get_by_id(self, db: Session, id: int, options: Sequence = ()) -> Optional[ModelType]:
         """Get a record by ID"""
-        return db.query(self.model).filter(self.model.id == id).first()
+        return db.query(self.model).options(*options).filter(self.model.id == id).first()
     
     def get_by_id_or_404(self, db: Session, id: int) -> ModelType:
         """Get a record by ID or raise 404"""
@@ -32,7 +53,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_data = obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
-        db.commit()
+        commit(db)
         db.refresh(db_obj)
         return db_obj
     
@@ -41,7 +62,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_data = obj_in.model_dump(exclude_unset=True)
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
-        db.commit()
+        commit(db)
         db.refresh(db_obj)
         return db_obj
     
@@ -53,7 +74,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def delete(self, db: Session, db_obj: ModelType) -> None:
         """Delete a record"""
         db.delete(db_obj)
-        db.commit()
+        commit(db)
     
     def delete_by_id(self, db: Session, id: int) -> None:
         """Delete a record by ID"""
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel, create_model, ValidationError as SchemaValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.exceptions import PortfolioException, ValidationError
+from app.schemas.batch import BatchOperation, BatchOperationResult
+from app.schemas.education import EducationCreate, EducationUpdate
+from app.schemas.portfolio import SkillCreate, SkillUpdate, WorkExperienceCreate, WorkExperienceUpdate
+from app.schemas.project import (
+    ProjectCreate, ProjectUpdate, ProjectCategoryCreate, ProjectCategoryUpdate, ProjectSkillAssignment
+)
+from app.schemas.user import PersonalInfoUpdate
+from app.services.base import BaseService, single_transaction
+from app.services.education import education_service
+from app.services.portfolio import skill_service, work_experience_service
+from app.services.project import project_service, project_category_service, project_image_service
+from app.services.user import personal_info_service
+
+@dataclass
+class Operation:
+    params: Type[BaseModel]
+    handler: Callable[[Session, Any], Optional[int]]  # Returns the affected record id
+
+def _crud_operations(name: str, service: BaseService, create_schema: Type[BaseModel],
+                     update_schema: Type[BaseModel]) -> Dict[str, Operation]:
+    """create_/update_/delete_ operations for a plain service"""
+    return {
+        f"create_{name}": Operation(
+            create_model(f"Create{name.title()}Params", data=(create_schema, ...)),
+            lambda db, p: service.create(db, p.data).id
+        ),
+        f"update_{name}": Operation(
+            create_model(f"Update{name.title()}Params", id=(int, ...), data=(update_schema, ...)),
+            lambda db, p: service.update_by_id(db, p.id, p.data).id
+        ),
+        f"delete_{name}": Operation(
+            create_model(f"Delete{name.title()}Params", id=(int, ...)),
+            lambda db, p: service.delete_by_id(db, p.id)
+        ),
+    }
+
+_IdParams = create_model("IdParams", id=(int, ...))
+
+OPERATIONS: Dict[str, Operation] = {
+    **_crud_operations("project", project_service, ProjectCreate, ProjectUpdate),
+    **_crud_operations("category", project_category_service, ProjectCategoryCreate, ProjectCategoryUpdate),
+    **_crud_operations("skill", skill_service, SkillCreate, SkillUpdate),
+    **_crud_operations("work_experience", work_experience_service, WorkExperienceCreate, WorkExperienceUpdate),
+    **_crud_operations("education", education_service, EducationCreate, EducationUpdate),
+    "update_personal_info": Operation(
+        create_model("UpdatePersonalInfoParams", data=(PersonalInfoUpdate, ...)),
+        lambda db, p: personal_info_service.create_or_update(db, p.data).id
+    ),
+    "update_project_skills": Operation(
+        create_model("UpdateProjectSkillsParams", id=(int, ...), skill_ids=(List[int], ...)),
+        lambda db, p: project_service.update_skills(db, p.id, p.skill_ids) or p.id
+    ),
+    "assign_project_skill": Operation(
+        create_model("AssignProjectSkillParams", id=(int, ...), assignment=(ProjectSkillAssignment, ...)),
+        lambda db, p: project_service.assign_skill(db, p.id, p.assignment).id
+    ),
+    "set_featured_projects": Operation(
+        create_model("SetFeaturedProjectsParams", project_ids=(List[int], ...)),
+        lambda db, p: project_service.set_featured(db, p.project_ids)
+    ),
+    "update_image_caption": Operation(
+        create_model("UpdateImageCaptionParams", id=(int, ...), caption=(str, ...)),
+        lambda db, p: project_image_service.update_caption(db, p.id, p.caption).id
+    ),
+    "set_main_image": Operation(_IdParams, lambda db, p: project_image_service.set_main_image(db, p.id).id),
+    "delete_project_image": Operation(_IdParams, lambda db, p: project_image_service.delete_by_id(db, p.id)),
+}
+
+class BatchService:
+    def run(self, db: Session, operations: List[BatchOperation]) -> List[BatchOperationResult]:
+        """Run operations in order in one transaction; any failure rolls back all of them"""
+        # Validate everything before touching the database
+        parsed = []
+        for index, operation in enumerate(operations):
+            spec = OPERATIONS.get(operation.op)
+            if spec is None:
+                raise ValidationError(f"Operation {index}: unknown op '{operation.op}'")
+            try:
+                parsed.append((operation.op, spec, spec.params.model_validate(operation.params)))
+            except SchemaValidationError as e:
+                error = e.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                raise ValidationError(f"Operation {index} ({operation.op}): {location}: {error['msg']}")
+
+        results = []
+        with single_transaction(db):
+            for index, (op, spec, params) in enumerate(parsed):
+                try:
+                    record_id = spec.handler(db, params)
+                except PortfolioException as e:
+                    raise PortfolioException(f"Operation {index} ({op}): {e.message}", e.status_code)
+                except IntegrityError:
+                    raise PortfolioException(f"Operation {index} ({op}): conflicts with existing data", 409)
+                results.append(BatchOperationResult(op=op, id=record_id))
+        return results
+
+# Create singleton instance
+batch_service = BatchService()
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.config.settings import get_settings
+from app.core.cache import CacheEntry
+from app.models.education import Education
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import ProjectImage
+from app.models.user import PersonalInfo
+from app.services.cache import Changes, VersionedCache
+from app.services.changes import change_log_service
+from app.services.media import query_served
+
+settings = get_settings()
+
+# Blob kind -> (change log entity, model, blob column, MIME type column)
+BLOBS: Dict[str, Tuple[str, type, str, str]] = {
+    "profile_image": ("personal_info", PersonalInfo, "profile_image", "profile_image_type"),
+    "skill_icon": ("skill", Skill, "icon_data", "icon_type"),
+    "company_logo": ("work_experience", WorkExperience, "company_logo", "company_logo_type"),
+    "institution_logo": ("education", Education, "institution_logo", "institution_logo_type"),
+    "certificate": ("education", Education, "certificate_data", "certificate_type"),
+    "project_image": ("project_image", ProjectImage, "image_data", "image_type"),
+}
+# Kinds served without an id; there is one portfolio owner
+_SINGLETONS = {"profile_image"}
+
+@dataclass
+class BlobFile:
+    path: str
+    digest: str  # sha256 of the content, also its file name
+    media_type: str
+
+    @property
+    def relative_path(self) -> str:
+        return f"{self.digest[:2]}/{self.digest}"
+
+def _key(kind: str, target_id: Optional[int]) -> str:
+    return kind if kind in _SINGLETONS else f"{kind}:{target_id}"
+
+def _affected_blobs(changes: Changes) -> Set[str]:
+    return {
+        _key(kind, id)
+        for entity, id in changes
+        for kind, (blob_entity, *_) in BLOBS.items() if blob_entity == entity
+    }
+
+class BlobCacheService:
+    """Images and certificates materialized as files named by content hash.
+
+    A versioned index maps each record to its blob's digest and MIME type,
+    so a hit costs the portfolio version check and no blob transfer; the
+    file is then streamed from disk, or handed to the proxy when
+    `blob_cache_accel_prefix` is set. Files are written on first access, or
+    when an upload is processed if `blob_cache_eager` is set. Past
+    `blob_cache_max_bytes` the least recently served files are removed,
+    except those served in the last `blob_cache_pin_seconds`: a file is
+    touched when it's looked up, which pins it, across workers, until its
+    response has been sent.
+    """
+
+    def __init__(self):
+        self.index = VersionedCache("blob", _affected_blobs)
+        self._size: Optional[int] = None  # Bytes on disk; scanned on first write
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.blob_cache_dir)
+
+    def get(self, db: Session, kind: str, target_id: Optional[int] = None) -> Optional[BlobFile]:
+        """File holding a record's blob, or None if the record or blob doesn't exist"""
+        _, model, data_attr, type_attr = BLOBS[kind]
+
+        def build() -> Optional[bytes]:
+            query = query_served(db, kind, model, data_attr, type_attr)
+            if kind not in _SINGLETONS:
+                query = query.filter(model.id == target_id)
+            row = query.first()
+            if row is None or not row[0]:
+                return None
+            return f"{self.write(row[0])} {row[1]}".encode()
+
+        value = self.index.get(db, _key(kind, target_id), build)
+        if value is None:
+            return None
+        digest, media_type = value.decode().split(" ", 1)
+        blob = BlobFile(self._path(digest), digest, media_type)
+        try:
+            os.utime(blob.path)  # mtime orders eviction and pins the file while it's served
+        except FileNotFoundError:
+            # Evicted since it was indexed; the index itself is still current, so rewrite it from the database
+            value = build()
+            if value is None:
+                return None
+            digest, media_type = value.decode().split(" ", 1)
+            blob = BlobFile(self._path(digest), digest, media_type)
+        return blob
+
+    def stage(self, db: Session, kind: str, target_id: int, data: bytes, media_type: str) -> None:
+        """Write a blob now and index it once the session commits"""
+        db.flush()
+        # The version includes this transaction's own change log rows
+        entry = CacheEntry(change_log_service.get_version(db), f"{self.write(data)} {media_type}".encode())
+        db.info.setdefault("staged_blobs", []).append((_key(kind, target_id), entry))
+
+    def write(self, data: bytes) -> str:
+        """Store a blob under its digest if it isn't there already; returns the digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the shards and rename, so other workers never see a partial file
+        temp_path = os.path.join(settings.blob_cache_dir, f".{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[0]
+            else:
+                self._size += len(data)
+            if self._size > settings.blob_cache_max_bytes:
+                self._evict()
+        return digest
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(settings.blob_cache_dir, digest[:2], digest)
+
+    def _scan(self) -> Tuple[int, list]:
+        """Total size and (mtime, size, path) of every cached file, across all workers"""
+        files = []
+        for shard in os.scandir(settings.blob_cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sum(size for _, size, _ in files), files
+
+    def _evict(self) -> None:
+        # Down to 90% so eviction doesn't run on every write near the limit
+        total, files = self._scan()
+        target = settings.blob_cache_max_bytes * 0.9
+        pinned_since = time.time() - settings.blob_cache_pin_seconds
+        for mtime, size, path in sorted(files):
+            if total <= target or mtime >= pinned_since:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+# Create singleton instance
+blob_cache_service = BlobCacheService()
+
+change_log_service.on_commit(blob_cache_service.index.invalidate)
+
+# Index staged blobs only once their transaction commits
+@event.listens_for(SessionLocal, "after_commit")
+def _index_committed(session: Session) -> None:
+    for key, entry in session.info.pop("staged_blobs", []):
+        blob_cache_service.index.put(key, entry)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("staged_blobs", None)
@@ -0,0 +1,91 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, Set
+from sqlalchemy.orm import Session
+from app.models.education import Education
+from app.models.portfolio import Skill, WorkExperience
+from app.services.cache import Changes, VersionedCache
+from app.services.changes import change_log_service
+from app.services.media import query_served
+from app.utils.constants import MIME_TYPE_EXTENSIONS
+
+# Bundle kind -> (media kind, model, blob column, MIME type column)
+BUNDLES = {
+    "skills": ("skill_icon", Skill, "icon_data", "icon_type"),
+    "companies": ("company_logo", WorkExperience, "company_logo", "company_logo_type"),
+    "institutions": ("institution_logo", Education, "institution_logo", "institution_logo_type"),
+}
+# Change log entity behind each kind
+_KINDS_BY_ENTITY = {"skill": "skills", "work_experience": "companies", "education": "institutions"}
+
+@dataclass
+class ImageBundle:
+    body: bytes
+    etag: str
+    media_type: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "ImageBundle":
+        """Recover the headers from the boundary on the body's first line"""
+        boundary = body.split(b"\r\n", 1)[0][2:].rstrip(b"-").decode()
+        return cls(
+            body=body,
+            etag=f'"{boundary[len("bundle-"):]}"',
+            media_type=f"multipart/form-data; boundary={boundary}"
+        )
+
+def _encode_multipart(parts) -> bytes:
+    """multipart/form-data with one part per image, named by record id.
+
+    Browsers decode it with `await response.formData()`. The boundary is
+    a digest of the parts, so it doubles as the ETag.
+    """
+    chunks = []
+    digest = hashlib.sha256()
+    for id, data, mime_type in parts:
+        digest.update(f"{id}:{mime_type}:".encode())
+        digest.update(data)
+    boundary = f"bundle-{digest.hexdigest()[:32]}"
+
+    for id, data, mime_type in parts:
+        extension = MIME_TYPE_EXTENSIONS.get(mime_type, "")
+        chunks.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{id}"; filename="{id}{extension}"\r\n'
+            f"Content-Type: {mime_type}\r\n\r\n".encode()
+        )
+        chunks.append(data)
+        chunks.append(b"\r\n")
+    chunks.append(f"--{boundary}--\r\n".encode())
+    return b"".join(chunks)
+
+def _affected_kinds(changes: Changes) -> Set[str]:
+    return {_KINDS_BY_ENTITY[entity] for entity, _ in changes if entity in _KINDS_BY_ENTITY}
+
+class ImageBundleService:
+    """All images of one kind in a single cached response.
+
+    Bundles are built with one query and kept until the change log shows a
+    change to a record of that kind.
+    """
+
+    def __init__(self):
+        self.cache = VersionedCache("bundle", _affected_kinds)
+
+    def get(self, db: Session, kind: str) -> Optional[ImageBundle]:
+        """Bundle for `kind`, or None if the kind is unknown"""
+        if kind not in BUNDLES:
+            return None
+
+        def build() -> bytes:
+            media_kind, model, data_attr, type_attr = BUNDLES[kind]
+            rows = query_served(db, media_kind, model, data_attr, type_attr, model.id).filter(
+                getattr(model, data_attr).isnot(None)
+            ).order_by(model.id).all()
+            return _encode_multipart(rows)
+        return ImageBundle.from_body(self.cache.get(db, kind, build))
+
+# Create singleton instance
+bundle_service = ImageBundleService()
+
+change_log_service.on_commit(bundle_service.cache.invalidate)
@@ -0,0 +1,67 @@
+from typing import Callable, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.core.cache import CacheBackend, CacheEntry, get_cache_backend
+from app.services.changes import change_log_service
+
+Changes = Set[Tuple[str, int]]
+
+class VersionedCache:
+    """Cached bytes of one kind, checked against the portfolio version on every read.
+
+    An entry stamped with the current version is served after a single
+    read of the version counter. One stamped earlier is checked against the change
+    log since its version: if `affected` names none of those changes as
+    touching its key, it is restamped and served, otherwise rebuilt. This
+    holds across workers sharing a backend, with no TTL.
+
+    `affected(changes)` returns the keys the changes touch, or None for all.
+    """
+
+    def __init__(self, namespace: str, affected: Callable[[Changes], Optional[Set[str]]],
+                 backend: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self.affected = affected
+        self._backend = backend
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Resolved on first use so settings are read after the app is configured
+        return self._backend or get_cache_backend()
+
+    def get(self, db: Session, key: str, build: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Cached value for `key`, calling `build` when missing or stale; None is never cached"""
+        # Read the version before building, so a stamp is never newer than what was read
+        version = change_log_service.get_version(db)
+        entry = self.backend.get(self._key(key))
+        if entry is not None:
+            if entry.version == version:
+                return entry.value
+            if entry.version < version:
+                changes = change_log_service.changed_since(db, entry.version, version)
+                if changes is not None and not self._touches(changes, key):
+                    self.backend.set(self._key(key), CacheEntry(version, entry.value))
+                    return entry.value
+
+        value = build()
+        if value is not None:
+            self.backend.set(self._key(key), CacheEntry(version, value))
+        return value
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store a value built elsewhere, stamped with the version it reflects"""
+        self.backend.set(self._key(key), entry)
+
+    def invalidate(self, changes: Changes) -> None:
+        """Drop entries a committed transaction touched, sparing the next read a revalidation"""
+        keys = self.affected(changes)
+        if keys is None:
+            self.backend.clear(self._key(""))
+        elif keys:
+            self.backend.delete(*map(self._key, keys))
+
+    def _touches(self, changes: Changes, key: str) -> bool:
+        keys = self.affected(changes)
+        return keys is None or key in keys
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
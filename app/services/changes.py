@@ -0,0 +1,210 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.config.database import SessionLocal
+from app.models.change import ChangeLog, PortfolioVersion
+from app.models.education import Education
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import Project, ProjectCategory, ProjectImage, project_skills
+from app.models.user import PersonalInfo
+from app.schemas.changes import ChangedEntities, ChangeSet
+from app.services.base import BaseService
+
+# Models whose changes are logged, by entity name
+TRACKED_MODELS = {
+    "personal_info": PersonalInfo,
+    "skill": Skill,
+    "work_experience": WorkExperience,
+    "education": Education,
+    "project_category": ProjectCategory,
+    "project": Project,
+    "project_image": ProjectImage,
+}
+_ENTITIES_BY_MODEL = {model: entity for entity, model in TRACKED_MODELS.items()}
+
+# Logged beside a project's upsert when what skill stats count of it changes:
+# its skill links, or whether it's featured. For caches; /changes and the
+# event stream leave it out.
+SKILL_LINKS = "project_skills"
+_SKILL_LINK_ATTRS = ("skills", "featured")
+
+# Relationships loaded with upserted entities, matching the public views
+_LOAD_OPTIONS = {
+    "project": (joinedload(Project.category), joinedload(Project.images), selectinload(Project.skills)),
+}
+
+class ChangeLogService(BaseService[ChangeLog, ChangeLog, ChangeLog]):
+    def __init__(self):
+        super().__init__(ChangeLog)
+        self._commit_callbacks: List[Callable[[Set[Tuple[str, int]]], None]] = []
+    
+    def on_commit(self, callback: Callable[[Set[Tuple[str, int]]], None]) -> None:
+        """Call `callback` with the (entity, id) pairs each committed transaction logged"""
+        self._commit_callbacks.append(callback)
+
+    def get_version(self, db: Session) -> int:
+        """Current portfolio version; 0 before the first change"""
+        return db.query(PortfolioVersion.version).scalar() or 0
+
+    def record(self, db: Session, entity: str, ids: Iterable[int], action: str = "upsert") -> None:
+        """Log changes the unit of work can't see, such as bulk statements"""
+        _log(db, [{"entity": entity, "entity_id": id, "action": action} for id in dict.fromkeys(ids)])
+
+    def record_links(self, db: Session, project_ids: Iterable[int]) -> None:
+        """Log projects whose skill links or featured flag a bulk statement changed"""
+        project_ids = list(dict.fromkeys(project_ids))
+        _log(db, [
+            {"entity": entity, "entity_id": id, "action": "upsert"}
+            for entity in ("project", SKILL_LINKS) for id in project_ids
+        ])
+
+    def changed_since(self, db: Session, since: int, version: int, limit: int = 500) -> Optional[Set[Tuple[str, int]]]:
+        """(entity, id) pairs logged after `since` up to `version`; None if there are more than `limit`"""
+        rows = db.query(ChangeLog.entity, ChangeLog.entity_id).filter(
+            ChangeLog.version > since, ChangeLog.version <= version
+        ).limit(limit + 1).all()
+        if len(rows) > limit:
+            return None
+        return set(map(tuple, rows))
+
+    def get_changes(self, db: Session, since: int) -> ChangeSet:
+        """Entities upserted or deleted after version `since`, latest action per entity"""
+        version = self.get_version(db)
+        if since == version:
+            return ChangeSet(since=since, version=version)
+        if since > version:
+            return ChangeSet(since=since, version=version, reset=True)
+
+        latest: Dict[Tuple[str, int], str] = {}
+        rows = db.query(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action).filter(
+            ChangeLog.version > since, ChangeLog.version <= version, ChangeLog.entity.in_(TRACKED_MODELS)
+        ).order_by(ChangeLog.version, ChangeLog.id)
+        for entity, entity_id, action in rows:
+            latest[(entity, entity_id)] = action
+
+        upserted: Dict[str, List[int]] = {}
+        deleted: Dict[str, List[int]] = {}
+        for (entity, entity_id), action in latest.items():
+            target = upserted if action == "upsert" else deleted
+            target.setdefault(entity, []).append(entity_id)
+
+        entities = {}
+        for entity, ids in upserted.items():
+            model = TRACKED_MODELS[entity]
+            query = db.query(model).filter(model.id.in_(ids))
+            if entity in _LOAD_OPTIONS:
+                query = query.options(*_LOAD_OPTIONS[entity])
+            entities[entity] = query.order_by(model.id).all()
+
+        return ChangeSet(
+            since=since,
+            version=version,
+            upserted=ChangedEntities.model_validate(entities, from_attributes=True),
+            deleted=deleted
+        )
+
+# Create singleton instance
+change_log_service = ChangeLogService()
+
+# Log every flushed insert, update and delete of a tracked model
+def _flushed_changes(session: Session) -> List[dict]:
+    changes: Dict[Tuple[str, int], str] = {}
+
+    def add(obj, action: str) -> None:
+        entity = _ENTITIES_BY_MODEL.get(type(obj))
+        if entity is None:
+            return
+        changes[(entity, obj.id)] = action
+        # Projects embed their images, so an image change changes its project
+        if entity == "project_image" and obj.project_id is not None:
+            changes.setdefault(("project", obj.project_id), "upsert")
+
+    for obj in session.new:
+        add(obj, "upsert")
+        # Its links, if any, are inserted once this flush gives it an id
+        if isinstance(obj, Project):
+            changes[(SKILL_LINKS, obj.id)] = "upsert"
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            add(obj, "upsert")
+        if isinstance(obj, Project) and any(
+            inspect(obj).attrs[name].history.has_changes() for name in _SKILL_LINK_ATTRS
+        ):
+            changes.setdefault(("project", obj.id), "upsert")
+            changes[(SKILL_LINKS, obj.id)] = "upsert"
+    for obj in session.deleted:
+        add(obj, "delete")
+        # Its links go with it
+        if isinstance(obj, Project):
+            changes[(SKILL_LINKS, obj.id)] = "delete"
+    for project_id in session.info.pop("embedding_projects", ()):
+        changes.setdefault(("project", project_id), "upsert")
+
+    return [
+        {"entity": entity, "entity_id": entity_id, "action": action}
+        for (entity, entity_id), action in changes.items()
+    ]
+
+def _embedding_projects(session: Session) -> Set[int]:
+    """Projects that embed a skill or category this flush changes or deletes"""
+    changed = [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    skill_ids, category_ids = set(), set()
+    for obj in changed + list(session.deleted):
+        if isinstance(obj, Skill):
+            skill_ids.add(obj.id)
+        elif isinstance(obj, ProjectCategory):
+            category_ids.add(obj.id)
+
+    project_ids = set()
+    if skill_ids:
+        project_ids.update(session.connection().scalars(
+            select(project_skills.c.project_id).where(project_skills.c.skill_id.in_(skill_ids))
+        ))
+    if category_ids:
+        project_ids.update(session.connection().scalars(
+            select(Project.id).where(Project.category_id.in_(category_ids))
+        ))
+    return project_ids
+
+def _log(session: Session, rows: List[dict]) -> None:
+    """Insert change log rows under this transaction's version"""
+    # An upsert this transaction already logged needs no second row under the same version
+    logged = session.info.get("logged_changes", ())
+    rows = [row for row in rows if row["action"] != "upsert" or (row["entity"], row["entity_id"]) not in logged]
+    if not rows:
+        return
+    version = session.info.get("change_version")
+    if version is None:
+        # Holds the counter row's lock until commit, ordering versions by commit
+        version = session.connection().execute(
+            update(PortfolioVersion).values(version=PortfolioVersion.version + 1).returning(PortfolioVersion.version)
+        ).scalar_one()
+        session.info["change_version"] = version
+    session.connection().execute(insert(ChangeLog.__table__), [dict(row, version=version) for row in rows])
+    session.info.setdefault("logged_changes", set()).update((row["entity"], row["entity_id"]) for row in rows)
+
+# Read before the flush: deleting a skill or category removes its links to projects
+@event.listens_for(SessionLocal, "before_flush")
+def _find_embedding_projects(session: Session, flush_context, instances) -> None:
+    project_ids = _embedding_projects(session)
+    if project_ids:
+        session.info.setdefault("embedding_projects", set()).update(project_ids)
+
+@event.listens_for(SessionLocal, "after_flush")
+def _log_flush(session: Session, flush_context) -> None:
+    # Still pre-flush state here, but new rows already have their ids
+    _log(session, _flushed_changes(session))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _announce_committed(session: Session) -> None:
+    session.info.pop("change_version", None)
+    changes = session.info.pop("logged_changes", None)
+    if changes:
+        for callback in change_log_service._commit_callbacks:
+            callback(changes)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop("change_version", None)
+    session.info.pop("logged_changes", None)
+    session.info.pop("embedding_projects", None)
@@ -1,36 +1,39 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
+from app.core.fieldsets import Fieldset
 from app.models.education import Education
-from app.schemas.education import EducationCreate, EducationUpdate
-from app.services.base import BaseService
+from app.schemas.education import Education as EducationSchema, EducationCreate, EducationUpdate
+from app.services.base import BaseService, commit
 from app.services.file import FileService
+from app.services.media import query_served
 
 class EducationService(BaseService[Education, EducationCreate, EducationUpdate]):
     def __init__(self):
         super().__init__(Education)
+        self.fieldset = Fieldset(Education, EducationSchema)
     
-    def get_all_ordered(self, db: Session) -> List[Education]:
+    def get_all_ordered(self, db: Session, options: Sequence = ()) -> List[Education]:
         """Get all education records ordered by end date (newest first)"""
-        return db.query(Education).order_by(
+        return db.query(Education).options(*options).order_by(
             Education.end_date.desc().nullsfirst()  # Current education first
         ).all()
     
-    def get_degrees(self, db: Session) -> List[Education]:
+    def get_degrees(self, db: Session, options: Sequence = ()) -> List[Education]:
         """Get formal degree education"""
-        return db.query(Education).filter(
+        return db.query(Education).options(*options).filter(
             Education.is_certification == False
         ).order_by(Education.end_date.desc()).all()
     
-    def get_certifications(self, db: Session) -> List[Education]:
+    def get_certifications(self, db: Session, options: Sequence = ()) -> List[Education]:
         """Get certifications"""
-        return db.query(Education).filter(
+        return db.query(Education).options(*options).filter(
             Education.is_certification == True
         ).order_by(Education.end_date.desc()).all()
     
-    def get_current(self, db: Session) -> List[Education]:
+    def get_current(self, db: Session, options: Sequence = ()) -> List[Education]:
         """Get current education/certifications"""
-        return db.query(Education).filter(
+        return db.query(Education).options(*options).filter(
             Education.is_current == True
         ).all()
     
@@ -44,16 +47,18 @@ class EducationService(BaseService[Education, EducationCreate, EducationUpdate])
         # Update education with logo
         education.institution_logo = image_data
         education.institution_logo_type = mime_type
-        db.commit()
+        commit(db)
         db.refresh(education)
         
         return education
     
     def get_institution_logo(self, db: Session, education_id: int) -> Optional[Tuple[bytes, str]]:
-        """Get institution logo data and MIME type"""
-        education = self.get_by_id(db, education_id)
-        if education and education.institution_logo:
-            return education.institution_logo, education.institution_logo_type
+        """Get institution logo data and MIME type, processed if available"""
+        row = query_served(db, "institution_logo", Education, "institution_logo", "institution_logo_type").filter(
+            Education.id == education_id
+        ).first()
+        if row and row[0]:
+            return tuple(row)
         return None
     
     def delete_institution_logo(self, db: Session, education_id: int) -> Education:
@@ -61,7 +66,7 @@ class EducationService(BaseService[Education, EducationCreate, EducationUpdate])
         education = self.get_by_id_or_404(db, education_id)
         education.institution_logo = None
         education.institution_logo_type = None
-        db.commit()
+        commit(db)
         db.refresh(education)
         return education
     
@@ -75,7 +80,7 @@ class EducationService(BaseService[Education, EducationCreate, EducationUpdate])
         # Update education with certificate
         education.certificate_data = document_data
         education.certificate_type = mime_type
-        db.commit()
+        commit(db)
         db.refresh(education)
         
         return education
@@ -92,7 +97,7 @@ class EducationService(BaseService[Education, EducationCreate, EducationUpdate])
         education = self.get_by_id_or_404(db, education_id)
         education.certificate_data = None
         education.certificate_type = None
-        db.commit()
+        commit(db)
         db.refresh(education)
         return education
 
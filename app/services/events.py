@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.config.database import SessionLocal
+from app.config.settings import get_settings
+from app.core.events import Event, EventBroadcaster
+from app.models.change import ChangeLog
+from app.services.changes import TRACKED_MODELS, change_log_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class ChangeNotifier:
+    """Push committed changes to Server-Sent Events subscribers.
+
+    One task per process tails the change log and publishes each row as a
+    `change` event whose id is the portfolio version, so a reconnecting
+    client's Last-Event-ID resumes where it left off. Rows of one version
+    are published together and only the last carries the id. Commits in this
+    process wake the task immediately; other workers' commits are picked
+    up within `events_poll_seconds`. Subscribers never touch the database.
+    """
+
+    def __init__(self):
+        self.broadcaster = EventBroadcaster(settings.events_buffer_size, settings.events_heartbeat_seconds)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        version = await run_in_threadpool(self._get_version)
+        self.broadcaster.reset(version)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the tailing task; safe to call from any thread"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def stream(self, last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+        try:
+            since = int(last_event_id) if last_event_id else None
+        except ValueError:
+            since = None
+        return self.broadcaster.subscribe(since)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.events_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                events, more = await run_in_threadpool(self._read_since, self.broadcaster.last_id)
+            except Exception:
+                logger.exception("Reading the change log failed")
+                continue
+            await self.broadcaster.publish(events)
+            if more:
+                # More rows than one read returns; keep draining
+                self._wake.set()
+
+    def _get_version(self) -> int:
+        db = SessionLocal()
+        try:
+            return change_log_service.get_version(db)
+        finally:
+            db.close()
+
+    def _read_since(self, version: int) -> Tuple[List[Event], bool]:
+        """Events of whole versions after `version`, and whether more are waiting"""
+        limit = settings.events_buffer_size
+        db = SessionLocal()
+        try:
+            query = db.query(ChangeLog.version, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action).filter(
+                ChangeLog.entity.in_(TRACKED_MODELS)
+            ).order_by(ChangeLog.version, ChangeLog.id)
+            rows = query.filter(ChangeLog.version > version).limit(limit).all()
+            more = len(rows) == limit
+            if more and rows[0][0] != rows[-1][0]:
+                # The last version may continue past the limit; it comes with the next read
+                rows = [row for row in rows if row[0] != rows[-1][0]]
+            elif more:
+                # One version larger than the limit still goes out whole
+                rows = query.filter(ChangeLog.version == rows[0][0]).all()
+        finally:
+            db.close()
+        return [
+            Event(row_version, "change", {"entity": entity, "id": entity_id, "action": action, "version": row_version},
+                  resumable=next_row is None or next_row[0] != row_version)
+            for (row_version, entity, entity_id, action), next_row in zip(rows, rows[1:] + [None])
+        ], more
+
+# Create singleton instance
+change_notifier = ChangeNotifier()
+
+# Wake the notifier once a transaction that logged changes commits
+def _notify_committed(changes: Set[Tuple[str, int]]) -> None:
+    change_notifier.notify()
+
+change_log_service.on_commit(_notify_committed)
@@ -1,4 +1,3 @@
-import magic
 from typing import Tuple
 from fastapi import UploadFile
 from app.config.settings import get_settings
@@ -23,7 +22,8 @@ class FileService:
         if len(content) > settings.max_file_size:
             raise FileError(f"File too large. Maximum size: {settings.max_file_size} bytes")
         
-        # Detect MIME type from content
+        # Detect MIME type from content (libmagic is loaded on first upload)
+        import magic
         mime_type = magic.from_buffer(content, mime=True)
         
         # Validate against allowed types
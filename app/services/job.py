@@ -0,0 +1,203 @@
+import hashlib
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal, get_engine
+from app.config.settings import get_settings
+from app.core.exceptions import FileError
+from app.core.job_queue import JobQueue, RetryableJobError
+from app.models.education import Education
+from app.models.job import Job
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import ProjectImage
+from app.models.user import PersonalInfo
+from app.services.base import BaseService
+from app.services.blob_cache import blob_cache_service
+from app.services.media import save_variant
+from app.utils.constants import (
+    PROFILE_IMAGE_SIZE, COMPANY_LOGO_SIZE, PROJECT_IMAGE_SIZE, SKILL_ICON_SIZE
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Job kind -> (model, blob column, MIME type column, max image size)
+MEDIA_TARGETS: Dict[str, Tuple[type, str, str, Optional[Tuple[int, int]]]] = {
+    "profile_image": (PersonalInfo, "profile_image", "profile_image_type", PROFILE_IMAGE_SIZE),
+    "skill_icon": (Skill, "icon_data", "icon_type", SKILL_ICON_SIZE),
+    "company_logo": (WorkExperience, "company_logo", "company_logo_type", COMPANY_LOGO_SIZE),
+    "institution_logo": (Education, "institution_logo", "institution_logo_type", COMPANY_LOGO_SIZE),
+    "certificate": (Education, "certificate_data", "certificate_type", None),
+    "project_image": (ProjectImage, "image_data", "image_type", PROJECT_IMAGE_SIZE),
+}
+
+_PIL_FORMATS = {"image/jpeg": "JPEG", "image/png": "PNG", "image/webp": "WEBP"}
+
+def check_pdf(data: bytes) -> None:
+    """Reject documents that are not structurally complete PDFs"""
+    if not data.startswith(b"%PDF-"):
+        raise FileError("Certificate is not a PDF")
+    if b"%%EOF" not in data[-1024:]:
+        raise FileError("Certificate PDF is truncated")
+
+def shrink_image(data: bytes, mime_type: str, max_size: Tuple[int, int]) -> Optional[bytes]:
+    """Downscale and re-encode an image; None if nothing is gained"""
+    from PIL import Image  # ImportError fails the job; see run()
+
+    image_format = _PIL_FORMATS.get(mime_type)
+    if image_format is None:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(max_size)
+            output = io.BytesIO()
+            image.save(output, format=image_format, optimize=True)
+    except Exception as e:
+        raise FileError(f"Image could not be processed: {e}")
+
+    processed = output.getvalue()
+    return processed if len(processed) < len(data) else None
+
+def process_media(db: Session, job: Job) -> dict:
+    """Hash and validate the blob a job points at, and store an optimized variant of images.
+
+    The upload itself is kept; the variant is served in its place.
+    """
+    model, data_attr, type_attr, max_size = MEDIA_TARGETS[job.kind]
+
+    # Lock the row so a newer upload can't be paired with a variant of the old blob
+    target = db.query(model).filter(model.id == job.target_id).with_for_update().first()
+    data = getattr(target, data_attr) if target else None
+    if not data:
+        return {"skipped": "no data"}
+
+    mime_type = getattr(target, type_attr)
+    served = data
+    result = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "original_size": len(data),
+        "size": len(data),
+    }
+
+    if mime_type == "application/pdf":
+        check_pdf(data)
+    elif max_size:
+        processed = shrink_image(data, mime_type, max_size)
+        if processed is not None:
+            save_variant(db, job.kind, job.target_id, processed, mime_type)
+            # Log the record as changed so cached copies of the original are replaced
+            target.updated_at = datetime.utcnow()
+            served = processed
+            result.update(sha256=hashlib.sha256(processed).hexdigest(), size=len(processed))
+
+    if blob_cache_service.enabled and settings.blob_cache_eager:
+        blob_cache_service.stage(db, job.kind, job.target_id, served, mime_type)
+    return result
+
+class JobService(BaseService[Job, Job, Job]):
+    def __init__(self):
+        super().__init__(Job)
+        self.queue = JobQueue(self.run, settings.job_workers)
+
+    def enqueue(self, db: Session, kind: str, target_id: int) -> int:
+        """Record a job, hand it to the workers and return its id"""
+        return self.enqueue_many(db, kind, [target_id])[0]
+
+    def enqueue_many(self, db: Session, kind: str, target_ids: List[int]) -> List[int]:
+        """Record several jobs in one commit and return their ids"""
+        rows = [
+            {"kind": kind, "target_id": target_id, "max_attempts": settings.job_max_attempts}
+            for target_id in target_ids
+        ]
+        job_ids = list(db.scalars(insert(Job).returning(Job.id), rows))
+        db.commit()
+        for job_id in job_ids:
+            self.queue.submit(job_id)
+        return job_ids
+
+    def recover(self) -> int:
+        """Requeue jobs left pending, or running past their lease, by a previous process"""
+        get_engine()
+        db = SessionLocal()
+        try:
+            jobs = db.query(Job.id).filter(self._claimable(datetime.utcnow())).all()
+        finally:
+            db.close()
+        for (job_id,) in jobs:
+            self.queue.submit(job_id)
+        return len(jobs)
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """Jobs waiting for a worker, including ones whose worker stopped mid-run"""
+        return or_(
+            Job.status == "pending",
+            and_(Job.status == "running", or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < now))
+        )
+
+    def claim(self, db: Session, job_id: int) -> Optional[Job]:
+        """Mark a job running for this worker; None if it is finished or another worker holds it"""
+        now = datetime.utcnow()
+        claimed = db.query(Job).filter(Job.id == job_id, self._claimable(now)).update({
+            Job.status: "running",
+            Job.attempts: Job.attempts + 1,
+            Job.started_at: now,
+            Job.lease_expires_at: now + timedelta(seconds=settings.job_lease_seconds),
+        }, synchronize_session=False)
+        db.commit()
+        if claimed != 1:
+            return None
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    def run(self, job_id: int) -> None:
+        """Execute one job in a worker thread"""
+        db = SessionLocal()
+        try:
+            job = self.claim(db, job_id)
+            if job is None:
+                return
+
+            try:
+                result = process_media(db, job)
+            except FileError as e:
+                # Bad input won't get better on retry
+                db.rollback()
+                self._finish(db, job, "failed", error=e.message)
+                return
+            except ImportError as e:
+                # A missing image library is a deployment error; retrying won't install it
+                db.rollback()
+                logger.error("Job %s can't process %s: %s", job_id, job.kind, e)
+                self._finish(db, job, "failed", error=f"Image processing is unavailable: {e}")
+                return
+            except Exception as e:
+                db.rollback()
+                logger.warning("Job %s attempt %s failed: %s", job_id, job.attempts, e)
+                if job.attempts < job.max_attempts:
+                    job.status = "pending"
+                    job.last_error = str(e)
+                    db.commit()
+                    raise RetryableJobError(delay=2 ** job.attempts)
+                self._finish(db, job, "failed", error=str(e))
+                return
+
+            self._finish(db, job, "succeeded", result=result)
+        finally:
+            db.close()
+
+    def _finish(self, db: Session, job: Job, status: str, result: dict = None, error: str = None) -> None:
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        if result is not None:
+            job.result = json.dumps(result)
+        if error is not None:
+            job.last_error = error
+        db.commit()
+
+# Create singleton instance
+job_service = JobService()
@@ -0,0 +1,52 @@
+from typing import Dict, List, Tuple
+from sqlalchemy import and_, case, delete, event, func, tuple_
+from sqlalchemy.orm import Query, Session, attributes
+from app.config.database import SessionLocal
+from app.models.education import Education
+from app.models.media import MediaVariant
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import ProjectImage
+from app.models.user import PersonalInfo
+
+# Media kind -> (model, blob column); a variant is stale once its blob column changes
+MEDIA_COLUMNS: Dict[str, Tuple[type, str]] = {
+    "profile_image": (PersonalInfo, "profile_image"),
+    "skill_icon": (Skill, "icon_data"),
+    "company_logo": (WorkExperience, "company_logo"),
+    "institution_logo": (Education, "institution_logo"),
+    "certificate": (Education, "certificate_data"),
+    "project_image": (ProjectImage, "image_data"),
+}
+
+def query_served(db: Session, kind: str, model, data_attr: str, type_attr: str, *columns) -> Query:
+    """Query of (*columns, blob, MIME type) for `model` rows, preferring each row's processed variant"""
+    return db.query(
+        *columns,
+        func.coalesce(MediaVariant.data, getattr(model, data_attr)),
+        case((MediaVariant.data.isnot(None), MediaVariant.mime_type), else_=getattr(model, type_attr)),
+    ).select_from(model).outerjoin(
+        MediaVariant, and_(MediaVariant.kind == kind, MediaVariant.target_id == model.id)
+    )
+
+def save_variant(db: Session, kind: str, target_id: int, data: bytes, mime_type: str) -> None:
+    """Store or replace the processed copy of a record's blob"""
+    db.merge(MediaVariant(kind=kind, target_id=target_id, data=data, mime_type=mime_type))
+
+# Drop variants whose original was replaced, removed or deleted in the same flush
+def _stale_variants(session: Session) -> List[Tuple[str, int]]:
+    stale = []
+    for obj in session.dirty:
+        for kind, (model, data_attr) in MEDIA_COLUMNS.items():
+            if type(obj) is model and attributes.get_history(obj, data_attr).has_changes():
+                stale.append((kind, obj.id))
+    for obj in session.deleted:
+        stale.extend((kind, obj.id) for kind, (model, _) in MEDIA_COLUMNS.items() if type(obj) is model)
+    return stale
+
+@event.listens_for(SessionLocal, "after_flush")
+def _drop_stale_variants(session: Session, flush_context) -> None:
+    stale = _stale_variants(session)
+    if stale:
+        session.connection().execute(
+            delete(MediaVariant).where(tuple_(MediaVariant.kind, MediaVariant.target_id).in_(stale))
+        )
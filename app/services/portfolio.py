@@ -1,26 +1,49 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
+from app.core.fieldsets import Fieldset
 from app.models.portfolio import Skill, WorkExperience
 from app.schemas.portfolio import (
-    SkillCreate, SkillUpdate,
-    WorkExperienceCreate, WorkExperienceUpdate
+    Skill as SkillSchema, SkillCreate, SkillUpdate,
+    WorkExperience as WorkExperienceSchema, WorkExperienceCreate, WorkExperienceUpdate
 )
-from app.services.base import BaseService
+from app.services.base import BaseService, commit
 from app.services.file import FileService
+from app.services.media import query_served
+from app.services.project import project_card_service, skill_ranking_service
 
 class SkillService(BaseService[Skill, SkillCreate, SkillUpdate]):
     def __init__(self):
         super().__init__(Skill)
+        self.fieldset = Fieldset(Skill, SkillSchema)
     
-    def get_by_category(self, db: Session, category: str) -> List[Skill]:
+    def get_by_category(self, db: Session, category: str, options: Sequence = ()) -> List[Skill]:
         """Get skills by category"""
-        return db.query(Skill).filter(Skill.category == category).all()
+        return db.query(Skill).options(*options).filter(Skill.category == category).all()
     
     def get_categories(self, db: Session) -> List[str]:
         """Get all unique skill categories"""
         return [cat[0] for cat in db.query(Skill.category).distinct().all()]
     
+    def update(self, db: Session, db_obj: Skill, obj_in: SkillUpdate) -> Skill:
+        """Update skill and the cards showing its name"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+        if "name" in update_data:
+            project_card_service.refresh_skill(db, db_obj.id)
+        commit(db)
+        db.refresh(db_obj)
+        return db_obj
+    
+    def delete(self, db: Session, db_obj: Skill) -> None:
+        """Delete skill and drop it from cards and rankings"""
+        project_ids = [project.id for project in db_obj.projects]
+        db.delete(db_obj)
+        project_card_service.refresh(db, project_ids)
+        skill_ranking_service.refresh(db, [db_obj.id])
+        commit(db)
+    
     def upload_icon(self, db: Session, skill_id: int, file: UploadFile) -> Skill:
         """Upload and set skill icon"""
         skill = self.get_by_id_or_404(db, skill_id)
@@ -31,16 +54,16 @@ class SkillService(BaseService[Skill, SkillCreate, SkillUpdate]):
         # Update skill with icon
         skill.icon_data = image_data
         skill.icon_type = mime_type
-        db.commit()
+        commit(db)
         db.refresh(skill)
         
         return skill
     
     def get_icon(self, db: Session, skill_id: int) -> Optional[Tuple[bytes, str]]:
-        """Get skill icon data and MIME type"""
-        skill = self.get_by_id(db, skill_id)
-        if skill and skill.icon_data:
-            return skill.icon_data, skill.icon_type
+        """Get skill icon data and MIME type, processed if available"""
+        row = query_served(db, "skill_icon", Skill, "icon_data", "icon_type").filter(Skill.id == skill_id).first()
+        if row and row[0]:
+            return tuple(row)
         return None
     
     def delete_icon(self, db: Session, skill_id: int) -> Skill:
@@ -48,23 +71,24 @@ class SkillService(BaseService[Skill, SkillCreate, SkillUpdate]):
         skill = self.get_by_id_or_404(db, skill_id)
         skill.icon_data = None
         skill.icon_type = None
-        db.commit()
+        commit(db)
         db.refresh(skill)
         return skill
 
 class WorkExperienceService(BaseService[WorkExperience, WorkExperienceCreate, WorkExperienceUpdate]):
     def __init__(self):
         super().__init__(WorkExperience)
+        self.fieldset = Fieldset(WorkExperience, WorkExperienceSchema)
     
-    def get_all_ordered(self, db: Session) -> List[WorkExperience]:
+    def get_all_ordered(self, db: Session, options: Sequence = ()) -> List[WorkExperience]:
         """Get all work experiences ordered by start date (newest first)"""
-        return db.query(WorkExperience).order_by(
+        return db.query(WorkExperience).options(*options).order_by(
             WorkExperience.start_date.desc()
         ).all()
     
-    def get_current_positions(self, db: Session) -> List[WorkExperience]:
+    def get_current_positions(self, db: Session, options: Sequence = ()) -> List[WorkExperience]:
         """Get current work positions"""
-        return db.query(WorkExperience).filter(
+        return db.query(WorkExperience).options(*options).filter(
             WorkExperience.is_current == True
         ).all()
     
@@ -78,16 +102,18 @@ class WorkExperienceService(BaseService[WorkExperience, WorkExperienceCreate, Wo
         # Update experience with logo
         experience.company_logo = image_data
         experience.company_logo_type = mime_type
-        db.commit()
+        commit(db)
         db.refresh(experience)
         
         return experience
     
     def get_company_logo(self, db: Session, experience_id: int) -> Optional[Tuple[bytes, str]]:
-        """Get company logo data and MIME type"""
-        experience = self.get_by_id(db, experience_id)
-        if experience and experience.company_logo:
-            return experience.company_logo, experience.company_logo_type
+        """Get company logo data and MIME type, processed if available"""
+        row = query_served(db, "company_logo", WorkExperience, "company_logo", "company_logo_type").filter(
+            WorkExperience.id == experience_id
+        ).first()
+        if row and row[0]:
+            return tuple(row)
         return None
     
     def delete_company_logo(self, db: Session, experience_id: int) -> WorkExperience:
@@ -95,7 +121,7 @@ class WorkExperienceService(BaseService[WorkExperience, WorkExperienceCreate, Wo
         experience = self.get_by_id_or_404(db, experience_id)
         experience.company_logo = None
         experience.company_logo_type = None
-        db.commit()
+        commit(db)
         db.refresh(experience)
         return experience
 
@@ -1,15 +1,203 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session, joinedload
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import UploadFile
-from app.models.project import Project, ProjectImage, ProjectCategory, project_skills
+from app.models.project import Project, ProjectImage, ProjectCategory, ProjectCard, SkillRanking, project_skills
 from app.models.portfolio import Skill
+from app.schemas.portfolio import Skill as SkillSchema
 from app.schemas.project import (
-    ProjectCreate, ProjectUpdate, ProjectCategoryCreate, ProjectCategoryUpdate,
-    ProjectImageCreate, ProjectSkillAssignment
+    Project as ProjectSchema, ProjectCreate, ProjectUpdate,
+    ProjectCategory as ProjectCategorySchema, ProjectCategoryCreate, ProjectCategoryUpdate,
+    ProjectImage as ProjectImageSchema, ProjectImageCreate, ProjectSkillAssignment,
+    ProjectCard as ProjectCardSchema, RankedProjectCard, SkillProjects
 )
 from app.core.exceptions import NotFoundError
-from app.services.base import BaseService
+from app.core.fieldsets import Expansion, Fieldset
+from app.services.base import BaseService, commit
+from app.services.changes import change_log_service
 from app.services.file import FileService
+from app.services.media import query_served
+from app.utils.constants import PROJECT_CARD_TAGS, SKILL_TOP_PROJECTS
+
+class ProjectCardService:
+    """Keeps `project_cards` in step with projects; callers commit"""
+    
+    def __init__(self):
+        # Sparse list responses are cut from the card, so they are a subset of the full list
+        self.fieldset = Fieldset(ProjectCard, ProjectCardSchema, derived={"id": ("project_id",)})
+    
+    def refresh(self, db: Session, project_ids: Iterable[int]) -> None:
+        """Rewrite the cards of the given projects, dropping those of deleted ones"""
+        ids = list(dict.fromkeys(project_ids))
+        if not ids:
+            return
+        db.flush()  # Sessions don't autoflush; the cards must see pending changes
+        db.execute(delete(ProjectCard).where(ProjectCard.project_id.in_(ids)))
+        rows = self._build(db, ids)
+        if rows:
+            db.execute(insert(ProjectCard), rows)
+    
+    def rebuild(self, db: Session) -> int:
+        """Rewrite every card; returns the number written"""
+        db.flush()
+        db.execute(delete(ProjectCard))
+        rows = self._build(db)
+        if rows:
+            db.execute(insert(ProjectCard), rows)
+        return len(rows)
+    
+    def refresh_category(self, db: Session, category_id: int) -> None:
+        """Rewrite the cards of projects in a category"""
+        self.refresh(db, db.scalars(select(Project.id).where(Project.category_id == category_id)))
+    
+    def refresh_skill(self, db: Session, skill_id: int) -> None:
+        """Rewrite the cards of projects using a skill"""
+        self.refresh(db, db.scalars(
+            select(project_skills.c.project_id).where(project_skills.c.skill_id == skill_id)
+        ))
+    
+    def get_cards(self, db: Session, category_id: Optional[int] = None, skill_id: Optional[int] = None,
+                  featured: bool = False, with_case_studies: bool = False,
+                  options: Sequence = ()) -> List[ProjectCard]:
+        """Cards newest first, or by relevance when filtered by skill"""
+        if skill_id and not category_id:
+            return [card for card, _ in self.ranked(db, skill_id).options(*options)]
+        query = db.query(ProjectCard).options(*options)
+        if category_id:
+            query = query.filter(ProjectCard.category_id == category_id)
+        elif featured:
+            query = query.filter(ProjectCard.featured == True)
+        elif with_case_studies:
+            query = query.filter(ProjectCard.has_case_study == True)
+        return query.order_by(ProjectCard.created_at.desc()).all()
+    
+    def ranked(self, db: Session, skill_id: int):
+        """Query for (card, relevance score) of projects using a skill, most relevant then newest first"""
+        return db.query(ProjectCard, project_skills.c.relevance_score).join(
+            project_skills, project_skills.c.project_id == ProjectCard.project_id
+        ).filter(project_skills.c.skill_id == skill_id).order_by(
+            project_skills.c.relevance_score.desc(), ProjectCard.created_at.desc(), ProjectCard.project_id.desc()
+        )
+    
+    def _build(self, db: Session, ids: Optional[List[int]] = None) -> List[dict]:
+        """Card rows for the given projects, or all of them, in two queries"""
+        main_image_id = select(func.min(ProjectImage.id)).where(
+            ProjectImage.project_id == Project.id, ProjectImage.is_main == True
+        ).scalar_subquery()
+        projects = select(
+            Project.id, Project.title, Project.description, Project.category_id,
+            ProjectCategory.name, main_image_id, Project.technologies, Project.featured,
+            Project.has_case_study, Project.created_at
+        ).outerjoin(ProjectCategory, Project.category_id == ProjectCategory.id)
+        skills = select(project_skills.c.project_id, Skill.name).join(
+            Skill, Skill.id == project_skills.c.skill_id
+        ).order_by(project_skills.c.relevance_score.desc(), Skill.name)
+        if ids is not None:
+            projects = projects.where(Project.id.in_(ids))
+            skills = skills.where(project_skills.c.project_id.in_(ids))
+        
+        skill_names: Dict[int, List[str]] = {}
+        for project_id, name in db.execute(skills):
+            skill_names.setdefault(project_id, []).append(name)
+        
+        return [
+            {
+                "project_id": id,
+                "title": title,
+                "description": description,
+                "category_id": category_id,
+                "category_name": category_name,
+                "main_image_id": main_image_id,
+                "skills": ", ".join(skill_names.get(id, [])[:PROJECT_CARD_TAGS]),
+                "technologies": ", ".join(
+                    [tech.strip() for tech in (technologies or "").split(",") if tech.strip()][:PROJECT_CARD_TAGS]
+                ),
+                "featured": featured,
+                "has_case_study": bool(has_case_study),
+                "created_at": created_at,
+            }
+            for (id, title, description, category_id, category_name, main_image_id, technologies, featured,
+                 has_case_study, created_at) in db.execute(projects)
+        ]
+
+class SkillRankingService:
+    """Keeps `skill_rankings` in step with project-skill associations; callers commit"""
+    
+    def refresh(self, db: Session, skill_ids: Iterable[int]) -> None:
+        """Recount and rerank the given skills, dropping the rankings of deleted ones"""
+        ids = list(dict.fromkeys(skill_ids))
+        if not ids:
+            return
+        db.flush()  # Sessions don't autoflush; the rankings must see pending changes
+        db.execute(delete(SkillRanking).where(SkillRanking.skill_id.in_(ids)))
+        rows = self._build(db, ids)
+        if rows:
+            db.execute(insert(SkillRanking), rows)
+    
+    def rebuild(self, db: Session) -> int:
+        """Rewrite every ranking; returns the number written"""
+        db.flush()
+        db.execute(delete(SkillRanking))
+        rows = self._build(db)
+        if rows:
+            db.execute(insert(SkillRanking), rows)
+        return len(rows)
+    
+    def get_projects(self, db: Session, skill_id: int, offset: int = 0,
+                     limit: int = SKILL_TOP_PROJECTS) -> Optional[SkillProjects]:
+        """A page of project cards for a skill, most relevant then newest first; None if the skill doesn't exist"""
+        ranking = db.query(Skill.id, SkillRanking.project_count, SkillRanking.top_project_ids).outerjoin(
+            SkillRanking, SkillRanking.skill_id == Skill.id
+        ).filter(Skill.id == skill_id).first()
+        if ranking is None:
+            return None
+        _, project_count, top_project_ids = ranking
+        if not project_count:
+            return SkillProjects(skill_id=skill_id, project_count=0, projects=[])
+        
+        query = project_card_service.ranked(db, skill_id)
+        if offset == 0 and limit <= SKILL_TOP_PROJECTS:
+            # The first page is already ranked; fetch just those cards
+            ids = [int(id) for id in top_project_ids.split(",")][:limit]
+            rows = query.filter(ProjectCard.project_id.in_(ids)).all()
+        else:
+            rows = query.offset(offset).limit(limit).all()
+        return SkillProjects(
+            skill_id=skill_id,
+            project_count=project_count,
+            projects=[
+                RankedProjectCard.model_validate(card).model_copy(update={"relevance_score": relevance_score})
+                for card, relevance_score in rows
+            ]
+        )
+    
+    def _build(self, db: Session, ids: Optional[List[int]] = None) -> List[dict]:
+        """Ranking rows for the given skills, or all of them, in one query; skills without projects get none"""
+        ranked = select(
+            project_skills.c.skill_id,
+            project_skills.c.project_id,
+            func.row_number().over(
+                partition_by=project_skills.c.skill_id,
+                order_by=(project_skills.c.relevance_score.desc(), Project.created_at.desc(), Project.id.desc())
+            ).label("rank"),
+            func.count().over(partition_by=project_skills.c.skill_id).label("total")
+        ).join(Project, Project.id == project_skills.c.project_id)
+        if ids is not None:
+            ranked = ranked.where(project_skills.c.skill_id.in_(ids))
+        ranked = ranked.subquery()
+        top = select(ranked.c.skill_id, ranked.c.project_id, ranked.c.total).where(
+            ranked.c.rank <= SKILL_TOP_PROJECTS
+        ).order_by(ranked.c.skill_id, ranked.c.rank)
+        
+        rankings: Dict[int, dict] = {}
+        for skill_id, project_id, total in db.execute(top):
+            ranking = rankings.setdefault(skill_id, {"skill_id": skill_id, "project_count": total, "top": []})
+            ranking["top"].append(str(project_id))
+        return [
+            {"skill_id": ranking["skill_id"], "project_count": ranking["project_count"],
+             "top_project_ids": ",".join(ranking["top"])}
+            for ranking in rankings.values()
+        ]
 
 class ProjectCategoryService(BaseService[ProjectCategory, ProjectCategoryCreate, ProjectCategoryUpdate]):
     def __init__(self):
@@ -18,10 +206,36 @@ class ProjectCategoryService(BaseService[ProjectCategory, ProjectCategoryCreate,
     def get_by_name(self, db: Session, name: str) -> Optional[ProjectCategory]:
         """Get category by name"""
         return db.query(ProjectCategory).filter(ProjectCategory.name == name).first()
+    
+    def update(self, db: Session, db_obj: ProjectCategory, obj_in: ProjectCategoryUpdate) -> ProjectCategory:
+        """Update category and the cards showing its name"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+        if "name" in update_data:
+            project_card_service.refresh_category(db, db_obj.id)
+        commit(db)
+        db.refresh(db_obj)
+        return db_obj
+    
+    def delete(self, db: Session, db_obj: ProjectCategory) -> None:
+        """Delete category and clear it from cards"""
+        db.delete(db_obj)
+        project_card_service.refresh_category(db, db_obj.id)
+        commit(db)
 
 class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
     def __init__(self):
         super().__init__(Project)
+        self.fieldset = Fieldset(
+            Project, ProjectSchema,
+            expansions={
+                "category": Expansion(Project.category, ProjectCategorySchema, joinedload),
+                "images": Expansion(Project.images, ProjectImageSchema),
+                "skills": Expansion(Project.skills, SkillSchema),
+            },
+            derived={"has_case_study": ("problem_statement", "solution_approach")}
+        )
     
     def create(self, db: Session, obj_in: ProjectCreate) -> Project:
         """Create project with skills association"""
@@ -36,13 +250,16 @@ class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
         # Create project
         db_project = Project(**project_data)
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
+        db.flush()
         
         # Associate skills
         if skill_ids:
             self._associate_skills(db, db_project.id, skill_ids)
         
+        project_card_service.refresh(db, [db_project.id])
+        skill_ranking_service.refresh(db, skill_ids)
+        commit(db)
+        db.refresh(db_project)
         return db_project
     
     def update_by_id(self, db: Session, id: int, obj_in: ProjectUpdate) -> Project:
@@ -65,16 +282,26 @@ class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
         if skill_ids is not None:
             self._update_skills_association(db, id, skill_ids)
         
-        db.commit()
-        db.refresh(db_project)
-        return db_project
+        project_card_service.refresh(db, [id])
+        commit(db)
+        # Reload with its relationships, without image blobs
+        db.expire(db_project)
+        return self.get_detail(db, id)
+    
+    def delete(self, db: Session, db_obj: Project) -> None:
+        """Delete project, its card and its place in skill rankings"""
+        skill_ids = [skill.id for skill in db_obj.skills]
+        db.delete(db_obj)
+        project_card_service.refresh(db, [db_obj.id])
+        skill_ranking_service.refresh(db, skill_ids)
+        commit(db)
     
     def get_all_with_relations(self, db: Session) -> List[Project]:
         """Get all projects with category, images, and skills"""
         return db.query(Project).options(
             joinedload(Project.category),
             joinedload(Project.images),
-            joinedload(Project.skills)
+            selectinload(Project.skills)
         ).order_by(Project.created_at.desc()).all()
     
     def get_featured(self, db: Session) -> List[Project]:
@@ -84,7 +311,7 @@ class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
         ).options(
             joinedload(Project.category),
             joinedload(Project.images),
-            joinedload(Project.skills)
+            selectinload(Project.skills)
         ).all()
     
     def get_by_category(self, db: Session, category_id: int) -> List[Project]:
@@ -92,56 +319,86 @@ class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
         return db.query(Project).filter(
             Project.category_id == category_id
         ).options(
+            joinedload(Project.category),
             joinedload(Project.images),
-            joinedload(Project.skills)
+            selectinload(Project.skills)
         ).all()
     
     def get_by_skill(self, db: Session, skill_id: int) -> List[Project]:
-        """Get projects that use a specific skill"""
+        """Get projects that use a specific skill, most relevant then newest first"""
         return db.query(Project).join(project_skills).filter(
             project_skills.c.skill_id == skill_id
         ).options(
             joinedload(Project.category),
             joinedload(Project.images),
-            joinedload(Project.skills)
+            selectinload(Project.skills)
+        ).order_by(
+            project_skills.c.relevance_score.desc(), Project.created_at.desc(), Project.id.desc()
         ).all()
     
     def get_with_case_studies(self, db: Session) -> List[Project]:
         """Get projects that have complete case studies"""
-        return db.query(Project).filter(
-            Project.problem_statement.isnot(None),
-            Project.solution_approach.isnot(None)
-        ).options(
+        return db.query(Project).filter(Project.has_case_study).options(
             joinedload(Project.category),
             joinedload(Project.images),
-            joinedload(Project.skills)
+            selectinload(Project.skills)
         ).all()
     
+    def get_detail(self, db: Session, id: int) -> Optional[Project]:
+        """Get a project with category, images and skills in three queries, without blobs"""
+        return db.query(Project).options(
+            joinedload(Project.category),
+            selectinload(Project.images).defer(ProjectImage.image_data),
+            selectinload(Project.skills).defer(Skill.icon_data)
+        ).filter(Project.id == id).first()
+    
     def _associate_skills(self, db: Session, project_id: int, skill_ids: List[int]):
         """Associate skills with project"""
-        for skill_id in skill_ids:
-            # Verify skill exists
-            skill = db.query(Skill).filter(Skill.id == skill_id).first()
-            if skill:
-                # Insert into junction table
-                stmt = project_skills.insert().values(
-                    project_id=project_id,
-                    skill_id=skill_id,
-                    relevance_score=5  # Default relevance
-                )
-                db.execute(stmt)
-        db.commit()
+        # Selecting from skills skips ids that don't exist, in the insert itself
+        db.execute(project_skills.insert().from_select(
+            ["project_id", "skill_id", "relevance_score"],
+            select(literal(project_id), Skill.id, literal(5)).where(Skill.id.in_(skill_ids))  # Default relevance
+        ))
     
     def _update_skills_association(self, db: Session, project_id: int, skill_ids: List[int]):
         """Update skills association for project"""
         # Remove existing associations
-        db.execute(
-            project_skills.delete().where(project_skills.c.project_id == project_id)
-        )
+        removed_ids = db.scalars(
+            project_skills.delete().where(project_skills.c.project_id == project_id).returning(project_skills.c.skill_id)
+        ).all()
         
         # Add new associations
         if skill_ids:
             self._associate_skills(db, project_id, skill_ids)
+        change_log_service.record_links(db, [project_id])
+        skill_ranking_service.refresh(db, [*removed_ids, *skill_ids])
+    
+    def update_skills(self, db: Session, project_id: int, skill_ids: List[int]) -> None:
+        """Replace all skills associated with a project"""
+        self._update_skills_association(db, project_id, skill_ids)
+        project_card_service.refresh(db, [project_id])
+        commit(db)
+    
+    def set_featured(self, db: Session, project_ids: List[int]) -> None:
+        """Feature exactly the given projects"""
+        featured_ids = set(project_ids)
+        changed_ids = [
+            id for id, featured in db.query(Project.id, Project.featured)
+            if featured != (id in featured_ids)
+        ]
+        
+        # First, unfeature all projects
+        db.query(Project).update({"featured": False})
+        
+        # Then, feature the specified projects
+        if project_ids:
+            db.query(Project).filter(Project.id.in_(project_ids)).update(
+                {"featured": True}, synchronize_session=False
+            )
+        
+        change_log_service.record_links(db, changed_ids)
+        project_card_service.refresh(db, changed_ids)
+        commit(db)
     
     def assign_skill(self, db: Session, project_id: int, assignment: ProjectSkillAssignment) -> Project:
         """Assign a skill to project with relevance score"""
@@ -167,7 +424,10 @@ class ProjectService(BaseService[Project, ProjectCreate, ProjectUpdate]):
             relevance_score=assignment.relevance_score
         )
         db.execute(stmt)
-        db.commit()
+        change_log_service.record_links(db, [project_id])
+        project_card_service.refresh(db, [project_id])
+        skill_ranking_service.refresh(db, [assignment.skill_id])
+        commit(db)
         
         return project
 
@@ -176,8 +436,8 @@ class ProjectImageService(BaseService[ProjectImage, ProjectImageCreate, ProjectI
         super().__init__(ProjectImage)
     
     def upload_images(self, db: Session, project_id: int, files: List[UploadFile], 
-                     captions: List[str] = None, main_index: int = 0) -> List[ProjectImage]:
-        """Upload multiple images for a project"""
+                     captions: List[str] = None, main_index: int = 0) -> List[int]:
+        """Upload multiple images for a project and return their ids"""
         # Verify project exists
         project = db.query(Project).filter(Project.id == project_id).first()
         if not project:
@@ -202,11 +462,18 @@ class ProjectImageService(BaseService[ProjectImage, ProjectImageCreate, ProjectI
             db.add(image)
             uploaded_images.append(image)
         
-        db.commit()
-        for image in uploaded_images:
-            db.refresh(image)
-        
-        return uploaded_images
+        # Read ids before commit expires the instances
+        db.flush()
+        image_ids = [image.id for image in uploaded_images]
+        project_card_service.refresh(db, [project_id])
+        commit(db)
+        return image_ids
+    
+    def delete(self, db: Session, db_obj: ProjectImage) -> None:
+        """Delete image and update its project's card"""
+        db.delete(db_obj)
+        project_card_service.refresh(db, [db_obj.project_id])
+        commit(db)
     
     def get_project_images(self, db: Session, project_id: int) -> List[ProjectImage]:
         """Get all images for a project"""
@@ -222,30 +489,48 @@ class ProjectImageService(BaseService[ProjectImage, ProjectImageCreate, ProjectI
         ).first()
     
     def get_image_data(self, db: Session, image_id: int) -> Optional[Tuple[bytes, str]]:
-        """Get image data and MIME type"""
-        image = self.get_by_id(db, image_id)
-        if image:
-            return image.image_data, image.image_type
+        """Get image data and MIME type, processed if available"""
+        row = query_served(db, "project_image", ProjectImage, "image_data", "image_type").filter(
+            ProjectImage.id == image_id
+        ).first()
+        if row:
+            return tuple(row)
         return None
     
+    def update_caption(self, db: Session, image_id: int, caption: str) -> ProjectImage:
+        """Update caption for a project image"""
+        image = self.get_by_id_or_404(db, image_id)
+        image.caption = caption
+        commit(db)
+        return image
+    
     def set_main_image(self, db: Session, image_id: int) -> ProjectImage:
         """Set an image as the main image for its project"""
         image = self.get_by_id_or_404(db, image_id)
         
         # Remove main flag from other images in the same project
-        db.query(ProjectImage).filter(
+        others = db.query(ProjectImage).filter(
             ProjectImage.project_id == image.project_id,
-            ProjectImage.id != image_id
-        ).update({"is_main": False})
+            ProjectImage.id != image_id,
+            ProjectImage.is_main == True
+        )
+        demoted_ids = [id for (id,) in others.with_entities(ProjectImage.id)]
+        if demoted_ids:
+            others.update({"is_main": False}, synchronize_session=False)
+            change_log_service.record(db, "project_image", demoted_ids)
+            change_log_service.record(db, "project", [image.project_id])
         
         # Set this image as main
         image.is_main = True
-        db.commit()
+        project_card_service.refresh(db, [image.project_id])
+        commit(db)
         db.refresh(image)
         
         return image
 
 # Create singleton instances
+project_card_service = ProjectCardService()
+skill_ranking_service = SkillRankingService()
 project_category_service = ProjectCategoryService()
 project_service = ProjectService()
 project_image_service = ProjectImageService()
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import Optional, Set
+from sqlalchemy.orm import Session
+from app.schemas.project import Project as ProjectSchema
+from app.services.cache import Changes, VersionedCache
+from app.services.changes import change_log_service
+from app.services.project import project_service
+
+# Entities embedded in every project detail; a change to one affects them all
+_EMBEDDED_ENTITIES = {"skill", "project_category"}
+
+def _affected_projects(changes: Changes) -> Optional[Set[str]]:
+    if any(entity in _EMBEDDED_ENTITIES for entity, _ in changes):
+        return None
+    return {str(id) for entity, id in changes if entity == "project"}
+
+class ProjectDetailService:
+    """Serialized project detail responses, cached per project id.
+
+    A project is loaded in a fixed three queries without blobs and kept as
+    JSON until the change log shows a change to that project, or to a skill
+    or category it may embed.
+    """
+
+    def __init__(self):
+        self.cache = VersionedCache("project_detail", _affected_projects)
+
+    def get(self, db: Session, project_id: int) -> Optional[bytes]:
+        """Project detail JSON, or None if the project doesn't exist"""
+        def build() -> Optional[bytes]:
+            project = project_service.get_detail(db, project_id)
+            if project is None:
+                return None
+            return ProjectSchema.model_validate(project).model_dump_json().encode()
+        return self.cache.get(db, str(project_id), build)
+
+# Create singleton instance
+project_detail_service = ProjectDetailService()
+
+change_log_service.on_commit(project_detail_service.cache.invalidate)
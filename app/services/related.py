@@ -0,0 +1,206 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.project import Project, ProjectCard, project_skills
+from app.schemas.project import RelatedProjectCard
+from app.services.changes import change_log_service
+from app.utils.constants import RELATED_PROJECT_WEIGHTS
+
+# Changes to these can touch any project's features, so they rebuild the matrix
+_GLOBAL_ENTITIES = {"skill", "project_category"}
+
+@dataclass
+class ProjectFeatures:
+    id: int
+    category_id: Optional[int]
+    technologies: Set[str]
+    skills: Dict[int, int] = field(default_factory=dict)  # Skill id -> relevance score
+
+def _similarity(skills_a, technologies_a, categories_a, skills_b, technologies_b, categories_b) -> np.ndarray:
+    """Weighted skill cosine, technology Jaccard and category match for every pair of rows"""
+    skill_weight, technology_weight, category_weight = RELATED_PROJECT_WEIGHTS
+
+    dot = skills_a @ skills_b.T
+    norms = np.outer(np.linalg.norm(skills_a, axis=1), np.linalg.norm(skills_b, axis=1))
+    cosine = np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+
+    shared = technologies_a @ technologies_b.T
+    union = technologies_a.sum(axis=1)[:, None] + technologies_b.sum(axis=1)[None, :] - shared
+    jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    same_category = (categories_a[:, None] == categories_b[None, :]) & (categories_a[:, None] >= 0)
+    return skill_weight * cosine + technology_weight * jaccard + category_weight * same_category
+
+class SimilarityMatrix:
+    """Feature rows and pairwise scores for every project, as of one portfolio version"""
+
+    def __init__(self, version: int):
+        self.version = version
+        self.ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.skill_columns: Dict[int, int] = {}
+        self.technology_columns: Dict[str, int] = {}
+        self.skills = np.zeros((0, 0), dtype=np.float32)  # Relevance score per skill
+        self.technologies = np.zeros((0, 0), dtype=np.float32)  # 1 where the project lists it
+        self.categories = np.zeros(0, dtype=np.int64)  # -1 without one
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+
+    def copy(self, version: int) -> "SimilarityMatrix":
+        """A copy to update at a newer version while readers keep this one"""
+        matrix = SimilarityMatrix(version)
+        matrix.ids = list(self.ids)
+        matrix.rows = dict(self.rows)
+        matrix.skill_columns = dict(self.skill_columns)
+        matrix.technology_columns = dict(self.technology_columns)
+        # The arrays are shared: remove and update only write into arrays they've just reallocated
+        matrix.skills, matrix.technologies = self.skills, self.technologies
+        matrix.categories, matrix.scores = self.categories, self.scores
+        return matrix
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Drop projects' rows and columns"""
+        rows = [self.rows[id] for id in ids if id in self.rows]
+        if not rows:
+            return
+        keep = np.setdiff1d(np.arange(len(self.ids)), rows)
+        self.skills = self.skills[keep]
+        self.technologies = self.technologies[keep]
+        self.categories = self.categories[keep]
+        self.scores = self.scores[np.ix_(keep, keep)]
+        self.ids = [self.ids[row] for row in keep]
+        self.rows = {id: row for row, id in enumerate(self.ids)}
+
+    def update(self, features: List[ProjectFeatures]) -> None:
+        """Add or replace projects' features and rescore just those against every project"""
+        if not features:
+            return
+        for columns, keys in (
+            (self.skill_columns, {skill_id for f in features for skill_id in f.skills}),
+            (self.technology_columns, {name for f in features for name in f.technologies}),
+        ):
+            for key in sorted(keys - columns.keys()):
+                columns[key] = len(columns)
+        for f in features:
+            if f.id not in self.rows:
+                self.rows[f.id] = len(self.ids)
+                self.ids.append(f.id)
+
+        # Grow every array once for the new projects and vocabulary
+        added = len(self.ids) - len(self.categories)
+        self.skills = np.pad(self.skills, ((0, added), (0, len(self.skill_columns) - self.skills.shape[1])))
+        self.technologies = np.pad(
+            self.technologies, ((0, added), (0, len(self.technology_columns) - self.technologies.shape[1]))
+        )
+        self.categories = np.concatenate([self.categories, np.full(added, -1, dtype=np.int64)])
+        self.scores = np.pad(self.scores, ((0, added), (0, added)))
+
+        rows = np.array([self.rows[f.id] for f in features])
+        self.skills[rows] = 0
+        self.technologies[rows] = 0
+        for row, f in zip(rows, features):
+            for skill_id, relevance_score in f.skills.items():
+                self.skills[row, self.skill_columns[skill_id]] = relevance_score
+            for name in f.technologies:
+                self.technologies[row, self.technology_columns[name]] = 1
+            self.categories[row] = f.category_id if f.category_id is not None else -1
+
+        scores = _similarity(
+            self.skills[rows], self.technologies[rows], self.categories[rows],
+            self.skills, self.technologies, self.categories
+        )
+        self.scores[rows, :] = scores
+        self.scores[:, rows] = scores.T
+        self.scores[rows, rows] = 0  # A project isn't related to itself
+
+    def top(self, project_id: int, limit: int) -> Optional[List[tuple]]:
+        """(project id, score) of the most similar projects; None for an unknown project"""
+        row = self.rows.get(project_id)
+        if row is None:
+            return None
+        scores = self.scores[row]
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.ids[i], float(scores[i])) for i in best if scores[i] > 0]
+
+class RelatedProjectService:
+    """Most similar projects by skills, technologies and category.
+
+    Each worker keeps a dense similarity matrix over all projects. Reads
+    check the portfolio version; projects the change log names since the
+    matrix was built are reloaded and only their rows and columns
+    rescored. Skill or category changes, or a long gap, rebuild it. A
+    matrix is never modified once published: updates go to a copy, built
+    outside the lock and swapped in under it.
+    """
+
+    def __init__(self):
+        self._matrix: Optional[SimilarityMatrix] = None
+        self._lock = threading.Lock()
+
+    def get_related(self, db: Session, project_id: int, limit: int) -> Optional[List[RelatedProjectCard]]:
+        """Cards of the most similar projects, best first; None if the project doesn't exist"""
+        top = self._current(db).top(project_id, limit)
+        if top is None:
+            return None
+        if not top:
+            return []
+
+        cards = {card.project_id: card for card in db.query(ProjectCard).filter(
+            ProjectCard.project_id.in_([id for id, _ in top])
+        )}
+        return [
+            RelatedProjectCard.model_validate(cards[id]).model_copy(update={"score": round(score, 4)})
+            for id, score in top if id in cards
+        ]
+
+    def _current(self, db: Session) -> SimilarityMatrix:
+        # Read the version before loading, so the stamp is never newer than what was read
+        version = change_log_service.get_version(db)
+        current = self._matrix
+        # A replica lagging behind the matrix reads an older version; the newer matrix still serves it
+        if current is not None and current.version >= version:
+            return current
+
+        changes = None
+        if current is not None:
+            changes = change_log_service.changed_since(db, current.version, version)
+        if changes is None or any(entity in _GLOBAL_ENTITIES for entity, _ in changes):
+            matrix = SimilarityMatrix(version)
+            matrix.update(self._load(db))
+        else:
+            ids = {id for entity, id in changes if entity == "project"}
+            features = self._load(db, ids) if ids else []
+            matrix = current.copy(version)
+            matrix.remove(ids - {f.id for f in features})
+            matrix.update(features)
+
+        with self._lock:
+            # Another request may have published a newer matrix meanwhile
+            if self._matrix is None or self._matrix.version < matrix.version:
+                self._matrix = matrix
+            return self._matrix
+
+    def _load(self, db: Session, ids: Optional[Set[int]] = None) -> List[ProjectFeatures]:
+        """Features of the given projects, or all of them, in two queries"""
+        projects = select(Project.id, Project.category_id, Project.technologies).order_by(Project.id)
+        links = select(project_skills.c.project_id, project_skills.c.skill_id, project_skills.c.relevance_score)
+        if ids is not None:
+            projects = projects.where(Project.id.in_(ids))
+            links = links.where(project_skills.c.project_id.in_(ids))
+
+        features = {
+            id: ProjectFeatures(
+                id, category_id,
+                {name.strip().lower() for name in (technologies or "").split(",") if name.strip()}
+            )
+            for id, category_id, technologies in db.execute(projects)
+        }
+        for project_id, skill_id, relevance_score in db.execute(links):
+            if project_id in features:
+                features[project_id].skills[skill_id] = 1 if relevance_score is None else relevance_score
+        return list(features.values())
+
+# Create singleton instance
+related_project_service = RelatedProjectService()
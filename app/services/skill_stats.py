@@ -0,0 +1,91 @@
+from typing import List, Set
+import numpy as np
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.portfolio import Skill
+from app.models.project import Project, project_skills
+from app.schemas.portfolio import CoOccurringSkill, SkillStats
+from app.services.cache import Changes, VersionedCache
+from app.services.changes import SKILL_LINKS, change_log_service
+from app.utils.constants import SKILL_CO_OCCURRING
+
+# Skill rows, and projects' skill links and featured flags, are what the stats count
+_COUNTED_ENTITIES = {"skill", SKILL_LINKS}
+_STATS_KEY = "all"
+
+_stats_adapter = TypeAdapter(List[SkillStats])
+
+def _affected_stats(changes: Changes) -> Set[str]:
+    return {_STATS_KEY} if any(entity in _COUNTED_ENTITIES for entity, _ in changes) else set()
+
+class SkillStatsService:
+    """Usage and co-occurrence statistics for every skill.
+
+    `project_skills` is loaded once into projects x skills incidence and
+    relevance matrices; counts, featured counts, average relevance
+    and the skill co-occurrence matrix all come from NumPy reductions and
+    one matrix product over it. The serialized result is cached until a
+    skill, or a project's skill links or featured flag, changes.
+    """
+
+    def __init__(self):
+        self.cache = VersionedCache("skill_stats", _affected_stats)
+
+    def get_stats(self, db: Session) -> bytes:
+        """Stats for every skill as JSON, in skill id order"""
+        return self.cache.get(db, _STATS_KEY, lambda: _stats_adapter.dump_json(self._build(db)))
+
+    def _build(self, db: Session) -> List[SkillStats]:
+        skills = db.execute(select(Skill.id, Skill.name).order_by(Skill.id)).all()
+        links = db.execute(
+            select(project_skills.c.project_id, project_skills.c.skill_id,
+                   project_skills.c.relevance_score, Project.featured)
+            .join(Project, Project.id == project_skills.c.project_id)
+        ).all()
+
+        columns = {skill_id: column for column, (skill_id, _) in enumerate(skills)}
+        project_rows = {}
+        for project_id, *_ in links:
+            project_rows.setdefault(project_id, len(project_rows))
+
+        relevance = np.zeros((len(project_rows), len(skills)), dtype=np.float64)
+        used = np.zeros_like(relevance)  # 1 where the project lists the skill, whatever its relevance
+        featured = np.zeros(len(project_rows), dtype=np.float64)
+        for project_id, skill_id, relevance_score, is_featured in links:
+            row = project_rows[project_id]
+            relevance[row, columns[skill_id]] = 1 if relevance_score is None else relevance_score
+            used[row, columns[skill_id]] = 1
+            featured[row] = is_featured
+
+        project_counts = used.sum(axis=0)
+        featured_counts = featured @ used
+        relevance_totals = relevance.sum(axis=0)
+        co_occurrence = used.T @ used
+        np.fill_diagonal(co_occurrence, 0)
+
+        stats = []
+        for column, (skill_id, name) in enumerate(skills):
+            counts = co_occurrence[column]
+            # Most shared projects first, then lowest skill id
+            order = np.lexsort((np.arange(len(skills)), -counts))[:SKILL_CO_OCCURRING]
+            stats.append(SkillStats(
+                skill_id=skill_id,
+                name=name,
+                project_count=int(project_counts[column]),
+                featured_project_count=int(featured_counts[column]),
+                average_relevance=(
+                    round(float(relevance_totals[column] / project_counts[column]), 2)
+                    if project_counts[column] else None
+                ),
+                co_occurring=[
+                    CoOccurringSkill(skill_id=skills[other][0], name=skills[other][1], project_count=int(counts[other]))
+                    for other in order if counts[other] > 0
+                ]
+            ))
+        return stats
+
+# Create singleton instance
+skill_stats_service = SkillStatsService()
+
+change_log_service.on_commit(skill_stats_service.cache.invalidate)
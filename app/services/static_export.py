@@ -0,0 +1,214 @@
+"""Render the public API to static files.
+
+Every public GET view is written as a JSON file and every image and
+certificate as a binary, each named by a hash of its content. The
+`manifest.json` at the root maps API paths (with query strings) to those
+files; it is the only file that changes in place, so everything else can
+be served with far-future cache headers.
+
+Exports are incremental: JSON views are re-rendered and only written when
+their hash changes, blobs are only read from the database when their
+row's `updated_at` differs from the previous manifest, and files the new
+manifest no longer references are removed.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, load_only
+from app.api.v1 import public
+from app.models.education import Education
+from app.models.portfolio import Skill, WorkExperience
+from app.models.project import Project, ProjectCategory, ProjectImage
+from app.models.user import PersonalInfo
+from app.services.media import query_served
+from app.utils.constants import MIME_TYPE_EXTENSIONS, SKILL_TOP_PROJECTS, RELATED_PROJECTS
+
+API_PREFIX = "/api/v1"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# API path template -> (media kind, model, blob column, MIME type column)
+BLOB_ROUTES = {
+    "/images/profile": ("profile_image", PersonalInfo, "profile_image", "profile_image_type"),
+    "/images/skills/{id}": ("skill_icon", Skill, "icon_data", "icon_type"),
+    "/images/companies/{id}": ("company_logo", WorkExperience, "company_logo", "company_logo_type"),
+    "/images/projects/{id}": ("project_image", ProjectImage, "image_data", "image_type"),
+    "/images/institutions/{id}": ("institution_logo", Education, "institution_logo", "institution_logo_type"),
+    "/documents/certificates/{id}": ("certificate", Education, "certificate_data", "certificate_type"),
+}
+
+def _extension(mime_type: Optional[str]) -> str:
+    if not mime_type:
+        return ".bin"
+    return MIME_TYPE_EXTENSIONS.get(mime_type) or mimetypes.guess_extension(mime_type) or ".bin"
+
+def _url(path: str, **params) -> str:
+    params = {key: value for key, value in params.items() if value is not None}
+    return f"{API_PREFIX}{path}" + (f"?{urlencode(params)}" if params else "")
+
+class StaticExporter:
+    def __init__(self, db: Session, output_dir: str):
+        self.db = db
+        self.output_dir = output_dir
+        self.previous = self._load_manifest()
+        self.routes: Dict[str, dict] = {}
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0}
+        self._adapters = {
+            route.endpoint: TypeAdapter(route.response_model)
+            for route in public.router.routes if route.response_model is not None
+        }
+
+    def run(self) -> dict:
+        for url, endpoint, kwargs in self._views():
+            self._export_view(url, endpoint, kwargs)
+        for path, (kind, model, data_attr, type_attr) in BLOB_ROUTES.items():
+            self._export_blobs(path, kind, model, data_attr, type_attr)
+
+        self._write_manifest()
+        self._prune()
+        return dict(self.stats, routes=len(self.routes))
+
+    def _views(self) -> Iterator[Tuple[str, callable, dict]]:
+        """Every public JSON view, with the filter values that exist in the database"""
+        yield _url("/portfolio"), public.get_portfolio_summary, {}
+
+        project_filters = dict(category_id=None, skill_id=None, featured=None, with_case_studies=None)
+        yield _url("/projects"), public.get_projects, project_filters
+        yield _url("/projects", featured="true"), public.get_projects, dict(project_filters, featured=True)
+        yield (_url("/projects", with_case_studies="true"), public.get_projects,
+               dict(project_filters, with_case_studies=True))
+        for (category_id,) in self.db.query(ProjectCategory.id).order_by(ProjectCategory.id):
+            yield (_url("/projects", category_id=category_id), public.get_projects,
+                   dict(project_filters, category_id=category_id))
+        for (skill_id,) in self.db.query(Skill.id).order_by(Skill.id):
+            yield (_url("/projects", skill_id=skill_id), public.get_projects,
+                   dict(project_filters, skill_id=skill_id))
+        for (project_id,) in self.db.query(Project.id).order_by(Project.id):
+            yield _url(f"/projects/{project_id}"), public.get_project_detail, dict(project_id=project_id)
+            yield (_url(f"/projects/{project_id}/related"), public.get_related_projects,
+                   dict(project_id=project_id, limit=RELATED_PROJECTS))
+
+        yield _url("/skills"), public.get_skills, dict(category=None)
+        yield _url("/skills/categories"), public.get_skill_categories, {}
+        yield _url("/skills/stats"), public.get_skill_stats, {}
+        for (category,) in self.db.query(Skill.category).distinct().order_by(Skill.category):
+            yield _url("/skills", category=category), public.get_skills, dict(category=category)
+        for (skill_id,) in self.db.query(Skill.id).order_by(Skill.id):
+            yield (_url(f"/skills/{skill_id}/projects"), public.get_skill_projects,
+                   dict(skill_id=skill_id, offset=0, limit=SKILL_TOP_PROJECTS))
+
+        yield _url("/experience"), public.get_work_experience, dict(current_only=None)
+        yield _url("/experience", current_only="true"), public.get_work_experience, dict(current_only=True)
+
+        education_filters = dict(type=None, current_only=None)
+        yield _url("/education"), public.get_education, education_filters
+        yield _url("/education", current_only="true"), public.get_education, dict(education_filters, current_only=True)
+        for education_type in ("degree", "certification"):
+            yield (_url("/education", type=education_type), public.get_education,
+                   dict(education_filters, type=education_type))
+
+    def _export_view(self, url: str, endpoint, kwargs: dict) -> None:
+        # Call the route function itself so the files match the live API
+        result = endpoint(db=self.db, **kwargs)
+        adapter = self._adapters.get(endpoint)
+        if isinstance(result, Response):
+            content = result.body  # Already serialized, like cached project details
+        elif adapter is not None:
+            content = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+        else:
+            content = json.dumps(jsonable_encoder(result)).encode()
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.routes[url] = {
+            "file": self._write(f"data/{digest[:20]}.json", content),
+            "content_type": "application/json",
+            "sha256": digest,
+        }
+
+    def _export_blobs(self, path: str, kind: str, model, data_attr: str, type_attr: str) -> None:
+        data_column = getattr(model, data_attr)
+        rows = self.db.query(model).options(
+            load_only(model.id, model.updated_at, getattr(model, type_attr))
+        ).filter(data_column.isnot(None)).order_by(model.id)
+
+        for row in rows:
+            url = _url(path.format(id=row.id))
+            stamp = row.updated_at.isoformat()
+            previous = self.previous.get(url)
+            if (previous and previous.get("updated_at") == stamp
+                    and os.path.exists(os.path.join(self.output_dir, previous["file"]))):
+                self.routes[url] = previous
+                self.stats["unchanged"] += 1
+                continue
+
+            # Only changed rows pay for loading their blob
+            content, mime_type = query_served(self.db, kind, model, data_attr, type_attr).filter(
+                model.id == row.id
+            ).one()
+            digest = hashlib.sha256(content).hexdigest()
+            self.routes[url] = {
+                "file": self._write(f"blobs/{digest[:20]}{_extension(mime_type)}", content),
+                "content_type": mime_type,
+                "sha256": digest,
+                "updated_at": stamp,
+            }
+
+    def _write(self, name: str, content: bytes) -> str:
+        """Write a content-addressed file unless it already exists"""
+        path = os.path.join(self.output_dir, name)
+        if os.path.exists(path):
+            self.stats["unchanged"] += 1
+            return name
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self.stats["written"] += 1
+        return name
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("routes", {})
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "generated_at": datetime.utcnow().isoformat(),
+            "routes": self.routes,
+        }
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+    def _prune(self) -> None:
+        """Remove files that the new manifest no longer references"""
+        referenced = {entry["file"] for entry in self.routes.values()}
+        for directory in ("data", "blobs"):
+            full_directory = os.path.join(self.output_dir, directory)
+            if not os.path.isdir(full_directory):
+                continue
+            for name in os.listdir(full_directory):
+                if f"{directory}/{name}" not in referenced:
+                    os.remove(os.path.join(full_directory, name))
+                    self.stats["removed"] += 1
+
+def export_static(db: Session, output_dir: str) -> dict:
+    """Export the public API into `output_dir` and return file counts"""
+    return StaticExporter(db, output_dir).run()
@@ -1,11 +1,14 @@
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
-from app.models.user import PersonalInfo
+from app.models.user import PersonalInfo, Admin
 from app.schemas.user import PersonalInfoCreate, PersonalInfoUpdate
-from app.services.base import BaseService
+from app.schemas.auth import AdminCreate
+from app.services.base import BaseService, commit
 from app.services.file import FileService
-from app.core.exceptions import SingletonViolationError
+from app.services.media import query_served
+from app.core.exceptions import SingletonViolationError, ValidationError
+from app.core.security import get_password_hash, verify_password, verify_and_update_password, get_dummy_hash
 
 class PersonalInfoService(BaseService[PersonalInfo, PersonalInfoCreate, PersonalInfoUpdate]):
     def __init__(self):
@@ -51,16 +54,16 @@ class PersonalInfoService(BaseService[PersonalInfo, PersonalInfoCreate, Personal
         # Update with image
         personal_info.profile_image = image_data
         personal_info.profile_image_type = mime_type
-        db.commit()
+        commit(db)
         db.refresh(personal_info)
         
         return personal_info
     
     def get_profile_image(self, db: Session) -> Optional[Tuple[bytes, str]]:
-        """Get profile image data and MIME type"""
-        personal_info = self.get_personal_info(db)
-        if personal_info and personal_info.profile_image:
-            return personal_info.profile_image, personal_info.profile_image_type
+        """Get profile image data and MIME type, processed if available"""
+        row = query_served(db, "profile_image", PersonalInfo, "profile_image", "profile_image_type").first()
+        if row and row[0]:
+            return tuple(row)
         return None
     
     def delete_profile_image(self, db: Session) -> PersonalInfo:
@@ -69,9 +72,52 @@ class PersonalInfoService(BaseService[PersonalInfo, PersonalInfoCreate, Personal
         if personal_info:
             personal_info.profile_image = None
             personal_info.profile_image_type = None
-            db.commit()
+            commit(db)
             db.refresh(personal_info)
         return personal_info
 
-# Create singleton instance
-personal_info_service = PersonalInfoService()
\ No newline at end of file
+class AdminService(BaseService[Admin, AdminCreate, AdminCreate]):
+    def __init__(self):
+        super().__init__(Admin)
+    
+    def get_by_username(self, db: Session, username: str) -> Optional[Admin]:
+        """Get admin by username"""
+        return db.query(Admin).filter(Admin.username == username).first()
+    
+    def create(self, db: Session, obj_in: AdminCreate) -> Admin:
+        """Create admin with a bcrypt-hashed password"""
+        if self.get_by_username(db, obj_in.username):
+            raise ValidationError(f"Admin already exists: {obj_in.username}")
+        
+        admin = Admin(
+            username=obj_in.username,
+            hashed_password=get_password_hash(obj_in.password)
+        )
+        db.add(admin)
+        commit(db)
+        db.refresh(admin)
+        return admin
+    
+    def authenticate(self, db: Session, username: str, password: str) -> Optional[Admin]:
+        """Check credentials, rehashing the password if the bcrypt cost changed.
+        
+        Slow by design; call through run_in_password_executor.
+        """
+        admin = self.get_by_username(db, username)
+        if not admin or not admin.is_active:
+            # Spend the same time as a real check so usernames can't be probed
+            verify_password(password, get_dummy_hash())
+            return None
+        
+        valid, new_hash = verify_and_update_password(password, admin.hashed_password)
+        if not valid:
+            return None
+        
+        if new_hash:
+            admin.hashed_password = new_hash
+            commit(db)
+        return admin
+
+# Create singleton instances
+personal_info_service = PersonalInfoService()
+admin_service = AdminService()
\ No newline at end of file
@@ -50,6 +50,9 @@ EMPLOYMENT_TYPES = [
     "volunteer"
 ]
 
+# How much of a stored date is meaningful ("Mar 2021" is stored as 2021-03-01, "month")
+DATE_PRECISIONS = ["day", "month", "year"]
+
 # File size limits (in bytes)
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_DOCUMENT_SIZE = 10 * 1024 * 1024  # 10MB
@@ -60,6 +63,16 @@ COMPANY_LOGO_SIZE = (200, 200)
 PROJECT_IMAGE_SIZE = (800, 600)
 SKILL_ICON_SIZE = (64, 64)
 
+# File extensions for stored MIME types
+MIME_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/svg+xml": ".svg",
+    "application/pdf": ".pdf"
+}
+
 # API response messages
 SUCCESS_MESSAGES = {
     "created": "Resource created successfully",
@@ -74,4 +87,17 @@ ERROR_MESSAGES = {
     "forbidden": "Access denied",
     "invalid_file": "Invalid file type or size",
     "validation_error": "Validation failed"
-}
\ No newline at end of file
+}
+
+# Skill and technology names kept on each project card
+PROJECT_CARD_TAGS = 5
+
+# Projects kept per skill ranking, served without ranking the rest
+SKILL_TOP_PROJECTS = 5
+
+# Related projects: weights of skill cosine (by relevance), technology Jaccard and same category
+RELATED_PROJECT_WEIGHTS = (0.6, 0.3, 0.1)
+RELATED_PROJECTS = 4
+
+# Co-occurring skills listed per skill in /skills/stats
+SKILL_CO_OCCURRING = 5
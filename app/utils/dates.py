@@ -0,0 +1,56 @@
+import calendar
+import re
+from datetime import date
+from typing import Optional, Tuple
+
+# Month names and abbreviations, including "Sept"
+_MONTHS = {name.lower()[:3]: number for number, name in enumerate(calendar.month_name) if name}
+
+# Values meaning "no end date yet"
+_ONGOING = {"present", "current", "now", "ongoing"}
+
+_YEAR = re.compile(r"^(\d{4})$")
+_YEAR_MONTH = re.compile(r"^(\d{4})[-/.](\d{1,2})$")
+_MONTH_YEAR = re.compile(r"^(\d{1,2})[-/.](\d{4})$")
+_ISO_DAY = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+_NAMED_MONTH_YEAR = re.compile(r"^([a-z]+)\.?,?\s+(\d{4})$")
+_DAY_NAMED_MONTH_YEAR = re.compile(r"^(\d{1,2})\s+([a-z]+)\.?,?\s+(\d{4})$")
+_NAMED_MONTH_DAY_YEAR = re.compile(r"^([a-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})$")
+
+def _month_number(name: str) -> int:
+    if len(name) < 3 or name[:3] not in _MONTHS:
+        raise ValueError(f"Unknown month: {name!r}")
+    return _MONTHS[name[:3]]
+
+def parse_partial_date(value: str, ongoing: bool = False) -> Tuple[Optional[date], Optional[str]]:
+    """Parse "2021-03-15", "2021-03", "Mar 2021", "03/2021" or "2021" into (date, precision).
+    
+    Month and year precision dates fall on the first day of the period.
+    Empty strings parse to (None, None), and so do "Present" and the like
+    when `ongoing` is set, as for end dates. Raises ValueError for anything else.
+    """
+    text = value.strip().lower()
+    if not text:
+        return None, None
+    if text in _ONGOING:
+        if ongoing:
+            return None, None
+        raise ValueError(f"{value!r} only makes sense as an end date")
+    try:
+        if match := _YEAR.match(text):
+            return date(int(match[1]), 1, 1), "year"
+        if match := _YEAR_MONTH.match(text):
+            return date(int(match[1]), int(match[2]), 1), "month"
+        if match := _MONTH_YEAR.match(text):
+            return date(int(match[2]), int(match[1]), 1), "month"
+        if match := _ISO_DAY.match(text):
+            return date(int(match[1]), int(match[2]), int(match[3])), "day"
+        if match := _NAMED_MONTH_YEAR.match(text):
+            return date(int(match[2]), _month_number(match[1]), 1), "month"
+        if match := _DAY_NAMED_MONTH_YEAR.match(text):
+            return date(int(match[3]), _month_number(match[2]), int(match[1])), "day"
+        if match := _NAMED_MONTH_DAY_YEAR.match(text):
+            return date(int(match[3]), _month_number(match[1]), int(match[2])), "day"
+    except ValueError as e:
+        raise ValueError(f"Invalid date {value!r}: {e}") from None
+    raise ValueError(f"Unrecognized date {value!r}; use YYYY-MM-DD, YYYY-MM or YYYY")
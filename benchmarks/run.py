@@ -0,0 +1,501 @@
+"""Benchmark every v1 route in-process against a synthetic portfolio.
+
+Usage:
+    python -m benchmarks.run --projects 100 --images-per-project 6 --output results.json
+    python -m benchmarks.run --database-url postgresql://... --compare results.json
+
+Each route is driven through the ASGI app with TestClient. Latency is taken
+from a plain pass, queries per request from the X-Query-Count header of the
+query budget middleware, and peak memory from a separate tracemalloc pass so
+tracing overhead does not skew latencies. The run refuses to start while
+any route of the app, other than EXCLUDED_ROUTES, has no scenario.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.routing import compile_path
+
+from benchmarks.synthetic import PortfolioSpec, make_png, make_pdf, seed_portfolio
+
+ADMIN_USERNAME = "bench"
+ADMIN_PASSWORD = "bench-password"
+
+@dataclass
+class Scenario:
+    """One route to drive; `build` returns (path parameters, request kwargs) per call"""
+    name: str
+    method: str
+    route: str  # Path template as declared on the app
+    build: Callable[[dict], Tuple[dict, dict]] = lambda c: ({}, {})
+    admin: bool = False
+    creates: Optional[str] = None  # Record created ids under this key for the matching delete scenario
+    stream: bool = False  # Server-Sent Events: read the first message, then disconnect
+
+# Generated API documentation, not part of the portfolio API
+EXCLUDED_ROUTES = {
+    ("GET", "/openapi.json"), ("GET", "/docs"), ("GET", "/docs/oauth2-redirect"), ("GET", "/redoc"),
+}
+
+def _cycle(ctx: dict, key: str):
+    """Round-robin over generated ids of one entity type"""
+    cycles = ctx.setdefault("_cycles", {})
+    if key not in cycles:
+        cycles[key] = itertools.cycle(ctx["ids"][key])
+    return next(cycles[key])
+
+def _ids(**keys) -> Callable[[dict], Tuple[dict, dict]]:
+    """Path parameters cycling over generated ids, e.g. _ids(project_id="projects")"""
+    return lambda c: ({name: _cycle(c, key) for name, key in keys.items()}, {})
+
+def _png(ctx: dict, size: int = 4_000) -> dict:
+    return {"files": {"file": ("icon.png", make_png(ctx["rng"], size), "image/png")}}
+
+def _pdf(ctx: dict) -> dict:
+    return {"files": {"file": ("cert.pdf", make_pdf(ctx["rng"], 250_000), "application/pdf")}}
+
+def _created(ctx: dict, key: str, response) -> None:
+    if response.status_code == 200:
+        ctx.setdefault("created", {}).setdefault(key, []).append(response.json()["id"])
+
+def _pop_created(ctx: dict, key: str) -> int:
+    created = ctx.get("created", {}).get(key) or [0]
+    return created.pop()
+
+def _job(ctx: dict) -> int:
+    """A job queued by an earlier upload scenario"""
+    return ctx["rng"].choice(ctx.get("jobs") or [0])
+
+def _skill_ids(ctx: dict, count: int = 5) -> List[int]:
+    skills = ctx["ids"]["skills"]
+    return ctx["rng"].sample(skills, min(count, len(skills)))
+
+def _reuploaded(route: str, upload: Callable[[dict], dict], **keys) -> Callable[[dict], Tuple[dict, dict]]:
+    """Build for deleting a file: upload one first, outside the timed request, so there is one to delete"""
+    def build(c):
+        params, _ = _ids(**keys)(c)
+        c["client"].post(route.format(**params), headers=c["auth_headers"], **upload(c))
+        return params, {}
+    return build
+
+def _import_files(ctx: dict) -> dict:
+    """A small export to import: one skill and one project linked to it"""
+    n = next(ctx["counter"])
+    lines = [
+        {"entity": "skill", "id": 1, "data": {"name": f"Imported skill {n}", "category": "Tools",
+                                              "proficiency": 3, "years_experience": 1}},
+        {"entity": "project", "id": 1, "data": {"title": f"Imported project {n}", "description": "Imported",
+                                                "technologies": ["Python"]}, "refs": {"category_id": None}},
+        {"entity": "project_skill", "data": {"relevance_score": 5}, "refs": {"project_id": 1, "skill_id": 1}},
+    ]
+    entities = "".join(json.dumps(line) + "\n" for line in lines).encode()
+    return {"files": {"entities": ("portfolio.ndjson", entities, "application/x-ndjson")}}
+
+def _first_message(client, path: str, headers: dict):
+    """GET a Server-Sent Events stream until its first message, then disconnect.
+
+    TestClient waits for the whole body, which a stream never finishes, so
+    this speaks ASGI directly on the client's event loop.
+    """
+    import httpx
+
+    async def request():
+        start, body, done = {}, [], asyncio.Event()
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if b"".join(body).endswith(b"\n\n") or not message.get("more_body"):
+                    done.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            "client": ("testclient", 50000), "server": ("testserver", 80), "state": {},
+        }
+        await client.app(scope, receive, send)
+        return httpx.Response(start["status"], headers=start.get("headers", []), content=b"".join(body))
+
+    return client.portal.call(request)
+
+def public_scenarios() -> List[Scenario]:
+    return [
+        Scenario("health", "GET", "/health"),
+        Scenario("portfolio", "GET", "/api/v1/portfolio"),
+        Scenario("changes", "GET", "/api/v1/changes", lambda c: ({}, {"params": {"since": c["version"]}})),
+        Scenario("changes since 0", "GET", "/api/v1/changes", lambda c: ({}, {"params": {"since": 0}})),
+        Scenario("events", "GET", "/api/v1/events", stream=True),
+        Scenario("projects", "GET", "/api/v1/projects"),
+        Scenario("projects?featured", "GET", "/api/v1/projects", lambda c: ({}, {"params": {"featured": True}})),
+        Scenario("projects?category_id", "GET", "/api/v1/projects", lambda c: ({}, {"params": {"category_id": _cycle(c, "categories")}})),
+        Scenario("projects?skill_id", "GET", "/api/v1/projects", lambda c: ({}, {"params": {"skill_id": _cycle(c, "skills")}})),
+        Scenario("projects?with_case_studies", "GET", "/api/v1/projects", lambda c: ({}, {"params": {"with_case_studies": True}})),
+        Scenario("project detail", "GET", "/api/v1/projects/{project_id}", _ids(project_id="projects")),
+        Scenario("related projects", "GET", "/api/v1/projects/{project_id}/related", _ids(project_id="projects")),
+        Scenario("skills", "GET", "/api/v1/skills"),
+        Scenario("skill projects", "GET", "/api/v1/skills/{skill_id}/projects", _ids(skill_id="skills")),
+        Scenario("skill categories", "GET", "/api/v1/skills/categories"),
+        Scenario("skill stats", "GET", "/api/v1/skills/stats"),
+        Scenario("experience", "GET", "/api/v1/experience"),
+        Scenario("education", "GET", "/api/v1/education"),
+        Scenario("profile image", "GET", "/api/v1/images/profile"),
+        Scenario("skill icon", "GET", "/api/v1/images/skills/{skill_id}", _ids(skill_id="skills")),
+        Scenario("company logo", "GET", "/api/v1/images/companies/{experience_id}", _ids(experience_id="experiences")),
+        Scenario("project image", "GET", "/api/v1/images/projects/{image_id}", _ids(image_id="images")),
+        Scenario("institution logo", "GET", "/api/v1/images/institutions/{education_id}", _ids(education_id="education")),
+        Scenario("certificate", "GET", "/api/v1/documents/certificates/{education_id}", _ids(education_id="education")),
+        Scenario("skill icon bundle", "GET", "/api/v1/images/bundles/{kind}", lambda c: ({"kind": "skills"}, {})),
+        Scenario("company logo bundle", "GET", "/api/v1/images/bundles/{kind}", lambda c: ({"kind": "companies"}, {})),
+        Scenario("institution logo bundle", "GET", "/api/v1/images/bundles/{kind}", lambda c: ({"kind": "institutions"}, {})),
+    ]
+
+def admin_scenarios() -> List[Scenario]:
+    def login(c):
+        return {}, {"json": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}}
+
+    def logout(c):
+        """Revoke a fresh token, not the one the other scenarios use"""
+        token = c["client"].post("/api/v1/auth/login", **login(c)[1]).json()["access_token"]
+        return {}, {"headers": {"Authorization": f"Bearer {token}"}}
+
+    def new_skill(c):
+        return {}, {"json": {
+            "name": f"Bench skill {next(c['counter'])}", "category": "Tools",
+            "proficiency": 3, "years_experience": 1.0
+        }}
+
+    def new_experience(c):
+        return {}, {"json": {
+            "company": f"Bench company {next(c['counter'])}", "position": "Engineer",
+            "start_date": "2020-01", "description": "Created by the benchmark"
+        }}
+
+    def new_category(c):
+        return {}, {"json": {"name": f"Bench category {next(c['counter'])}"}}
+
+    def new_education(c):
+        return {}, {"json": {
+            "institution": f"Bench university {next(c['counter'])}", "degree": "BSc", "start_date": "2015"
+        }}
+
+    def new_project(c):
+        skills = c["ids"]["skills"][:5]
+        return {}, {"json": {
+            "title": f"Bench project {next(c['counter'])}", "description": "Created by the benchmark",
+            "technologies": ["Python", "FastAPI"], "skill_ids": skills
+        }}
+
+    def uploaded_image(c):
+        """An image uploaded outside the timed request, to delete"""
+        project_id = _cycle(c, "projects")
+        response = c["client"].post(
+            f"/api/v1/admin/projects/{project_id}/images", headers=c["auth_headers"],
+            files=[("files", ("shot.png", make_png(c["rng"], 150_000), "image/png"))]
+        )
+        job_id = response.json()["job_ids"][0]
+        return {"image_id": c["client"].get(f"/api/v1/admin/jobs/{job_id}", headers=c["auth_headers"]).json()["target_id"]}, {}
+
+    def batch(c):
+        projects = [_cycle(c, "projects") for _ in range(2)]
+        return {}, {"json": {"operations": [
+            *({"op": "update_project", "params": {"id": id, "data": {"description": "Updated in a batch"}}}
+              for id in projects),
+            {"op": "update_project_skills", "params": {"id": projects[0], "skill_ids": _skill_ids(c)}},
+            {"op": "update_image_caption", "params": {"id": _cycle(c, "images"), "caption": "Batched"}},
+        ]}}
+
+    scenarios = [
+        Scenario("login", "POST", "/api/v1/auth/login", login),
+        Scenario("logout", "POST", "/api/v1/auth/logout", logout),
+        Scenario("metrics", "GET", "/metrics"),
+        Scenario("admin personal-info", "GET", "/api/v1/admin/personal-info"),
+        Scenario("admin update personal-info", "PUT", "/api/v1/admin/personal-info", lambda c: ({}, {"json": {"location": "Remote"}})),
+        Scenario("admin upload profile image", "POST", "/api/v1/admin/personal-info/profile-image", lambda c: ({}, _png(c, 80_000))),
+        Scenario("admin delete profile image", "DELETE", "/api/v1/admin/personal-info/profile-image",
+                 _reuploaded("/api/v1/admin/personal-info/profile-image", lambda c: _png(c, 80_000))),
+        Scenario("admin skills", "GET", "/api/v1/admin/skills"),
+        Scenario("admin skill", "GET", "/api/v1/admin/skills/{skill_id}", _ids(skill_id="skills")),
+        Scenario("admin create skill", "POST", "/api/v1/admin/skills", new_skill, creates="skills"),
+        Scenario("admin update skill", "PUT", "/api/v1/admin/skills/{skill_id}", lambda c: ({"skill_id": _cycle(c, "skills")}, {"json": {"proficiency": 4}})),
+        Scenario("admin upload skill icon", "POST", "/api/v1/admin/skills/{skill_id}/icon", lambda c: ({"skill_id": _cycle(c, "skills")}, _png(c))),
+        Scenario("admin delete skill icon", "DELETE", "/api/v1/admin/skills/{skill_id}/icon",
+                 _reuploaded("/api/v1/admin/skills/{skill_id}/icon", _png, skill_id="skills")),
+        Scenario("admin delete skill", "DELETE", "/api/v1/admin/skills/{skill_id}", lambda c: ({"skill_id": _pop_created(c, "skills")}, {})),
+        Scenario("admin work-experiences", "GET", "/api/v1/admin/work-experiences"),
+        Scenario("admin work-experience", "GET", "/api/v1/admin/work-experiences/{experience_id}", _ids(experience_id="experiences")),
+        Scenario("admin create work-experience", "POST", "/api/v1/admin/work-experiences", new_experience, creates="experiences"),
+        Scenario("admin update work-experience", "PUT", "/api/v1/admin/work-experiences/{experience_id}", lambda c: ({"experience_id": _cycle(c, "experiences")}, {"json": {"location": "Remote"}})),
+        Scenario("admin upload company logo", "POST", "/api/v1/admin/work-experiences/{experience_id}/logo", lambda c: ({"experience_id": _cycle(c, "experiences")}, _png(c, 20_000))),
+        Scenario("admin delete company logo", "DELETE", "/api/v1/admin/work-experiences/{experience_id}/logo",
+                 _reuploaded("/api/v1/admin/work-experiences/{experience_id}/logo", lambda c: _png(c, 20_000), experience_id="experiences")),
+        Scenario("admin delete work-experience", "DELETE", "/api/v1/admin/work-experiences/{experience_id}", lambda c: ({"experience_id": _pop_created(c, "experiences")}, {})),
+        Scenario("admin education", "GET", "/api/v1/admin/education"),
+        Scenario("admin education by id", "GET", "/api/v1/admin/education/{education_id}", _ids(education_id="education")),
+        Scenario("admin create education", "POST", "/api/v1/admin/education", new_education, creates="education"),
+        Scenario("admin update education", "PUT", "/api/v1/admin/education/{education_id}", lambda c: ({"education_id": _cycle(c, "education")}, {"json": {"honors": "Cum laude"}})),
+        Scenario("admin upload institution logo", "POST", "/api/v1/admin/education/{education_id}/logo", lambda c: ({"education_id": _cycle(c, "education")}, _png(c, 20_000))),
+        Scenario("admin delete institution logo", "DELETE", "/api/v1/admin/education/{education_id}/logo",
+                 _reuploaded("/api/v1/admin/education/{education_id}/logo", lambda c: _png(c, 20_000), education_id="education")),
+        Scenario("admin upload certificate", "POST", "/api/v1/admin/education/{education_id}/certificate", lambda c: ({"education_id": _cycle(c, "education")}, _pdf(c))),
+        Scenario("admin delete certificate", "DELETE", "/api/v1/admin/education/{education_id}/certificate",
+                 _reuploaded("/api/v1/admin/education/{education_id}/certificate", _pdf, education_id="education")),
+        Scenario("admin delete education", "DELETE", "/api/v1/admin/education/{education_id}", lambda c: ({"education_id": _pop_created(c, "education")}, {})),
+        Scenario("admin categories", "GET", "/api/v1/admin/categories"),
+        Scenario("admin create category", "POST", "/api/v1/admin/categories", new_category, creates="categories"),
+        Scenario("admin update category", "PUT", "/api/v1/admin/categories/{category_id}", lambda c: ({"category_id": _cycle(c, "categories")}, {"json": {"description": "Updated"}})),
+        Scenario("admin delete category", "DELETE", "/api/v1/admin/categories/{category_id}", lambda c: ({"category_id": _pop_created(c, "categories")}, {})),
+        Scenario("admin projects", "GET", "/api/v1/admin/projects"),
+        Scenario("admin project", "GET", "/api/v1/admin/projects/{project_id:int}", _ids(project_id="projects")),
+        Scenario("admin featured projects", "GET", "/api/v1/admin/projects/featured"),
+        Scenario("admin projects by category", "GET", "/api/v1/admin/projects/category/{category_id}", _ids(category_id="categories")),
+        Scenario("admin projects by skill", "GET", "/api/v1/admin/projects/skill/{skill_id}", _ids(skill_id="skills")),
+        Scenario("admin case studies", "GET", "/api/v1/admin/projects/case-studies"),
+        Scenario("admin create project", "POST", "/api/v1/admin/projects", new_project, creates="projects"),
+        Scenario("admin update project", "PUT", "/api/v1/admin/projects/{project_id}", lambda c: ({"project_id": _cycle(c, "projects")}, {"json": {"description": "Updated by the benchmark", "skill_ids": _skill_ids(c)}})),
+        Scenario("admin assign skill", "POST", "/api/v1/admin/projects/{project_id}/skills", lambda c: ({"project_id": _cycle(c, "projects")}, {"json": {"skill_id": _cycle(c, "skills"), "relevance_score": 7}})),
+        Scenario("admin replace project skills", "PUT", "/api/v1/admin/projects/{project_id}/skills", lambda c: ({"project_id": _cycle(c, "projects")}, {"json": c["ids"]["skills"][:8]})),
+        Scenario("admin project images", "GET", "/api/v1/admin/projects/{project_id}/images", _ids(project_id="projects")),
+        Scenario("admin upload project images", "POST", "/api/v1/admin/projects/{project_id}/images", lambda c: ({"project_id": _cycle(c, "projects")}, {"files": [("files", ("shot.png", make_png(c["rng"], 150_000), "image/png"))]})),
+        Scenario("admin set main image", "PUT", "/api/v1/admin/projects/images/{image_id}/main", _ids(image_id="images")),
+        Scenario("admin update caption", "PUT", "/api/v1/admin/projects/images/{image_id}/caption", lambda c: ({"image_id": _cycle(c, "images")}, {"data": {"caption": "Updated"}})),
+        Scenario("admin delete project image", "DELETE", "/api/v1/admin/projects/images/{image_id}", uploaded_image),
+        Scenario("admin bulk featured", "PUT", "/api/v1/admin/projects/bulk/featured", lambda c: ({}, {"json": c["ids"]["projects"][:5]})),
+        Scenario("admin delete project", "DELETE", "/api/v1/admin/projects/{project_id}", lambda c: ({"project_id": _pop_created(c, "projects")}, {})),
+        Scenario("admin batch", "POST", "/api/v1/admin/batch", batch),
+        Scenario("admin job", "GET", "/api/v1/admin/jobs/{job_id}", lambda c: ({"job_id": _job(c)}, {})),
+        Scenario("admin export entities", "GET", "/api/v1/admin/export/entities.ndjson"),
+        Scenario("admin export blobs", "GET", "/api/v1/admin/export/blobs.tar"),
+        Scenario("admin import", "POST", "/api/v1/admin/import", lambda c: ({}, _import_files(c))),
+        # Catching up on every change the scenarios above made
+        Scenario("changes after admin writes", "GET", "/api/v1/changes", lambda c: ({}, {"params": {"since": c["version"]}})),
+    ]
+    for scenario in scenarios:
+        scenario.admin = scenario.name not in ("login", "logout")
+    return scenarios
+
+def route_coverage(app, scenarios: List[Scenario]) -> Tuple[set, set]:
+    """(method, path) of app routes no scenario drives, and of scenario routes the app lacks"""
+    routes = {
+        (method, route.path)
+        for route in app.routes for method in getattr(route, "methods", None) or () if method != "HEAD"
+    }
+    driven = {(scenario.method, scenario.route) for scenario in scenarios}
+    return routes - EXCLUDED_ROUTES - driven, driven - routes
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+def run_scenario(client, scenario: Scenario, ctx: dict, iterations: int, warmup: int, memory_iterations: int) -> dict:
+    headers = ctx["auth_headers"] if scenario.admin else {}
+    path_format = compile_path(scenario.route)[1]  # Drops convertors like {id:int}
+
+    def prepare() -> Tuple[str, dict]:
+        """Path and kwargs of one request; not timed, so uploads and fixtures don't count"""
+        params, kwargs = scenario.build(ctx)
+        kwargs["headers"] = {**headers, **kwargs.get("headers", {})}
+        return path_format.format(**params), kwargs
+
+    def send(path: str, kwargs: dict):
+        if scenario.stream:
+            response = _first_message(client, path, kwargs["headers"])
+        else:
+            response = client.request(scenario.method, path, **kwargs)
+        if scenario.creates:
+            _created(ctx, scenario.creates, response)
+        if response.status_code == 202:
+            ctx.setdefault("jobs", []).extend(response.json()["job_ids"])
+        return response
+
+    for _ in range(warmup):
+        send(*prepare())
+
+    latencies, queries, statuses = [], [], {}
+    for _ in range(iterations):
+        request = prepare()
+        start = time.perf_counter()
+        response = send(*request)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if "x-query-count" in response.headers:
+            queries.append(int(response.headers["x-query-count"]))
+
+    tracemalloc.start()
+    for _ in range(memory_iterations):
+        request = prepare()
+        tracemalloc.reset_peak()
+        send(*request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": scenario.name,
+        "method": scenario.method,
+        "iterations": iterations,
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "errors": sum(n for code, n in statuses.items() if code >= 400),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+            "max": round(max(latencies), 3),
+        },
+        "queries": {
+            "mean": round(statistics.fmean(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print p50 latency and query count deltas against a previous run"""
+    with open(baseline_path) as fh:
+        baseline = {r["name"]: r for r in json.load(fh)["results"]}
+
+    print(f"\n{'route':40} {'p50 ms':>10} {'delta':>9} {'queries':>8} {'delta':>7}")
+    for result in results["results"]:
+        before = baseline.get(result["name"])
+        p50 = result["latency_ms"]["p50"]
+        queries = result["queries"]["mean"]
+        p50_delta = q_delta = "new"
+        if before is not None:
+            base_p50 = before["latency_ms"]["p50"]
+            p50_delta = f"{(p50 - base_p50) / base_p50 * 100:+.1f}%" if base_p50 else "-"
+            base_queries = before["queries"]["mean"]
+            q_delta = f"{queries - base_queries:+g}" if None not in (queries, base_queries) else "-"
+        print(f"{result['name']:40} {p50:>10.2f} {p50_delta:>9} {str(queries):>8} {q_delta:>7}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--memory-iterations", type=int, default=5)
+    parser.add_argument("--only", help="Substring filter on scenario names")
+    parser.add_argument("--skip-admin", action="store_true", help="Only drive public routes")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write JSON results")
+    parser.add_argument("--compare", help="Previous results file to diff against")
+    for field in fields(PortfolioSpec):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=field.type, default=field.default)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    spec = PortfolioSpec(**{field.name: getattr(args, field.name) for field in fields(PortfolioSpec)})
+
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.mkdtemp(prefix="portfolio-bench-")
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    # Settings are read at import time, so configure the app before importing it
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["ENVIRONMENT"] = "benchmark"
+    os.environ["QUERY_BUDGET_MODE"] = "log"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    logging.getLogger("app.core.query_budget").setLevel(logging.ERROR)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.config.database import SessionLocal, init_db
+    from app.schemas import AdminCreate
+    from app.services import admin_service
+
+    init_db()
+    db = SessionLocal()
+    try:
+        ids = seed_portfolio(db, spec)
+        admin_service.create(db, AdminCreate(username=ADMIN_USERNAME, password=ADMIN_PASSWORD))
+    finally:
+        db.close()
+
+    scenarios = public_scenarios() + admin_scenarios()
+    undriven, unknown = route_coverage(app, scenarios)
+    if undriven or unknown:
+        raise SystemExit(f"Scenarios are out of step with the app; undriven: {sorted(undriven)}, unknown: {sorted(unknown)}")
+    if args.skip_admin:
+        scenarios = public_scenarios()
+    if args.only:
+        scenarios = [s for s in scenarios if args.only in s.name]
+
+    # Entered, so the lifespan starts the job queue and the change notifier as a server would
+    with TestClient(app, raise_server_exceptions=False) as client:
+        token = client.post("/api/v1/auth/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}).json()["access_token"]
+        ctx: Dict = {
+            "client": client,
+            "ids": ids,
+            "version": client.get("/api/v1/portfolio").json()["version"],  # Portfolio version once seeded
+            "rng": random.Random(spec.seed),
+            "counter": itertools.count(),
+            "auth_headers": {"Authorization": f"Bearer {token}"},
+        }
+
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(client, scenario, ctx, args.iterations, args.warmup, args.memory_iterations)
+            results.append(result)
+            print(
+                f"{result['name']:40} p50={result['latency_ms']['p50']:8.2f}ms "
+                f"p99={result['latency_ms']['p99']:8.2f}ms queries={result['queries']['mean']} "
+                f"peak={result['peak_memory_kb']:9.1f}KB errors={result['errors']}"
+            )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": database_url.split("://")[0],
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "spec": spec.to_dict(),
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return report
+
+if __name__ == "__main__":
+    main()
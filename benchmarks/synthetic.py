@@ -0,0 +1,201 @@
+"""Synthetic portfolio generator for benchmarks.
+
+Seeds any SQLAlchemy database with a deterministic portfolio whose shape
+(number of projects, images per project, blob sizes, skill density...) is
+described by a `PortfolioSpec`.
+"""
+import random
+from datetime import date
+import struct
+import zlib
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models import (
+    PersonalInfo, Skill, WorkExperience, Project, ProjectImage,
+    ProjectCategory, Education, project_skills
+)
+from app.utils.constants import (
+    SKILL_CATEGORIES, PROJECT_STATUS_OPTIONS, DEGREE_LEVELS
+)
+
+TECHNOLOGIES = [
+    "Python", "FastAPI", "PostgreSQL", "React", "TypeScript", "Docker",
+    "Redis", "Kubernetes", "Go", "Rust", "GraphQL", "Terraform", "AWS",
+    "Celery", "Django", "Vue", "Node.js", "SQLite", "Nginx", "Kafka"
+]
+
+@dataclass
+class PortfolioSpec:
+    """Shape of the generated portfolio. Blob sizes are means in bytes."""
+    projects: int = 50
+    images_per_project: int = 4
+    image_size: int = 150_000
+    skills: int = 40
+    skill_density: float = 0.2  # Fraction of skills linked to each project
+    technologies_per_project: int = 5
+    categories: int = 6
+    experiences: int = 8
+    education: int = 6
+    icon_size: int = 4_000
+    logo_size: int = 20_000
+    certificate_size: int = 250_000
+    profile_image_size: int = 80_000
+    seed: int = 1
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+def make_png(rng: random.Random, size: int) -> bytes:
+    """Bytes that sniff as PNG, padded with noise to roughly `size`"""
+    ihdr = struct.pack(">IIBBBBB", 64, 64, 8, 6, 0, 0, 0)
+    chunk = struct.pack(">I", 13) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    header = b"\x89PNG\r\n\x1a\n" + chunk
+    return header + rng.randbytes(max(size - len(header), 0))
+
+def make_pdf(rng: random.Random, size: int) -> bytes:
+    """Bytes that sniff as PDF, padded with noise to roughly `size`"""
+    header, trailer = b"%PDF-1.4\n", b"\n%%EOF\n"
+    return header + rng.randbytes(max(size - len(header) - len(trailer), 0)) + trailer
+
+def _jitter(rng: random.Random, mean: int) -> int:
+    """Vary a blob size by +/-50% around its mean"""
+    return max(int(mean * rng.uniform(0.5, 1.5)), 64)
+
+def _month(rng: random.Random, start_year: int = 2012, end_year: int = 2025) -> date:
+    return date(rng.randint(start_year, end_year), rng.randint(1, 12), 1)
+
+def seed_portfolio(db: Session, spec: PortfolioSpec) -> Dict[str, List[int]]:
+    """Insert a synthetic portfolio and return the generated ids per entity"""
+    rng = random.Random(spec.seed)
+
+    db.add(PersonalInfo(
+        full_name="Bench Mark",
+        title="Software Engineer",
+        bio="Synthetic portfolio used for benchmarking. " * 10,
+        email="bench@example.com",
+        location="Nairobi",
+        profile_image=make_png(rng, _jitter(rng, spec.profile_image_size)),
+        profile_image_type="image/png"
+    ))
+
+    categories = [
+        ProjectCategory(name=f"Category {i}", description=f"Synthetic category {i}")
+        for i in range(spec.categories)
+    ]
+    skills = [
+        Skill(
+            name=f"Skill {i}",
+            category=rng.choice(SKILL_CATEGORIES),
+            proficiency=rng.randint(1, 5),
+            years_experience=round(rng.uniform(0, 10), 1),
+            icon_data=make_png(rng, _jitter(rng, spec.icon_size)),
+            icon_type="image/png"
+        )
+        for i in range(spec.skills)
+    ]
+    experiences = [
+        WorkExperience(
+            company=f"Company {i}",
+            position="Engineer",
+            start_date=_month(rng),
+            start_date_precision="month",
+            end_date=None if i == 0 else _month(rng),
+            end_date_precision=None if i == 0 else "month",
+            description="Built and operated production systems. " * 8,
+            achievements="Shipped things. " * 5,
+            location="Remote",
+            is_current=i == 0,
+            company_logo=make_png(rng, _jitter(rng, spec.logo_size)),
+            company_logo_type="image/png"
+        )
+        for i in range(spec.experiences)
+    ]
+    education = [
+        Education(
+            institution=f"Institution {i}",
+            degree=f"Degree {i}",
+            field_of_study="Computer Science",
+            education_type="certification" if i % 2 else "degree",
+            degree_level=rng.choice(DEGREE_LEVELS),
+            start_date=_month(rng),
+            start_date_precision="month",
+            end_date=None if i == 0 else _month(rng),
+            end_date_precision=None if i == 0 else "month",
+            is_current=i == 0,
+            is_certification=bool(i % 2),
+            institution_logo=make_png(rng, _jitter(rng, spec.logo_size)),
+            institution_logo_type="image/png",
+            certificate_data=make_pdf(rng, _jitter(rng, spec.certificate_size)),
+            certificate_type="application/pdf"
+        )
+        for i in range(spec.education)
+    ]
+    db.add_all(categories + skills + experiences + education)
+    db.flush()
+
+    projects = []
+    for i in range(spec.projects):
+        has_story = rng.random() < 0.5
+        projects.append(Project(
+            title=f"Project {i}",
+            description="A synthetic project. " * 6,
+            detailed_description="Longer write-up of the project. " * 40,
+            technologies=", ".join(rng.sample(TECHNOLOGIES, min(spec.technologies_per_project, len(TECHNOLOGIES)))),
+            category_id=rng.choice(categories).id if categories else None,
+            difficulty_level=rng.randint(1, 5),
+            status=rng.choice(PROJECT_STATUS_OPTIONS),
+            is_deployed=rng.random() < 0.5,
+            start_date=_month(rng),
+            start_date_precision="month",
+            end_date=_month(rng),
+            end_date_precision="month",
+            featured=rng.random() < 0.2,
+            problem_statement="The problem. " * 20 if has_story else None,
+            solution_approach="The approach. " * 20 if has_story else None,
+            key_challenges="Challenges. " * 10,
+            lessons_learned="Lessons. " * 10,
+            results_achieved="Results. " * 10
+        ))
+    db.add_all(projects)
+    db.flush()
+
+    images = []
+    for project in projects:
+        for j in range(spec.images_per_project):
+            images.append(ProjectImage(
+                project_id=project.id,
+                caption=f"Screenshot {j}",
+                is_main=j == 0,
+                image_data=make_png(rng, _jitter(rng, spec.image_size)),
+                image_type="image/png"
+            ))
+    db.add_all(images)
+    db.flush()
+
+    per_project = max(int(round(spec.skills * spec.skill_density)), 1) if skills else 0
+    links = [
+        {"project_id": project.id, "skill_id": skill.id, "relevance_score": rng.randint(1, 10)}
+        for project in projects
+        for skill in rng.sample(skills, min(per_project, len(skills)))
+    ]
+    if links:
+        db.execute(project_skills.insert(), links)
+
+    # Imported here: the services read settings, which callers configure first
+    from app.services.project import project_card_service, skill_ranking_service
+    project_card_service.rebuild(db)
+    skill_ranking_service.rebuild(db)
+
+    ids = {
+        "categories": [c.id for c in categories],
+        "skills": [s.id for s in skills],
+        "experiences": [e.id for e in experiences],
+        "education": [e.id for e in education],
+        "projects": [p.id for p in projects],
+        "images": [i.id for i in images],
+    }
+    db.commit()
+    return ids
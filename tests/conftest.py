@@ -0,0 +1,63 @@
+"""Shared fixtures: one seeded SQLite database for the session and a client for the app.
+
+Settings are read when the app is imported, so the environment is set here
+first. Query budgets run in "raise" mode: a route that overruns its budget
+fails the request with a 500.
+"""
+import os
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="portfolio-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_tmpdir, 'test.db')}",
+    SECRET_KEY="test-secret",
+    ENVIRONMENT="test",
+    QUERY_BUDGET_MODE="raise",
+    RATE_LIMIT_ENABLED="false",
+    BCRYPT_ROUNDS="4",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import PortfolioSpec, seed_portfolio
+
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "test-password"
+
+# Small enough to seed quickly, large enough that N+1 queries show up as repeats
+TEST_SPEC = PortfolioSpec(
+    projects=12, images_per_project=2, image_size=2_000, skills=10, categories=3,
+    experiences=3, education=4, icon_size=500, logo_size=500, certificate_size=2_000,
+    profile_image_size=2_000
+)
+
+@pytest.fixture(scope="session")
+def ids():
+    """Generated ids per entity of the seeded portfolio"""
+    from app.config.database import SessionLocal, init_db
+    from app.schemas import AdminCreate
+    from app.services import admin_service
+
+    init_db()
+    db = SessionLocal()
+    try:
+        ids = seed_portfolio(db, TEST_SPEC)
+        admin_service.create(db, AdminCreate(username=ADMIN_USERNAME, password=ADMIN_PASSWORD))
+    finally:
+        db.close()
+    return ids
+
+@pytest.fixture(scope="session")
+def client(ids):
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/api/v1/auth/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def query_count(response) -> int:
+    return int(response.headers["x-query-count"])
@@ -0,0 +1,42 @@
+from app.core import security
+from app.core.security import TokenCache, token_cache
+from tests.conftest import ADMIN_PASSWORD, ADMIN_USERNAME, query_count
+
+def _login(client) -> dict:
+    response = client.post("/api/v1/auth/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def _token(headers: dict) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+def test_logout_revokes_token(client):
+    headers = _login(client)
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 200
+    assert query_count(response) <= 3
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 401
+
+def test_logout_applies_to_workers_that_never_saw_it(client):
+    headers = _login(client)
+    client.post("/api/v1/auth/logout", headers=headers)
+
+    # Another worker: the token isn't cached and its local revocations are empty
+    token_cache.clear()
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 401
+
+def test_logout_applies_to_workers_with_the_token_cached(client, monkeypatch):
+    headers = _login(client)
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 200
+    digest = TokenCache.digest(_token(headers))
+    claims = token_cache.get(digest)
+
+    client.post("/api/v1/auth/logout", headers=headers)
+
+    # Another worker that verified the token before the logout
+    token_cache.clear()
+    token_cache.put(digest, claims)
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 200
+    monkeypatch.setattr(security.settings, "token_revocation_check_seconds", 0)
+    assert client.get("/api/v1/admin/skills", headers=headers).status_code == 401
@@ -0,0 +1,103 @@
+import io
+import json
+import tarfile
+from collections import Counter
+from sqlalchemy import create_engine, func
+from app.config.database import SessionLocal
+from app.config.settings import get_settings
+from app.models import (
+    Base, Education, PersonalInfo, Project, ProjectCard, ProjectCategory, ProjectImage, Skill, WorkExperience,
+    project_skills
+)
+from app.services import backup_service
+
+def _ndjson(*lines) -> bytes:
+    return "".join(json.dumps(line) + "\n" for line in lines).encode()
+
+def test_exports_stream_every_row(client, admin_headers, ids):
+    response = client.get("/api/v1/admin/export/entities.ndjson", headers=admin_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.content.splitlines()]
+    assert len([line for line in lines if line["entity"] == "project"]) >= len(ids["projects"])
+
+    response = client.get("/api/v1/admin/export/blobs.tar", headers=admin_headers)
+    assert response.status_code == 200
+    with tarfile.open(fileobj=io.BytesIO(response.content)) as archive:
+        assert len(archive.getmembers()) > 0
+
+def test_import_rejects_a_duplicate_project_skill(client, admin_headers):
+    link = {"entity": "project_skill", "data": {"relevance_score": 3}, "refs": {"project_id": 1, "skill_id": 1}}
+    entities = _ndjson(
+        {"entity": "skill", "id": 1, "data": {"name": "Imported", "category": "Tools", "proficiency": 3,
+                                              "years_experience": 1}},
+        {"entity": "project", "id": 1, "data": {"title": "Imported", "description": "Imported",
+                                                "technologies": ["Python"]}, "refs": {"category_id": None}},
+        link,
+        link,
+    )
+    response = client.post(
+        "/api/v1/admin/import", files={"entities": ("portfolio.ndjson", entities)}, headers=admin_headers
+    )
+    assert response.status_code == 400
+    assert "Line 4" in response.json()["detail"]
+
+def _snapshot(db) -> dict:
+    """Rows per entity, keyed by content since ids change on import"""
+    projects = {id: (title, description) for id, title, description in db.query(Project.id, Project.title, Project.description)}
+    skills = dict(db.query(Skill.id, Skill.name))
+    return {
+        "personal_info": db.query(PersonalInfo.full_name, func.length(PersonalInfo.profile_image)).all(),
+        "categories": Counter(name for (name,) in db.query(ProjectCategory.name)),
+        "skills": Counter(skills.values()),
+        "experiences": Counter(db.query(WorkExperience.company, WorkExperience.start_date, func.length(WorkExperience.company_logo))),
+        "education": Counter(db.query(Education.institution, Education.end_date, func.length(Education.certificate_data))),
+        "projects": Counter(
+            (projects[id], name) for id, name in
+            db.query(Project.id, ProjectCategory.name).outerjoin(ProjectCategory, Project.category_id == ProjectCategory.id)
+        ),
+        "project_skills": Counter(
+            (projects[project_id], skills[skill_id], score) for project_id, skill_id, score in
+            db.query(project_skills.c.project_id, project_skills.c.skill_id, project_skills.c.relevance_score)
+        ),
+        "project_images": Counter(
+            (projects[project_id], caption, is_main, size) for project_id, caption, is_main, size in
+            db.query(ProjectImage.project_id, ProjectImage.caption, ProjectImage.is_main, func.length(ProjectImage.image_data))
+        ),
+        "project_cards": db.query(ProjectCard).count(),
+    }
+
+def test_an_export_imports_into_an_empty_database(client, admin_headers, ids, tmp_path):
+    entities = client.get("/api/v1/admin/export/entities.ndjson", headers=admin_headers).content
+    blobs = client.get("/api/v1/admin/export/blobs.tar", headers=admin_headers).content
+    engine = create_engine(f"sqlite:///{tmp_path / 'restored.db'}")
+    Base.metadata.create_all(engine)
+
+    source, restored = SessionLocal(), SessionLocal(bind=engine)
+    try:
+        counts = backup_service.import_portfolio(restored, io.BytesIO(entities), io.BytesIO(blobs))
+        assert counts["project"] == source.query(Project).count()
+        assert _snapshot(restored) == _snapshot(source)
+    finally:
+        source.close()
+        restored.close()
+        engine.dispose()
+
+def test_a_failed_import_leaves_nothing_behind(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "import_batch_size", 1)  # The skills go in before the failing line
+    skills = [
+        {"entity": "skill", "id": n, "data": {"name": f"Rolled back {n}", "category": "Tools", "proficiency": 3,
+                                              "years_experience": 1}}
+        for n in (1, 2)
+    ]
+    entities = _ndjson(*skills, {"entity": "project_skill", "refs": {"project_id": 99, "skill_id": 1}})
+    response = client.post(
+        "/api/v1/admin/import", files={"entities": ("portfolio.ndjson", entities)}, headers=admin_headers
+    )
+    assert response.status_code == 400
+    assert "Line 3" in response.json()["detail"]
+
+    db = SessionLocal()
+    try:
+        assert db.query(Skill).filter(Skill.name.like("Rolled back%")).count() == 0
+    finally:
+        db.close()
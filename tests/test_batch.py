@@ -0,0 +1,35 @@
+from app.config.database import SessionLocal
+from app.models import Skill
+from app.services.changes import change_log_service
+
+def _skill(name: str) -> dict:
+    return {"op": "create_skill", "params": {"data": {
+        "name": name, "category": "Tools", "proficiency": 3, "years_experience": 1
+    }}}
+
+def _skill_names() -> set:
+    db = SessionLocal()
+    try:
+        return {name for (name,) in db.query(Skill.name)}
+    finally:
+        db.close()
+
+def test_batch_commits_once(client, admin_headers, monkeypatch):
+    commits = []
+    callbacks = change_log_service._commit_callbacks + [commits.append]
+    monkeypatch.setattr(change_log_service, "_commit_callbacks", callbacks)
+
+    response = client.post("/api/v1/admin/batch", json={"operations": [
+        _skill("Batch A"), _skill("Batch B")
+    ]}, headers=admin_headers)
+    assert response.status_code == 200
+    assert {"Batch A", "Batch B"} <= _skill_names()
+    assert len(commits) == 1 and len(commits[0]) == 2
+
+def test_failed_operation_rolls_back_the_batch(client, admin_headers):
+    response = client.post("/api/v1/admin/batch", json={"operations": [
+        _skill("Rolled Back"), {"op": "delete_skill", "params": {"id": 999_999}}
+    ]}, headers=admin_headers)
+    assert response.status_code == 404
+    assert "Operation 1" in response.json()["detail"]
+    assert "Rolled Back" not in _skill_names()
@@ -0,0 +1,7 @@
+from benchmarks.run import admin_scenarios, public_scenarios, route_coverage
+
+def test_benchmark_drives_every_route():
+    from app.main import app
+    undriven, unknown = route_coverage(app, public_scenarios() + admin_scenarios())
+    assert undriven == set()
+    assert unknown == set()
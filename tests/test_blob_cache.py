@@ -0,0 +1,63 @@
+import hashlib
+import os
+import pytest
+from app.config.database import SessionLocal
+from app.config.settings import get_settings
+from app.models import ProjectImage
+from app.services import blob_cache_service
+
+@pytest.fixture
+def blob_dir(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "blob_cache_dir", str(tmp_path))
+    monkeypatch.setattr(blob_cache_service, "_size", None)  # Scanned again for the new directory
+    return tmp_path
+
+def _image(image_id: int) -> bytes:
+    db = SessionLocal()
+    try:
+        return db.get(ProjectImage, image_id).image_data
+    finally:
+        db.close()
+
+def _cached_path(blob_dir, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    return os.path.join(blob_dir, digest[:2], digest)
+
+def _disk_bytes(blob_dir) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(blob_dir) for name in names)
+
+def test_least_recently_served_files_are_evicted(client, ids, blob_dir, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "blob_cache_max_bytes", 3 * len(_image(ids["images"][0])))
+    monkeypatch.setattr(settings, "blob_cache_pin_seconds", 0)
+
+    first, *rest = ids["images"][:6]
+    for image_id in [first, *rest]:
+        response = client.get(f"/api/v1/images/projects/{image_id}")
+        assert response.status_code == 200
+    assert _disk_bytes(blob_dir) <= settings.blob_cache_max_bytes
+    assert not os.path.exists(_cached_path(blob_dir, _image(first)))
+
+    # Served again from the database, and cached again
+    response = client.get(f"/api/v1/images/projects/{first}")
+    assert response.status_code == 200
+    assert response.content == _image(first)
+    assert os.path.exists(_cached_path(blob_dir, _image(first)))
+
+def test_a_file_just_looked_up_is_not_evicted(ids, blob_dir, monkeypatch):
+    settings = get_settings()
+    image_id = ids["images"][0]
+    db = SessionLocal()
+    try:
+        blob = blob_cache_service.get(db, "project_image", image_id)
+    finally:
+        db.close()
+
+    monkeypatch.setattr(settings, "blob_cache_max_bytes", 0)
+    blob_cache_service._evict()
+    assert os.path.exists(blob.path)
+
+    monkeypatch.setattr(settings, "blob_cache_pin_seconds", 0)
+    blob_cache_service._evict()
+    assert not os.path.exists(blob.path)
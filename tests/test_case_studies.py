@@ -0,0 +1,18 @@
+import pytest
+
+@pytest.mark.parametrize("problem_statement, has_case_study", [("", False), (None, False), ("Slow builds", True)])
+def test_cards_and_filters_agree_on_case_studies(client, admin_headers, problem_statement, has_case_study):
+    response = client.post("/api/v1/admin/projects", json={
+        "title": "Case study", "description": "d", "technologies": ["Python"],
+        "problem_statement": problem_statement, "solution_approach": "Cache the dependencies"
+    }, headers=admin_headers)
+    project_id = response.json()["id"]
+    try:
+        cards = {card["id"]: card for card in client.get("/api/v1/projects").json()}
+        assert cards[project_id]["has_case_study"] is has_case_study
+        public = client.get("/api/v1/projects", params={"with_case_studies": True}).json()
+        assert (project_id in {card["id"] for card in public}) is has_case_study
+        admin = client.get("/api/v1/admin/projects/case-studies", headers=admin_headers).json()
+        assert (project_id in {project["id"] for project in admin}) is has_case_study
+    finally:
+        client.delete(f"/api/v1/admin/projects/{project_id}", headers=admin_headers)
@@ -0,0 +1,103 @@
+from sqlalchemy import select
+from app.config.database import SessionLocal
+from app.models import ChangeLog, PortfolioVersion, ProjectCategory, Skill, project_skills
+from app.models.project import Project
+from app.services.changes import change_log_service
+from app.services.events import change_notifier
+
+def _version() -> int:
+    db = SessionLocal()
+    try:
+        return change_log_service.get_version(db)
+    finally:
+        db.close()
+
+def _changed_projects(client, since: int) -> set:
+    changes = client.get("/api/v1/changes", params={"since": since}).json()
+    return {project["id"] for project in changes["upserted"]["project"]}
+
+def test_a_transaction_takes_one_version():
+    before = _version()
+    db = SessionLocal()
+    try:
+        db.add(ProjectCategory(name="Versioned A"))
+        db.flush()
+        db.add(ProjectCategory(name="Versioned B"))
+        db.commit()
+        versions = db.scalars(select(ChangeLog.version).where(ChangeLog.version > before)).all()
+        assert versions == [before + 1, before + 1]
+        assert db.get(PortfolioVersion, 1).version == before + 1
+    finally:
+        db.close()
+
+def test_renaming_a_skill_upserts_the_projects_showing_it(client, admin_headers, ids):
+    skill_id = ids["skills"][1]
+    db = SessionLocal()
+    try:
+        linked = set(db.scalars(select(project_skills.c.project_id).where(project_skills.c.skill_id == skill_id)))
+    finally:
+        db.close()
+    assert linked
+
+    since = _version()
+    response = client.put(f"/api/v1/admin/skills/{skill_id}", json={"name": "Renamed skill"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert _changed_projects(client, since) == linked
+
+def test_deleting_a_category_upserts_its_projects(client, admin_headers):
+    db = SessionLocal()
+    try:
+        category = ProjectCategory(name="Short lived")
+        db.add(category)
+        db.flush()
+        project = Project(title="Categorized", description="d", technologies="Python", category_id=category.id)
+        db.add(project)
+        db.commit()
+        category_id, project_id = category.id, project.id
+    finally:
+        db.close()
+
+    since = _version()
+    response = client.delete(f"/api/v1/admin/categories/{category_id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert project_id in _changed_projects(client, since)
+
+def test_events_publish_whole_versions(monkeypatch):
+    from app.services import events
+
+    since = _version()
+    db = SessionLocal()
+    try:
+        for name in ("Event A", "Event B"):
+            db.add(Skill(name=name, category="Tools", proficiency=3, years_experience=1))
+        db.commit()
+        db.add(Skill(name="Event C", category="Tools", proficiency=3, years_experience=1))
+        db.commit()
+    finally:
+        db.close()
+
+    # A limit inside the second version holds that version back for the next read
+    monkeypatch.setattr(events.settings, "events_buffer_size", 2)
+    published, more = change_notifier._read_since(since)
+    assert [(event.id, event.resumable) for event in published] == [(since + 1, False), (since + 1, True)]
+    assert more
+    published, _ = change_notifier._read_since(since + 1)
+    assert [event.id for event in published] == [since + 2]
+
+def test_only_commits_that_log_changes_wake_the_notifier(monkeypatch):
+    woken = []
+    monkeypatch.setattr(change_notifier, "notify", lambda: woken.append(1))
+    db = SessionLocal()
+    try:
+        db.query(Skill).first()
+        db.commit()
+        db.add(Skill(name="Rolled back", category="Tools", proficiency=3, years_experience=1))
+        db.flush()
+        db.rollback()
+        assert woken == []
+
+        db.add(Skill(name="Notified", category="Tools", proficiency=3, years_experience=1))
+        db.commit()
+        assert woken == [1]
+    finally:
+        db.close()
@@ -0,0 +1,24 @@
+def test_sparse_project_list_is_a_subset_of_the_cards(client, ids):
+    cards = client.get("/api/v1/projects").json()
+    for fields in ("category_name", "title", "skills,has_case_study,main_image_id"):
+        response = client.get("/api/v1/projects", params={"fields": fields})
+        assert response.status_code == 200
+        names = ["id"] + fields.split(",")
+        assert response.json() == [{name: card[name] for name in names} for card in cards]
+
+def test_sparse_project_list_keeps_the_filters(client, ids):
+    skill_id = ids["skills"][0]
+    cards = client.get("/api/v1/projects", params={"skill_id": skill_id}).json()
+    response = client.get("/api/v1/projects", params={"skill_id": skill_id, "fields": "title"})
+    assert response.json() == [{"id": card["id"], "title": card["title"]} for card in cards]
+
+def test_project_list_refuses_project_only_fields(client):
+    for params in ({"fields": "problem_statement"}, {"include": "skills"}):
+        response = client.get("/api/v1/projects", params=params)
+        assert response.status_code == 400
+
+def test_project_detail_still_takes_project_fields(client, ids):
+    project_id = ids["projects"][0]
+    response = client.get(f"/api/v1/projects/{project_id}", params={"fields": "title", "include": "skills"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"id", "title", "skills"}
@@ -0,0 +1,78 @@
+import io
+from datetime import datetime, timedelta
+import pytest
+from app.config.database import SessionLocal
+from app.models import Job, MediaVariant, Skill
+from app.services.job import job_service
+
+def _png(size: int) -> bytes:
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(output, format="PNG")
+    return output.getvalue()
+
+def _add_job(db, **values) -> Job:
+    job = Job(kind="skill_icon", target_id=0, **values)
+    db.add(job)
+    db.commit()
+    return job
+
+def test_a_job_is_claimed_once():
+    db, other = SessionLocal(), SessionLocal()
+    try:
+        job = _add_job(db)
+        assert job_service.claim(db, job.id) is not None
+        assert job_service.claim(other, job.id) is None
+        db.refresh(job)
+        assert (job.status, job.attempts) == ("running", 1)
+    finally:
+        db.close()
+        other.close()
+
+def test_running_jobs_are_recovered_only_after_their_lease(monkeypatch):
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        held = _add_job(db, status="running", lease_expires_at=now + timedelta(minutes=5))
+        abandoned = _add_job(db, status="running", lease_expires_at=now - timedelta(minutes=5))
+        done = _add_job(db, status="succeeded")
+
+        submitted = []
+        monkeypatch.setattr(job_service.queue, "submit", submitted.append)
+        job_service.recover()
+        assert abandoned.id in submitted
+        assert held.id not in submitted and done.id not in submitted
+
+        assert job_service.claim(db, held.id) is None
+        assert job_service.claim(db, abandoned.id) is not None
+    finally:
+        db.close()
+
+def test_processing_keeps_the_upload_and_serves_the_variant(client, ids):
+    pytest.importorskip("PIL")
+    skill_id = ids["skills"][-1]
+    original = _png(256)
+    db = SessionLocal()
+    try:
+        skill = db.get(Skill, skill_id)
+        skill.icon_data, skill.icon_type = original, "image/png"
+        job = _add_job(db)
+        job.target_id = skill_id
+        db.commit()
+
+        job_service.run(job.id)
+        db.expire_all()
+        assert db.get(Job, job.id).status == "succeeded"
+        assert db.get(Skill, skill_id).icon_data == original
+        served = client.get(f"/api/v1/images/skills/{skill_id}").content
+        assert len(served) < len(original)
+
+        # A new upload makes the variant stale
+        skill = db.get(Skill, skill_id)
+        skill.icon_data = _png(32)
+        db.commit()
+        assert db.get(MediaVariant, ("skill_icon", skill_id)) is None
+        assert client.get(f"/api/v1/images/skills/{skill_id}").content == skill.icon_data
+    finally:
+        db.close()
@@ -0,0 +1,25 @@
+import pytest
+
+@pytest.mark.parametrize("start_date", ["present", "Current", "", None])
+def test_start_date_cannot_be_cleared(client, ids, admin_headers, start_date):
+    for path in (f"/api/v1/admin/work-experiences/{ids['experiences'][0]}", f"/api/v1/admin/education/{ids['education'][0]}"):
+        response = client.put(path, json={"start_date": start_date}, headers=admin_headers)
+        assert response.status_code == 422
+
+def test_start_date_precision_cannot_be_cleared(client, ids, admin_headers):
+    path = f"/api/v1/admin/work-experiences/{ids['experiences'][0]}"
+    response = client.put(path, json={"start_date_precision": None}, headers=admin_headers)
+    assert response.status_code == 422
+
+def test_end_date_takes_present(client, ids, admin_headers):
+    path = f"/api/v1/admin/education/{ids['education'][1]}"
+    response = client.put(path, json={"start_date": "Sep 2019", "end_date": "present"}, headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["start_date"], body["start_date_precision"]) == ("2019-09-01", "month")
+    assert (body["end_date"], body["end_date_precision"]) == (None, None)
+
+def test_project_start_date_stays_optional(client, ids, admin_headers):
+    path = f"/api/v1/admin/projects/{ids['projects'][1]}"
+    assert client.put(path, json={"start_date": None}, headers=admin_headers).status_code == 200
+    assert client.put(path, json={"start_date": "present"}, headers=admin_headers).status_code == 422
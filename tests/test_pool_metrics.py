@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import exc, text
+
+from app.config import database
+from app.config.database import SessionLocal
+from app.config.settings import PoolProfile
+
+def test_metrics_requires_admin(client, admin_headers):
+    assert client.get("/metrics").status_code == 403
+
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    primary = response.json()["database_pools"]["primary"]
+    assert primary["checkouts"] > 0
+    assert primary["peak_checked_out"] >= 1
+    assert primary["max_overflow"] == database.settings.active_pool_profile.max_overflow
+
+def test_pool_events_record_checkouts_waits_and_timeouts(tmp_path, monkeypatch):
+    profile = PoolProfile(pool_size=1, max_overflow=0, pool_timeout=0.1, pre_ping="never")
+    monkeypatch.setitem(database.settings.pool_profiles, "tiny", profile)
+    monkeypatch.setattr(database.settings, "pool_profile", "tiny")
+    engine = database._create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    metrics = database._pool_metrics[engine]
+
+    db = SessionLocal(bind=engine)
+    db.execute(text("SELECT 1"))
+    snapshot = metrics.snapshot(engine.pool)
+    assert (snapshot["checkouts"], snapshot["connects"], snapshot["checked_out"]) == (1, 1, 1)
+    assert metrics.waits == 1
+
+    # The only connection is held by `db`, so a second session times out
+    other = SessionLocal(bind=engine)
+    with pytest.raises(exc.TimeoutError):
+        other.execute(text("SELECT 1"))
+    assert metrics.timeouts == 1
+
+    other.close()
+    db.close()
+    assert metrics.snapshot(engine.pool)["checked_out"] == 0
+    engine.dispose()
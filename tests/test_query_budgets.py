@@ -0,0 +1,195 @@
+import io
+import time
+import pytest
+from fastapi.routing import APIRoute
+from typing import Optional
+
+from app.api.v1 import public
+from app.api.v1.router import api_router
+from app.config.settings import get_settings
+from tests.conftest import query_count
+
+# Path parameter -> seeded entity its ids come from
+PATH_IDS = {
+    "project_id": "projects",
+    "skill_id": "skills",
+    "experience_id": "experiences",
+    "education_id": "education",
+    "image_id": "images",
+    "category_id": "categories",
+}
+PATH_VALUES = {"kind": "skills"}
+
+# Streams until the client disconnects
+STREAMING = {"/events"}
+
+# Routes that opt out with @no_query_budget: exports and imports read or write
+# whole tables, and a batch runs any number of operations
+NO_BUDGET = {"/admin/export/entities.ndjson", "/admin/export/blobs.tar", "/admin/import", "/admin/batch"}
+
+ADMIN_READS = [
+    route for route in api_router.routes
+    if isinstance(route, APIRoute) and "GET" in route.methods and route.path.startswith("/admin")
+    and route.path not in NO_BUDGET and "job_id" not in route.param_convertors  # Jobs are read in the upload test
+]
+
+# Per admin collection: its item route, a body to create one and an update to it
+ADMIN_CRUD = [
+    ("/admin/skills", "/admin/skills/{skill_id}",
+     {"name": "Budgeted skill", "category": "Tools", "proficiency": 3, "years_experience": 1}, {"proficiency": 4}),
+    ("/admin/work-experiences", "/admin/work-experiences/{experience_id}",
+     {"company": "Budgeted", "position": "Engineer", "start_date": "2020-01", "description": "d"}, {"location": "Remote"}),
+    ("/admin/education", "/admin/education/{education_id}",
+     {"institution": "Budgeted", "degree": "BSc", "start_date": "2015"}, {"honors": "Cum laude"}),
+    ("/admin/categories", "/admin/categories/{category_id}", {"name": "Budgeted category"}, {"description": "Updated"}),
+    ("/admin/projects", "/admin/projects/{project_id}",
+     {"title": "Budgeted project", "description": "d", "technologies": ["Python"]}, {"title": "Rebudgeted"}),
+]
+
+# Per admin upload route: the seeded entity it belongs to; its DELETE removes the file again
+ADMIN_UPLOADS = [
+    ("/admin/personal-info/profile-image", None),
+    ("/admin/skills/{skill_id}/icon", "skills"),
+    ("/admin/work-experiences/{experience_id}/logo", "experiences"),
+    ("/admin/education/{education_id}/logo", "education"),
+    ("/admin/education/{education_id}/certificate", "education"),
+]
+
+PUBLIC_ROUTES = [
+    route for route in public.router.routes
+    if isinstance(route, APIRoute) and "GET" in route.methods and route.path not in STREAMING
+]
+
+def _budget(route: APIRoute) -> int:
+    return route.endpoint.__query_budget__[0]
+
+def _path(route: APIRoute, ids: dict) -> str:
+    values = {
+        name: PATH_VALUES[name] if name in PATH_VALUES else ids[PATH_IDS[name]][0]
+        for name in route.param_convertors
+    }
+    return "/api/v1" + route.path_format.format(**values)
+
+def _route(method: str, path: str) -> Optional[APIRoute]:
+    """The api_router route for a method and path template like /admin/skills/{skill_id}"""
+    for route in api_router.routes:
+        if isinstance(route, APIRoute) and route.path_format == path and method in route.methods:
+            return route
+    return None
+
+def _request(client, method: str, path: str, headers: dict, **values):
+    """Call a route and check it succeeded within its budget; `values` fill the path template"""
+    kwargs = {name: values.pop(name) for name in ("json", "files", "data") if name in values}
+    response = client.request(method, "/api/v1" + path.format(**values), headers=headers, **kwargs)
+    assert response.status_code < 300, response.text
+    assert query_count(response) <= _budget(_route(method, path)), f"{method} {path}"
+    return response
+
+def _png() -> bytes:
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.effect_noise((16, 16), 64).convert("RGB").save(output, format="PNG")
+    return output.getvalue()
+
+def _wait_for_job(client, job_id: int, headers: dict) -> dict:
+    """Poll the job route until the worker has finished the job"""
+    for _ in range(100):
+        job = _request(client, "GET", "/admin/jobs/{job_id}", headers, job_id=job_id).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} never finished")
+
+@pytest.fixture
+def uncached_tokens(monkeypatch):
+    """Admin budgets include the revocation lookup an uncached token adds; count it"""
+    monkeypatch.setattr(get_settings(), "token_revocation_check_seconds", 0)
+
+@pytest.mark.parametrize("route", PUBLIC_ROUTES, ids=lambda route: route.path)
+def test_public_route_within_budget(client, ids, route):
+    path = _path(route, ids)
+    # Cold, then warm once any cache is filled
+    for _ in range(2):
+        response = client.get(path)
+        assert response.status_code == 200, response.text
+        assert query_count(response) <= _budget(route)
+
+def test_every_route_declares_a_budget():
+    for route in api_router.routes:
+        if isinstance(route, APIRoute):
+            assert hasattr(route.endpoint, "__query_budget__"), route.path
+            if route.path in NO_BUDGET:
+                assert route.endpoint.__query_budget__ is None, route.path
+            else:
+                assert route.endpoint.__query_budget__ is not None and _budget(route) is not None, route.path
+
+@pytest.mark.parametrize("route", ADMIN_READS, ids=lambda route: route.path)
+def test_admin_read_within_budget(client, ids, admin_headers, uncached_tokens, route):
+    response = client.get(_path(route, ids), headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert query_count(response) <= _budget(route)
+
+@pytest.mark.parametrize("collection, item, create, update", ADMIN_CRUD, ids=[collection for collection, *_ in ADMIN_CRUD])
+def test_admin_crud_within_budget(client, admin_headers, uncached_tokens, collection, item, create, update):
+    (name,) = _route("PUT", item).param_convertors
+    created = _request(client, "POST", collection, admin_headers, json=create).json()
+    if _route("GET", item):
+        _request(client, "GET", item, admin_headers, **{name: created["id"]})
+    _request(client, "PUT", item, admin_headers, json=update, **{name: created["id"]})
+    _request(client, "DELETE", item, admin_headers, **{name: created["id"]})
+
+@pytest.mark.parametrize("path, entity", ADMIN_UPLOADS, ids=[path for path, _ in ADMIN_UPLOADS])
+def test_admin_upload_and_delete_within_budget(client, ids, admin_headers, uncached_tokens, path, entity):
+    values = {name: ids[entity][-1] for name in _route("POST", path).param_convertors}
+    files = {"file": ("upload.png", _png(), "image/png")}
+    (job_id,) = _request(client, "POST", path, admin_headers, files=files, **values).json()["job_ids"]
+    assert _wait_for_job(client, job_id, admin_headers)["status"] == "succeeded"
+    _request(client, "DELETE", path, admin_headers, **values)
+
+def test_admin_project_writes_within_budget(client, ids, admin_headers, uncached_tokens):
+    project = _request(client, "POST", "/admin/projects", admin_headers, json={
+        "title": "Budgeted writes", "description": "d", "technologies": ["Python"], "skill_ids": ids["skills"][:2]
+    }).json()
+    project_id = project["id"]
+    _request(client, "POST", "/admin/projects/{project_id}/skills", admin_headers,
+             json={"skill_id": ids["skills"][3], "relevance_score": 7}, project_id=project_id)
+    _request(client, "PUT", "/admin/projects/{project_id}/skills", admin_headers,
+             json=ids["skills"][4:7], project_id=project_id)
+
+    files = [("files", ("shot.png", _png(), "image/png")) for _ in range(2)]
+    job_ids = _request(client, "POST", "/admin/projects/{project_id}/images", admin_headers,
+                       files=files, project_id=project_id).json()["job_ids"]
+    image_ids = [_wait_for_job(client, job_id, admin_headers)["target_id"] for job_id in job_ids]
+    _request(client, "PUT", "/admin/projects/images/{image_id}/main", admin_headers, image_id=image_ids[1])
+    _request(client, "PUT", "/admin/projects/images/{image_id}/caption", admin_headers,
+             data={"caption": "Budgeted"}, image_id=image_ids[1])
+    _request(client, "DELETE", "/admin/projects/images/{image_id}", admin_headers, image_id=image_ids[0])
+    _request(client, "PUT", "/admin/personal-info", admin_headers, json={"location": "Remote"})
+    _request(client, "DELETE", "/admin/projects/{project_id}", admin_headers, project_id=project_id)
+
+def test_overrun_fails_before_commit(client, ids, admin_headers, monkeypatch):
+    from app.api.v1.admin import projects
+
+    project_id = ids["projects"][1]
+    before = client.get(f"/api/v1/projects/{project_id}").json()["title"]
+
+    monkeypatch.setattr(projects.update_project, "__query_budget__", (1, None))
+    response = client.put(
+        f"/api/v1/admin/projects/{project_id}", json={"title": "Over budget"}, headers=admin_headers
+    )
+    assert response.status_code == 500
+    assert "Query budget exceeded" in response.json()["detail"]
+
+    assert client.get(f"/api/v1/projects/{project_id}").json()["title"] == before
+
+def test_project_update_with_skills_within_budget(client, ids, admin_headers, uncached_tokens):
+    from app.api.v1.admin import projects
+
+    response = client.put(
+        f"/api/v1/admin/projects/{ids['projects'][2]}",
+        json={"title": "Reskilled", "skill_ids": ids["skills"][2:6]}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert {skill["id"] for skill in response.json()["skills"]} == set(ids["skills"][2:6])
+    assert query_count(response) <= projects.update_project.__query_budget__[0]
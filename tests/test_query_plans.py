@@ -0,0 +1,101 @@
+"""Hot service queries must be served by indexes.
+
+Each check runs a service call against the seeded portfolio, captures
+the statements it issues and EXPLAINs them; a full sequential scan of any
+table fails it. SQLite plans are taken without ANALYZE statistics, as a
+fresh database would have. Postgres is explained with enable_seqscan off:
+on a small seeded database a sequential scan is cheaper anyway, so any
+that remains means no usable index exists.
+"""
+import json
+import re
+from typing import Callable, Dict, List, Tuple
+import pytest
+from sqlalchemy import event
+from app.config.database import SessionLocal, get_engine
+from app.services import (
+    project_service, project_card_service, skill_ranking_service, project_image_service, education_service,
+    work_experience_service
+)
+
+# Check name -> service call
+CHECKS: Dict[str, Callable[[object, Dict[str, List[int]]], object]] = {
+    "project cards": lambda db, ids: project_card_service.get_cards(db),
+    "project cards featured": lambda db, ids: project_card_service.get_cards(db, featured=True),
+    "project cards by category": lambda db, ids: project_card_service.get_cards(db, category_id=ids["categories"][0]),
+    "project cards by skill": lambda db, ids: project_card_service.get_cards(db, skill_id=ids["skills"][0]),
+    "project cards case studies": lambda db, ids: project_card_service.get_cards(db, with_case_studies=True),
+    "skill projects top": lambda db, ids: skill_ranking_service.get_projects(db, ids["skills"][0]),
+    "skill projects page": lambda db, ids: skill_ranking_service.get_projects(db, ids["skills"][0], offset=5),
+    "skill ranking refresh": lambda db, ids: skill_ranking_service.refresh(db, ids["skills"][:2]),
+    "projects featured": lambda db, ids: project_service.get_featured(db),
+    "projects by category": lambda db, ids: project_service.get_by_category(db, ids["categories"][0]),
+    "projects by skill": lambda db, ids: project_service.get_by_skill(db, ids["skills"][0]),
+    "project detail": lambda db, ids: project_service.get_detail(db, ids["projects"][0]),
+    "project images": lambda db, ids: project_image_service.get_project_images(db, ids["projects"][0]),
+    "project main image": lambda db, ids: project_image_service.get_main_image(db, ids["projects"][0]),
+    "experience ordered": lambda db, ids: work_experience_service.get_all_ordered(db),
+    "experience current": lambda db, ids: work_experience_service.get_current_positions(db),
+    "education ordered": lambda db, ids: education_service.get_all_ordered(db),
+    "education degrees": lambda db, ids: education_service.get_degrees(db),
+    "education certifications": lambda db, ids: education_service.get_certifications(db),
+    "education current": lambda db, ids: education_service.get_current(db),
+}
+
+# "SCAN projects" or "SCAN projects AS p" is a full scan; "SCAN projects USING INDEX ..." is not
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+# Subqueries run as co-routines or materialized; scanning their output reads no table
+_SQLITE_SUBQUERY = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)")
+
+def sqlite_full_scans(conn, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    plan = [row[-1] for row in rows]
+    subqueries = {match[1] for match in map(_SQLITE_SUBQUERY.match, plan) if match}
+    return [match[1] for match in map(_SQLITE_FULL_SCAN.match, plan) if match and match[1] not in subqueries], plan
+
+def postgresql_full_scans(conn, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    (raw,) = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).one()
+    root = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+
+    scans, plan, nodes = [], [], [(root, 0)]
+    while nodes:
+        node, depth = nodes.pop()
+        relation = node.get("Relation Name")
+        plan.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+        if node["Node Type"] == "Seq Scan":
+            scans.append(relation)
+        nodes.extend((child, depth + 1) for child in reversed(node.get("Plans", [])))
+    return scans, plan
+
+EXPLAINERS = {"sqlite": sqlite_full_scans, "postgresql": postgresql_full_scans}
+
+@pytest.mark.parametrize("name", CHECKS)
+def test_query_uses_indexes(name, ids):
+    engine = get_engine()
+    explain = EXPLAINERS.get(engine.dialect.name)
+    if explain is None:
+        pytest.skip(f"no query plan check for {engine.dialect.name}")
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        CHECKS[name](db, ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+        db.rollback()
+        db.close()
+    assert statements
+
+    failures = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            scans, plan = explain(conn, statement, parameters)
+            if scans:
+                failures.append(f"{' '.join(statement.split())}\n  " + "\n  ".join(plan))
+            conn.rollback()
+    assert not failures, "Full table scan:\n" + "\n".join(failures)
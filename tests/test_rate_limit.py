@@ -0,0 +1,33 @@
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.rate_limit import client_ip
+
+def _request(forwarded_for=None, peer="10.0.0.2") -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+def test_without_trusted_proxies_uses_the_peer(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_trusted_proxies", 0)
+    assert client_ip(_request("1.2.3.4")) == "10.0.0.2"
+
+@pytest.mark.parametrize("forwarded_for, trusted, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    # Entries left of those the proxies appended are forged by the client
+    ("1.2.3.4, 203.0.113.7", 1, "203.0.113.7"),
+    ("1.2.3.4, 203.0.113.7, 10.0.0.1", 2, "203.0.113.7"),
+    ("203.0.113.7", 2, "203.0.113.7"),
+])
+def test_trusted_proxies_take_the_client_from_the_right(monkeypatch, forwarded_for, trusted, expected):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_trusted_proxies", trusted)
+    assert client_ip(_request(forwarded_for)) == expected
+
+def test_spoofed_entries_share_one_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_trusted_proxies", 1)
+    addresses = {client_ip(_request(f"198.51.100.{i}, 203.0.113.7")) for i in range(5)}
+    assert addresses == {"203.0.113.7"}
+
+def test_missing_header_uses_the_peer(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_trusted_proxies", 1)
+    assert client_ip(_request()) == "10.0.0.2"
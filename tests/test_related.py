@@ -0,0 +1,48 @@
+from app.config.database import SessionLocal
+from app.models import Skill, project_skills
+from app.models.project import Project
+from app.services import related_project_service
+from app.services.changes import change_log_service
+
+def test_an_older_version_is_served_by_the_newer_matrix(ids, monkeypatch):
+    db = SessionLocal()
+    try:
+        matrix = related_project_service._current(db)
+        monkeypatch.setattr(change_log_service, "get_version", lambda db: matrix.version - 1)
+        monkeypatch.setattr(related_project_service, "_load", None)  # Any rebuild would fail
+        assert related_project_service._current(db) is matrix
+    finally:
+        db.close()
+
+def test_a_published_matrix_is_left_unchanged_by_updates(ids):
+    db = SessionLocal()
+    try:
+        matrix = related_project_service._current(db)
+        version, project_ids, scores = matrix.version, list(matrix.ids), matrix.scores.copy()
+
+        db.add(Project(title="Unrelated", description="d", technologies="Fortran"))
+        db.commit()
+        updated = related_project_service._current(db)
+        assert updated is not matrix and len(updated.ids) == len(project_ids) + 1
+        assert (matrix.version, matrix.ids) == (version, project_ids)
+        assert (matrix.scores == scores).all()
+    finally:
+        db.close()
+
+def test_a_zero_relevance_is_kept(client):
+    db = SessionLocal()
+    try:
+        skill = Skill(name="Barely used", category="Tools", proficiency=1, years_experience=0)
+        project = Project(title="Zero relevance", description="d", technologies="Python")
+        db.add_all([skill, project])
+        db.flush()
+        db.execute(project_skills.insert().values(project_id=project.id, skill_id=skill.id, relevance_score=0))
+        db.commit()
+
+        (features,) = related_project_service._load(db, {project.id})
+        assert features.skills == {skill.id: 0}
+        stats = {stat["skill_id"]: stat for stat in client.get("/api/v1/skills/stats").json()}
+        assert stats[skill.id]["project_count"] == 1
+        assert stats[skill.id]["average_relevance"] == 0
+    finally:
+        db.close()
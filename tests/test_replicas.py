@@ -0,0 +1,70 @@
+import os
+import sqlite3
+
+import pytest
+
+from app.config import database
+from app.config.database import ReplicaRouter, get_engine
+
+def _replica_file(tmp_path, name: str, skill_name: str) -> str:
+    """Copy of the primary with the first skill renamed, so responses show which database served them"""
+    path = os.path.join(tmp_path, f"{name}.db")
+    source = sqlite3.connect(get_engine().url.database)
+    target = sqlite3.connect(path)
+    source.backup(target)
+    target.execute("UPDATE skills SET name = ? WHERE id = (SELECT min(id) FROM skills)", (skill_name,))
+    target.commit()
+    source.close()
+    target.close()
+    return f"sqlite:///{path}"
+
+@pytest.fixture
+def replicas(tmp_path, ids, monkeypatch):
+    """Route public reads across SQLite replicas; returns a function that installs a router over the given URLs"""
+    def install(urls, read_your_writes_seconds=0.0) -> ReplicaRouter:
+        router = ReplicaRouter(
+            [database._create_engine(url) for url in urls],
+            retry_seconds=60, read_your_writes_seconds=read_your_writes_seconds
+        )
+        monkeypatch.setattr(database.settings, "database_replica_urls", urls)
+        monkeypatch.setattr(database, "get_replica_router", lambda: router)
+        return router
+    return install
+
+def _first_skill_name(client) -> str:
+    response = client.get("/api/v1/skills")
+    assert response.status_code == 200, response.text
+    return min(response.json(), key=lambda skill: skill["id"])["name"]
+
+def test_reads_round_robin_across_replicas(client, replicas, tmp_path):
+    replicas([_replica_file(tmp_path, "a", "From A"), _replica_file(tmp_path, "b", "From B")])
+    names = {_first_skill_name(client) for _ in range(4)}
+    assert names == {"From A", "From B"}
+
+def test_reads_use_primary_after_a_write(client, replicas, tmp_path, admin_headers):
+    router = replicas([_replica_file(tmp_path, "a", "From A")], read_your_writes_seconds=60)
+    assert _first_skill_name(client) == "From A"
+
+    experience = client.get("/api/v1/experience").json()[0]
+    response = client.put(
+        f"/api/v1/admin/work-experiences/{experience['id']}", json={"location": "Remote"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert router.choose() is None
+    assert _first_skill_name(client) != "From A"
+
+def test_failed_replica_read_is_retried_elsewhere(client, replicas, tmp_path):
+    broken = f"sqlite:///{os.path.join(tmp_path, 'missing', 'replica.db')}"
+    router = replicas([broken, _replica_file(tmp_path, "b", "From B")])
+    broken_engine = router.engines[0]
+
+    # The first read lands on the broken replica and is rerun on the healthy one
+    assert _first_skill_name(client) == "From B"
+    assert not router.is_healthy(broken_engine)
+    assert router.healthy_count() == 1
+
+def test_read_falls_back_to_primary_when_no_replica_is_healthy(client, replicas, tmp_path):
+    broken = f"sqlite:///{os.path.join(tmp_path, 'missing', 'replica.db')}"
+    router = replicas([broken])
+    assert _first_skill_name(client).startswith("Skill")
+    assert router.healthy_count() == 0
@@ -0,0 +1,40 @@
+from app.config.database import SessionLocal
+from app.models import Skill
+from app.services import skill_stats_service
+from tests.test_changes import _version
+
+def _project_count(client, skill_id: int) -> int:
+    stats = client.get("/api/v1/skills/stats").json()
+    return next(stat["project_count"] for stat in stats if stat["skill_id"] == skill_id)
+
+def test_stats_are_rebuilt_only_for_skill_and_link_changes(client, ids, admin_headers, monkeypatch):
+    db = SessionLocal()
+    try:
+        skill = Skill(name="Counted", category="Tools", proficiency=3, years_experience=1)
+        db.add(skill)
+        db.commit()
+        skill_id = skill.id
+    finally:
+        db.close()
+    project_id = ids["projects"][3]
+    assert _project_count(client, skill_id) == 0
+
+    # A project edit that leaves its skills alone keeps the cached stats
+    response = client.put(f"/api/v1/admin/projects/{project_id}", json={"title": "Retitled"}, headers=admin_headers)
+    assert response.status_code == 200
+    build = skill_stats_service._build
+    monkeypatch.setattr(skill_stats_service, "_build", None)  # Any rebuild would fail
+    assert _project_count(client, skill_id) == 0
+
+    monkeypatch.setattr(skill_stats_service, "_build", build)
+    since = _version()
+    response = client.post(
+        f"/api/v1/admin/projects/{project_id}/skills", json={"skill_id": skill_id}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert _project_count(client, skill_id) == 1
+
+    # /changes shows the link change as the project's upsert alone
+    changes = client.get("/api/v1/changes", params={"since": since}).json()
+    assert [project["id"] for project in changes["upserted"]["project"]] == [project_id]
+    assert changes["deleted"] == {}